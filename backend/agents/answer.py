@@ -1,41 +1,110 @@
-from tavily import TavilyClient
-from agents.base import invoke_bedrock
+from typing import Dict, List, Optional, Tuple
+from langchain_core.runnables import RunnableConfig
+from agents.base import invoke_bedrock, invoke_bedrock_stream, token_callback
+from agents.tavily_gateway import tavily
 from agents.prompts import ANSWER_PROMPT
-from config import TAVILY_API_KEY
+from models import Paper, Edge
 from storage import storage
+from config import ANSWER_TOP_K, ANSWER_CONTEXT_TOKEN_BUDGET
 
-tavily = TavilyClient(api_key=TAVILY_API_KEY)
+# Reciprocal rank fusion constant; damps the difference between the very top ranks
+RRF_K = 60
+
+
+def estimate_tokens(text: str) -> int:
+    # About four characters per token for English prose
+    return len(text) // 4 + 1
+
+
+def format_paper(paper: Paper) -> str:
+    return (
+        f"- {paper.title} ({paper.year})\n"
+        f"  arXiv ID: {paper.id}\n"
+        f"  Authors: {', '.join(paper.authors[:3])}\n"
+        f"  Key concepts: {', '.join(paper.key_concepts)}\n"
+        f"  Abstract: {paper.summary[:300]}..."
+    )
+
+
+def format_edge(edge: Edge, titles: Dict[str, str]) -> str:
+    source_title = titles.get(edge.source_id, edge.source_id)
+    target_title = titles.get(edge.target_id, edge.target_id)
+    return f"- {source_title[:50]} -> {target_title[:50]}"
 
 
 def build_papers_context(papers: list) -> str:
     if not papers:
         return "No papers in collection yet."
-
-    context_parts = []
-    for paper in papers:
-        context_parts.append(
-            f"- {paper.title} ({paper.year})\n"
-            f"  arXiv ID: {paper.id}\n"
-            f"  Authors: {', '.join(paper.authors[:3])}\n"
-            f"  Key concepts: {', '.join(paper.key_concepts)}\n"
-            f"  Abstract: {paper.summary[:300]}..."
-        )
-    return "\n\n".join(context_parts)
+    return "\n\n".join(format_paper(paper) for paper in papers)
 
 
-def build_edges_context(edges: list, papers: list) -> str:
+def build_edges_context(edges: list, titles: Dict[str, str]) -> str:
     if not edges:
         return "No connections found yet."
+    return "\n".join(format_edge(edge, titles) for edge in edges)
 
-    paper_map = {p.id: p.title for p in papers}
-    context_parts = []
-    for edge in edges:
-        source_title = paper_map.get(edge.source_id, edge.source_id)
-        target_title = paper_map.get(edge.target_id, edge.target_id)
-        context_parts.append(
-            f"- {source_title[:50]} -> {target_title[:50]}"
-        )
-    return "\n".join(context_parts)
+
+def rank_papers(question: str, k: int) -> List[Paper]:
+    """Papers relevant to the question, best first.
+
+    BM25 and embedding rankings from the indexes maintained at ingest are merged with
+    reciprocal rank fusion, so the cost depends on the matches, not the collection size.
+    """
+    depth = 3 * k
+    fused: Dict[str, float] = {}
+    rankings = (
+        storage.get_lexical_index().search(question, depth),
+        storage.get_semantic_index().search_text(question, depth),
+    )
+    for ranking in rankings:
+        for rank, (paper_id, _) in enumerate(hit for hit in ranking if hit[1] > 0):
+            fused[paper_id] = fused.get(paper_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+
+    papers = [storage.get_paper(paper_id) for paper_id in sorted(fused, key=lambda pid: (-fused[pid], pid))]
+    papers = [p for p in papers if p is not None]
+    if not papers:
+        # Nothing matched (e.g. "summarize my collection"), so show the newest papers
+        papers = storage.get_all_papers()[:k]
+    return papers
+
+
+def retrieve_context(question: str, k: int = ANSWER_TOP_K,
+                     token_budget: int = ANSWER_CONTEXT_TOKEN_BUDGET) -> Tuple[List[Paper], List[Edge], Dict[str, str]]:
+    """Top-``k`` relevant papers and their 1-hop edges, trimmed to fit ``token_budget``.
+
+    Returns the papers, the edges and a title lookup covering both ends of every edge.
+    """
+    papers: List[Paper] = []
+    remaining = token_budget
+    for paper in rank_papers(question, k):
+        if len(papers) >= k:
+            break
+        # A paper too long for what is left doesn't stop shorter, lower-ranked ones from fitting
+        cost = estimate_tokens(format_paper(paper))
+        if cost > remaining:
+            continue
+        papers.append(paper)
+        remaining -= cost
+
+    selected = {p.id for p in papers}
+    titles = {p.id: p.title for p in papers}
+    # Edges between the selected papers first, then edges out to the rest of the collection
+    candidates = sorted(
+        storage.get_edges_for(selected),
+        key=lambda e: (not (e.source_id in selected and e.target_id in selected), e.id),
+    )
+    edges = []
+    for edge in candidates:
+        for paper_id in (edge.source_id, edge.target_id):
+            if paper_id not in titles:
+                neighbor = storage.get_paper(paper_id)
+                titles[paper_id] = neighbor.title if neighbor else paper_id
+        cost = estimate_tokens(format_edge(edge, titles))
+        if cost > remaining:
+            continue
+        edges.append(edge)
+        remaining -= cost
+    return papers, edges, titles
 
 
 def search_for_answer(question: str, papers: list) -> dict:
@@ -57,10 +126,9 @@ def search_for_answer(question: str, papers: list) -> dict:
         return {"results": []}
 
 
-def answer_agent(state: dict) -> dict:
+def answer_agent(state: dict, config: Optional[RunnableConfig] = None) -> dict:
     question = state.get("user_message", "")
-    papers = storage.get_all_papers()
-    edges = storage.get_edges()
+    papers, edges, titles = retrieve_context(question, ANSWER_TOP_K, ANSWER_CONTEXT_TOKEN_BUDGET)
 
     search_results = search_for_answer(question, papers)
 
@@ -70,18 +138,22 @@ def answer_agent(state: dict) -> dict:
     ]) or "No relevant search results found."
 
     papers_context = build_papers_context(papers)
-    edges_context = build_edges_context(edges, papers)
-
-    answer = invoke_bedrock(
-        ANSWER_PROMPT.format(
-            papers_context=papers_context,
-            edges_context=edges_context,
-            question=question,
-            search_results=results_text
-        ),
-        max_tokens=500,
-        temperature=0.7
+    total = len(storage.get_lexical_index())
+    if papers and total > len(papers):
+        papers_context = f"(The {len(papers)} of {total} papers most relevant to the question.)\n\n{papers_context}"
+    edges_context = build_edges_context(edges, titles)
+
+    prompt = ANSWER_PROMPT.format(
+        papers_context=papers_context,
+        edges_context=edges_context,
+        question=question,
+        search_results=results_text
     )
+    on_token = token_callback(config)
+    if on_token:
+        answer = invoke_bedrock_stream(prompt, on_token, max_tokens=500, temperature=0.7)
+    else:
+        answer = invoke_bedrock(prompt, max_tokens=500, temperature=0.7)
 
     return {
         **state,
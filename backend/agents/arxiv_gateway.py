@@ -0,0 +1,172 @@
+"""Process-wide arXiv API client.
+
+Every caller shares one HTTP session and one token bucket, so concurrent jobs and
+requests together stay under arXiv's rate limit instead of each client pacing only
+itself. A 429/503 pauses the bucket for everyone, for the server's Retry-After
+when it sends one.
+
+The client hooks arxiv.py's private page fetching (``Client._parse_feed``,
+``Client._format_url`` and ``arxiv._feed``), which is why requirements.txt pins
+arxiv to 4.x.
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Optional
+import arxiv
+import requests
+from arxiv import _feed
+from requests.adapters import HTTPAdapter
+from metrics import track_call
+from config import (
+    ARXIV_RATE_PER_SECOND, ARXIV_BURST, ARXIV_MAX_RETRIES, ARXIV_BACKOFF_SECONDS, ARXIV_PDF_RATE_PER_SECOND,
+    ARXIV_PDF_BURST,
+)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+USER_AGENT = "research-paper-agent (arxiv.py)"
+
+
+class TokenBucket:
+    """Thread-safe token bucket; a reservation may drive the balance negative, which queues later callers."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back the next token for at least ``seconds`` (for every caller)."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class _GatewayClient(arxiv.Client):
+    """arxiv.Client whose page fetches go through the gateway's limiter and retry policy."""
+
+    def __init__(self, gateway: "ArxivGateway"):
+        super().__init__(page_size=100, delay_seconds=0, num_retries=gateway.max_retries)
+        self._gateway = gateway
+
+    def _format_url(self, search: arxiv.Search, start: int, page_size: int) -> str:
+        # Don't ask for a 100-entry page when the search only wants a handful
+        if search.max_results:
+            page_size = min(page_size, search.max_results)
+        return super()._format_url(search, start, page_size)
+
+    def _parse_feed(self, url: str, first_page: bool = True, _try_index: int = 0):
+        return self._gateway.fetch_feed(url, first_page)
+
+
+class ArxivGateway:
+
+    def __init__(self, rate_per_second: float, burst: float, max_retries: int, backoff_seconds: float):
+        self.limiter = TokenBucket(rate_per_second, burst)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=8))
+        self.session.headers["user-agent"] = USER_AGENT
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0}
+        self._stats_lock = threading.Lock()
+        self._client = _GatewayClient(self)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None):
+        delay = retry_after_seconds(response) if response is not None else None
+        if delay is None:
+            delay = self.backoff_seconds * (2 ** attempt) + random.uniform(0, self.backoff_seconds)
+        # Pausing the shared bucket makes every caller back off, not just this one
+        self.limiter.pause(delay)
+        self._count("retries")
+
+    def fetch_feed(self, url: str, first_page: bool = True):
+        for attempt in range(self.max_retries + 1):
+            last_try = attempt == self.max_retries
+            self.limiter.acquire()
+            self._count("requests")
+            try:
+                with track_call("arxiv", "query"):
+                    response = self.session.get(url, timeout=30)
+            except requests.exceptions.ConnectionError:
+                if last_try:
+                    raise
+                self._backoff(attempt)
+                continue
+
+            if response.status_code in RETRYABLE_STATUS:
+                if response.status_code == 429:
+                    self._count("throttled")
+                if last_try:
+                    raise arxiv.HTTPError(url, attempt, response.status_code)
+                self._backoff(attempt, response)
+                continue
+            if response.status_code != requests.codes.ok:
+                raise arxiv.HTTPError(url, attempt, response.status_code)
+
+            feed = _feed.parse(response.content)
+            if feed.results or first_page:
+                return feed
+            # arXiv occasionally returns an empty page mid-pagination; retry it
+            if last_try:
+                raise arxiv.UnexpectedEmptyPageError(url, attempt, feed)
+            self._backoff(attempt)
+
+    def results(self, search: arxiv.Search) -> List[arxiv.Result]:
+        return list(self._client.results(search))
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+arxiv_gateway = ArxivGateway(
+    rate_per_second=ARXIV_RATE_PER_SECOND,
+    burst=ARXIV_BURST,
+    max_retries=ARXIV_MAX_RETRIES,
+    backoff_seconds=ARXIV_BACKOFF_SECONDS,
+)
+
+# PDF fetches from arxiv.org are paced separately from API queries, but across all workers
+pdf_limiter = TokenBucket(ARXIV_PDF_RATE_PER_SECOND, ARXIV_PDF_BURST)
@@ -1,7 +1,33 @@
-import boto3
-from config import AWS_DEFAULT_REGION
+import json
+import threading
+from typing import Callable, Optional
+from config import AWS_DEFAULT_REGION, BEDROCK_MAX_CONCURRENCY, BEDROCK_READ_TIMEOUT
+from agents import llm_cache as _cache
+from lazy import LazyClient
+from metrics import track_call
 
-bedrock = boto3.client("bedrock-runtime", region_name=AWS_DEFAULT_REGION)
+
+def _create_bedrock_client():
+    # boto3 is slow to import, so it is only loaded by the first Bedrock call
+    import boto3
+    from botocore.config import Config
+    return boto3.client(
+        "bedrock-runtime",
+        region_name=AWS_DEFAULT_REGION,
+        config=Config(
+            max_pool_connections=BEDROCK_MAX_CONCURRENCY,
+            read_timeout=BEDROCK_READ_TIMEOUT,
+            retries={"max_attempts": 3, "mode": "adaptive"},
+        ),
+    )
+
+
+# One client per process, built on first use; botocore clients are thread-safe and share the pool below.
+bedrock = LazyClient(_create_bedrock_client)
+
+# Caps in-flight converse calls across every thread in the worker (LangGraph nodes,
+# FastAPI threadpool, background ingest).
+_bedrock_slots = threading.BoundedSemaphore(BEDROCK_MAX_CONCURRENCY)
 
 # Model - Claude Opus 4.5 (was down when making demo video)
 # MODEL_ID = "us.anthropic.claude-opus-4-5-20251101-v1:0"
@@ -9,16 +35,41 @@ bedrock = boto3.client("bedrock-runtime", region_name=AWS_DEFAULT_REGION)
 MODEL_ID = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
 
 
-def invoke_bedrock(prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
-    response = bedrock.converse(
-        modelId=MODEL_ID,
-        messages=[{"role": "user", "content": [{"text": prompt}]}],
-        inferenceConfig={"maxTokens": max_tokens, "temperature": temperature},
-    )
+def _converse(content: list, max_tokens: int, temperature: float) -> str:
+    with _bedrock_slots, track_call("bedrock", "converse"):
+        response = bedrock.converse(
+            modelId=MODEL_ID,
+            messages=[{"role": "user", "content": content}],
+            inferenceConfig={"maxTokens": max_tokens, "temperature": temperature},
+        )
     return response["output"]["message"]["content"][0]["text"]
 
 
-def invoke_bedrock_with_pdf(prompt: str, pdf_bytes: bytes, max_tokens: int = 4000, temperature: float = 0.1) -> str:
+def _cached_converse(content: list, max_tokens: int, temperature: float, prompt: str,
+                     attachment: Optional[bytes], cache: Optional[bool]) -> str:
+    # Only deterministic calls are cached unless the caller opts in explicitly
+    use_cache = temperature == 0 if cache is None else cache
+    llm_cache = _cache.llm_cache
+    if llm_cache is None or not use_cache:
+        if llm_cache is not None:
+            llm_cache.record_bypass()
+        return _converse(content, max_tokens, temperature)
+
+    key = _cache.make_key(MODEL_ID, prompt, max_tokens, temperature, attachment)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return cached
+    text = _converse(content, max_tokens, temperature)
+    llm_cache.set(key, text)
+    return text
+
+
+def invoke_bedrock(prompt: str, max_tokens: int = 500, temperature: float = 0.7, cache: Optional[bool] = None) -> str:
+    return _cached_converse([{"text": prompt}], max_tokens, temperature, prompt, None, cache)
+
+
+def invoke_bedrock_with_pdf(prompt: str, pdf_bytes: bytes, max_tokens: int = 4000, temperature: float = 0.1,
+                            cache: Optional[bool] = None) -> str:
     message_content = [
         {
             "document": {
@@ -29,10 +80,39 @@ def invoke_bedrock_with_pdf(prompt: str, pdf_bytes: bytes, max_tokens: int = 400
         },
         {"text": prompt}
     ]
+    return _cached_converse(message_content, max_tokens, temperature, prompt, pdf_bytes, cache)
 
-    response = bedrock.converse(
-        modelId=MODEL_ID,
-        messages=[{"role": "user", "content": message_content}],
-        inferenceConfig={"maxTokens": max_tokens, "temperature": temperature},
-    )
-    return response["output"]["message"]["content"][0]["text"]
+
+def invoke_bedrock_stream(prompt: str, on_token: Callable[[str], None], max_tokens: int = 500,
+                          temperature: float = 0.7) -> str:
+    """Like invoke_bedrock, but calls ``on_token`` with each text delta as it arrives."""
+    parts = []
+    with _bedrock_slots, track_call("bedrock", "converse_stream"):
+        response = bedrock.converse_stream(
+            modelId=MODEL_ID,
+            messages=[{"role": "user", "content": [{"text": prompt}]}],
+            inferenceConfig={"maxTokens": max_tokens, "temperature": temperature},
+        )
+        for event in response["stream"]:
+            text = event.get("contentBlockDelta", {}).get("delta", {}).get("text")
+            if text:
+                parts.append(text)
+                on_token(text)
+    return "".join(parts)
+
+
+def invoke_bedrock_embedding(text: str, dimensions: int, model_id: str) -> list:
+    """One Titan text-embedding call; returns the vector as a list of floats."""
+    with _bedrock_slots, track_call("bedrock", "embed"):
+        response = bedrock.invoke_model(
+            modelId=model_id,
+            body=json.dumps({"inputText": text, "dimensions": dimensions, "normalize": True}),
+            contentType="application/json",
+            accept="application/json",
+        )
+    return json.loads(response["body"].read())["embedding"]
+
+
+def token_callback(config: Optional[dict]) -> Optional[Callable[[str], None]]:
+    """The on_token sink a streaming run put in the LangGraph config, if any."""
+    return ((config or {}).get("configurable") or {}).get("on_token")
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+from agents.connection import connection_agent
+from agents.ingest import build_paper
+from agents.utils import extract_arxiv_id, fetch_arxiv_metadata
+from indexes import normalize_arxiv_id
+from models import BatchIngestResponse, Paper
+from storage import storage
+from config import BATCH_INGEST_WORKERS
+
+
+def ingest_batch(raw_ids: List[str], max_workers: int = BATCH_INGEST_WORKERS,
+                 progress: Optional[Callable[[str], None]] = None) -> BatchIngestResponse:
+    """Fetch, enrich and store a list of arXiv ids or URLs, then link the new papers in one pass.
+
+    ``progress`` is called with a stage name as the batch moves along, including once per built paper.
+    """
+    report = progress or (lambda stage: None)
+    response = BatchIngestResponse()
+
+    arxiv_ids = []
+    seen = set()
+    for raw in raw_ids:
+        arxiv_id = extract_arxiv_id(raw)
+        if not arxiv_id:
+            response.invalid.append(raw)
+            continue
+        if normalize_arxiv_id(arxiv_id) not in seen:
+            seen.add(normalize_arxiv_id(arxiv_id))
+            arxiv_ids.append(arxiv_id)
+
+    existing = {normalize_arxiv_id(p.id) for p in storage.get_all_papers()}
+    response.skipped = [i for i in arxiv_ids if normalize_arxiv_id(i) in existing]
+    to_fetch = [i for i in arxiv_ids if normalize_arxiv_id(i) not in existing]
+    if not to_fetch:
+        return response
+
+    report("fetch")
+    try:
+        metadata = fetch_arxiv_metadata(to_fetch)
+    except Exception as e:
+        response.failed = {i: f"arXiv lookup failed: {str(e)}" for i in to_fetch}
+        return response
+
+    built: Dict[str, Paper] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for arxiv_id in to_fetch:
+            result = metadata.get(normalize_arxiv_id(arxiv_id))
+            if result is None:
+                response.failed[arxiv_id] = "Paper not found"
+            else:
+                futures[pool.submit(build_paper, result)] = arxiv_id
+
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                built[futures[future]] = future.result()
+            except Exception as e:
+                response.failed[futures[future]] = str(e)
+            report(f"build {done}/{len(futures)}")
+
+    # Papers finish in completion order; report and store them in the order they were asked for
+    papers = [built[i] for i in to_fetch if i in built]
+    response.failed = {i: response.failed[i] for i in to_fetch if i in response.failed}
+
+    if papers:
+        report("store")
+        storage.add_papers(papers)
+        response.added = [p.id for p in papers]
+        report("connect")
+        # One connection pass for the whole batch instead of one per paper
+        connections = connection_agent({"papers_added": papers})
+        response.edges_created = len(connections.get("connection_edges", []))
+
+    return response
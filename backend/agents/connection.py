@@ -1,6 +1,7 @@
-from itertools import combinations
-from models import Paper, Edge
+from typing import List
+from models import Paper, Edge, edge_key
 from storage import storage
+from config import SEMANTIC_CONNECTIONS_ENABLED, SEMANTIC_SIMILARITY_THRESHOLD, SEMANTIC_TOP_K
 import uuid
 
 
@@ -10,6 +11,33 @@ def has_shared_concepts(paper_a: Paper, paper_b: Paper) -> bool:
     return bool(concepts_a & concepts_b)
 
 
+def link_citations(papers: List[Paper]) -> List[Edge]:
+    """Store "cites" edges between ``papers`` and the collection, from their extracted references.
+
+    The reference index resolves both directions with lookups: the papers each one
+    cites, and the papers already in the collection that cite it.
+    """
+    if not papers:
+        return []
+    reference_index = storage.get_reference_index()
+    pairs = []
+    for paper in papers:
+        pairs.extend((paper.id, cited_id) for cited_id in sorted(reference_index.cites(paper)))
+        pairs.extend((citing_id, paper.id) for citing_id in sorted(reference_index.cited_by(paper)))
+    if not pairs:
+        return []
+
+    keys = [edge_key(source_id, target_id, "cites") for source_id, target_id in pairs]
+    seen = storage.existing_edge_keys(keys)
+    new_edges = []
+    for key, (source_id, target_id) in zip(keys, pairs):
+        if key in seen:
+            continue
+        seen.add(key)
+        new_edges.append(Edge(id=str(uuid.uuid4()), source_id=source_id, target_id=target_id, edge_type="cites"))
+    return storage.add_edges(new_edges)
+
+
 def connection_agent(state: dict) -> dict:
     papers_added = state.get("papers_added", [])
     all_papers = storage.get_all_papers()
@@ -21,26 +49,66 @@ def connection_agent(state: dict) -> dict:
             "connection_message": "Need at least 2 papers to find connections."
         }
 
-    existing_edges = {(e.source_id, e.target_id) for e in storage.get_edges()}
-    new_edges = []
+    # Candidate pairs come from the concept index (papers sharing a concept) and the
+    # semantic index (nearest embeddings above the similarity threshold), so unrelated
+    # pairs are never visited. Candidates are walked in collection order to keep edge
+    # direction stable.
+    concept_index = storage.get_concept_index()
+    papers_by_id = {p.id: p for p in all_papers}
+    position = {p.id: i for i, p in enumerate(all_papers)}
 
-    # Determine which paper pairs to check
     if papers_added:
-        pairs = [(p, other) for p in papers_added for other in all_papers if p.id != other.id]
+        sources = papers_added
     elif state.get("intent") == "find_connections":
-        pairs = list(combinations(all_papers, 2))
+        sources = all_papers
     else:
+        sources = []
+
+    semantic = {}
+    if SEMANTIC_CONNECTIONS_ENABLED and sources:
+        # One batched nearest-neighbour search for every source paper
+        semantic = storage.get_semantic_index().neighbors(sources, SEMANTIC_TOP_K, SEMANTIC_SIMILARITY_THRESHOLD)
+
+    def matches(paper: Paper) -> list:
+        by_concept = concept_index.matches(paper)
+        by_embedding = {other_id for other_id, _ in semantic.get(paper.id, [])}
+        candidates = (by_concept | by_embedding) & position.keys()
+        candidates.discard(paper.id)
+        return [(pid, pid in by_concept) for pid in sorted(candidates, key=position.__getitem__)]
+
+    if papers_added:
+        pairs = [(p, papers_by_id[other_id], shared) for p in papers_added for other_id, shared in matches(p)]
+    else:
+        # Shared concepts are symmetric, so those pairs are only taken from the earlier paper.
+        # Nearest neighbours aren't, so a later paper may contribute an earlier neighbour;
+        # the pair is flipped to collection order and duplicates fall out below.
         pairs = []
+        for i, paper_a in enumerate(sources):
+            for other_id, shared in matches(paper_a):
+                if position[other_id] > i:
+                    pairs.append((paper_a, papers_by_id[other_id], shared))
+                elif not shared:
+                    pairs.append((papers_by_id[other_id], paper_a, shared))
 
-    for paper_a, paper_b in pairs:
-        if (paper_a.id, paper_b.id) in existing_edges or (paper_b.id, paper_a.id) in existing_edges:
+    # Keys are direction-free, so a pair found from both ends or stored reversed is one edge
+    keys = [edge_key(paper_a.id, paper_b.id) for paper_a, paper_b, _ in pairs]
+    seen = storage.existing_edge_keys(keys)
+    new_edges = []
+    by_concept_count = 0
+    for key, (paper_a, paper_b, shared) in zip(keys, pairs):
+        if key in seen:
             continue
+        seen.add(key)
+        new_edges.append(Edge(id=str(uuid.uuid4()), source_id=paper_a.id, target_id=paper_b.id))
+        by_concept_count += shared
 
-        if has_shared_concepts(paper_a, paper_b):
-            edge = Edge(id=str(uuid.uuid4()), source_id=paper_a.id, target_id=paper_b.id)
-            new_edges.append(edge)
-            storage.add_edge(edge)
-            existing_edges.add((paper_a.id, paper_b.id))
+    if new_edges:
+        storage.add_edges(new_edges)
+    citation_edges = link_citations(sources)
 
-    msg = f"Found {len(new_edges)} connections based on shared concepts." if new_edges else "No shared concepts found between papers."
-    return {**state, "connection_edges": new_edges, "connection_message": msg}
+    if new_edges or citation_edges:
+        msg = (f"Found {len(new_edges)} connections ({by_concept_count} from shared concepts, "
+               f"{len(new_edges) - by_concept_count} from similar abstracts) and {len(citation_edges)} citations.")
+    else:
+        msg = "No shared concepts, similar papers or citations found."
+    return {**state, "connection_edges": new_edges + citation_edges, "connection_message": msg}
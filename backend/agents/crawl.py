@@ -1,14 +1,11 @@
 import re
 from typing import List, Optional
-from tavily import TavilyClient
-from config import TAVILY_API_KEY
 from agents.base import invoke_bedrock
+from agents.tavily_gateway import tavily
 from agents.utils import extract_arxiv_id
 from agents.prompts import CRAWL_URL_EXTRACTION_PROMPT, CRAWL_INSTRUCTIONS_PROMPT
 from models import PaperCandidate
 
-tavily = TavilyClient(api_key=TAVILY_API_KEY)
-
 
 def crawl_for_papers(start_url: str, instructions: Optional[str] = None, max_depth: int = 2, limit: int = 20) -> List[dict]:
     try:
@@ -1,11 +1,9 @@
-from typing import List
-from tavily import TavilyClient
-from agents.base import invoke_bedrock
+from typing import List, Optional
+from langchain_core.runnables import RunnableConfig
+from agents.base import invoke_bedrock, invoke_bedrock_stream, token_callback
+from agents.tavily_gateway import tavily
 from agents.utils import extract_arxiv_id
 from agents.prompts import EXTRACT_URL_EXTRACTION_PROMPT, SUMMARIZE_CONTENT_PROMPT
-from config import TAVILY_API_KEY
-
-tavily = TavilyClient(api_key=TAVILY_API_KEY)
 
 
 def extract_url_content(urls: List[str]) -> List[dict]:
@@ -17,7 +15,7 @@ def extract_url_content(urls: List[str]) -> List[dict]:
         return []
 
 
-def extract_agent(state: dict) -> dict:
+def extract_agent(state: dict, config: Optional[RunnableConfig] = None) -> dict:
     message = state.get("user_message", "")
 
     url = invoke_bedrock(
@@ -50,11 +48,12 @@ def extract_agent(state: dict) -> dict:
 
     arxiv_id = extract_arxiv_id(url)
 
-    summary = invoke_bedrock(
-        SUMMARIZE_CONTENT_PROMPT.format(content=content[:10000]),
-        max_tokens=1000,
-        temperature=0.3
-    ).strip()
+    prompt = SUMMARIZE_CONTENT_PROMPT.format(content=content[:10000])
+    on_token = token_callback(config)
+    if on_token:
+        summary = invoke_bedrock_stream(prompt, on_token, max_tokens=1000, temperature=0.3).strip()
+    else:
+        summary = invoke_bedrock(prompt, max_tokens=1000, temperature=0.3).strip()
 
     response_parts = [summary]
 
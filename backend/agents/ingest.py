@@ -1,15 +1,17 @@
 import arxiv
 import json
-from typing import List
-from tavily import TavilyClient
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 from agents.base import invoke_bedrock, invoke_bedrock_with_pdf
+from agents.tavily_gateway import tavily
+from agents.arxiv_gateway import arxiv_gateway
 from agents.prompts import CONCEPT_EXTRACTION_PROMPT, PAPER_NAME_EXTRACTION_PROMPT, RELATED_REFERENCE_EXTRACTION_PROMPT
-from agents.utils import extract_arxiv_id, search_arxiv_by_name, download_pdf
+from agents.utils import extract_arxiv_id, search_arxiv_by_name, download_pdf, fetch_arxiv_metadata
+from indexes import normalize_arxiv_id
 from models import Paper, PaperCandidate, Reference
 from storage import storage
-from config import TAVILY_API_KEY
-
-tavily = TavilyClient(api_key=TAVILY_API_KEY)
+from config import TITLE_DUPLICATE_THRESHOLD
 
 
 def extract_key_concepts(title: str, abstract: str) -> List[str]:
@@ -23,9 +25,12 @@ def extract_key_concepts(title: str, abstract: str) -> List[str]:
     return concepts[:5]
 
 
-def extract_references_from_pdf(pdf_url: str) -> List[Reference]:
+def extract_references_from_pdf(pdf_url: str, timings: Optional[Dict[str, float]] = None) -> List[Reference]:
     try:
+        start = time.perf_counter()
         pdf_bytes = download_pdf(pdf_url)
+        if timings is not None:
+            timings["pdf_download"] = time.perf_counter() - start
         response = invoke_bedrock_with_pdf(
             RELATED_REFERENCE_EXTRACTION_PROMPT,
             pdf_bytes,
@@ -39,24 +44,59 @@ def extract_references_from_pdf(pdf_url: str) -> List[Reference]:
         return []
 
 
-def fetch_paper_from_arxiv(arxiv_id: str) -> Paper:
-    search = arxiv.Search(id_list=[arxiv_id])
-    client = arxiv.Client(page_size=1, delay_seconds=3.0, num_retries=3)
-    results = list(client.results(search))
+StageCallback = Optional[Callable[[str], None]]
+
+
+def _timed(stage: str, timings: Dict[str, float], on_stage: StageCallback, fn, *args):
+    if on_stage:
+        on_stage(stage)
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        timings[stage] = time.perf_counter() - start
+
+
+def fetch_paper_from_arxiv(arxiv_id: str, timings: Optional[Dict[str, float]] = None,
+                           on_stage: StageCallback = None) -> Paper:
+    """Fetch metadata, then extract concepts and references concurrently.
+
+    Per-stage wall-clock seconds are written into ``timings`` when given, and
+    ``on_stage`` is called with each stage name as it starts.
+    """
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+
+    search = arxiv.Search(id_list=[arxiv_id], max_results=1)
+    results = _timed("metadata", timings, on_stage, arxiv_gateway.results, search)
     if not results:
         raise ValueError(f"Paper not found: {arxiv_id}")
 
-    paper = results[0]
-    key_concepts = extract_key_concepts(paper.title, paper.summary)
-    references = extract_references_from_pdf(paper.pdf_url)
+    paper = build_paper(results[0], timings, on_stage)
+    timings["total"] = time.perf_counter() - start
+    return paper
+
+
+def build_paper(result: arxiv.Result, timings: Optional[Dict[str, float]] = None,
+                on_stage: StageCallback = None) -> Paper:
+    """Enrich an arXiv result with key concepts and references."""
+    timings = {} if timings is None else timings
+
+    # Concept extraction and the PDF download + reference extraction only need the metadata
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        concepts_future = pool.submit(
+            _timed, "concepts", timings, on_stage, extract_key_concepts, result.title, result.summary
+        )
+        references = _timed("references", timings, on_stage, extract_references_from_pdf, result.pdf_url, timings)
+        key_concepts = concepts_future.result()
 
     return Paper(
-        id=paper.get_short_id(),
-        title=paper.title,
-        authors=[author.name for author in paper.authors],
-        summary=paper.summary,
-        published=paper.published,
-        pdf_url=paper.pdf_url,
+        id=result.get_short_id(),
+        title=result.title,
+        authors=[author.name for author in result.authors],
+        summary=result.summary,
+        published=result.published,
+        pdf_url=result.pdf_url,
         key_concepts=key_concepts,
         references=references,
     )
@@ -73,6 +113,17 @@ def ingest_agent(state: dict) -> dict:
             temperature=0
         ).strip()
 
+        # A near-identical title already in the collection saves the rate-limited arXiv search
+        matches = storage.get_title_index().search(paper_query, k=1, min_score=TITLE_DUPLICATE_THRESHOLD)
+        existing = storage.get_paper(matches[0][0]) if matches else None
+        if existing:
+            return {
+                **state,
+                "papers_added": [existing],
+                "paper_candidates": [],
+                "response": f"Paper '{existing.title}' is already in your collection."
+            }
+
         try:
             results = search_arxiv_by_name(paper_query, max_results=5)
             if not results:
@@ -167,39 +218,40 @@ def search_papers_agent(state: dict) -> dict:
                 "response": f"No papers found for '{paper_query}'. Try different keywords."
             }
 
-        candidates = []
-        seen_ids = set()
-
+        # Keep the first few unique IDs, with the Tavily title as a fallback
+        tavily_titles = {}
         for result in tavily_results:
-            url = result.get("url", "")
-            arxiv_id = extract_arxiv_id(url)
-
-            if not arxiv_id or arxiv_id in seen_ids:
-                continue
-
-            seen_ids.add(arxiv_id)
-
-            try:
-                arxiv_results = search_arxiv_by_name(arxiv_id, max_results=1)
-                if arxiv_results:
-                    paper = arxiv_results[0]
-                    candidates.append(PaperCandidate(
-                        arxiv_id=paper.get_short_id(),
-                        title=paper.title,
-                        authors=[a.name for a in paper.authors[:3]],
-                        year=paper.published.year
-                    ))
-            except Exception:
+            arxiv_id = extract_arxiv_id(result.get("url", ""))
+            if arxiv_id and normalize_arxiv_id(arxiv_id) not in tavily_titles:
+                tavily_titles[normalize_arxiv_id(arxiv_id)] = (arxiv_id, result.get("title", "Unknown Title"))
+            if len(tavily_titles) >= 5:
+                break
+
+        # One id_list query for all candidates instead of a rate-limited lookup per ID
+        try:
+            metadata = fetch_arxiv_metadata([arxiv_id for arxiv_id, _ in tavily_titles.values()])
+        except Exception as e:
+            print(f"arXiv metadata lookup failed: {e}")
+            metadata = {}
+
+        candidates = []
+        for base_id, (arxiv_id, title) in tavily_titles.items():
+            paper = metadata.get(base_id)
+            if paper:
+                candidates.append(PaperCandidate(
+                    arxiv_id=paper.get_short_id(),
+                    title=paper.title,
+                    authors=[a.name for a in paper.authors[:3]],
+                    year=paper.published.year
+                ))
+            else:
                 candidates.append(PaperCandidate(
                     arxiv_id=arxiv_id,
-                    title=result.get("title", "Unknown Title"),
+                    title=title,
                     authors=[],
                     year=0
                 ))
 
-            if len(candidates) >= 5:
-                break
-
         if not candidates:
             return {
                 **state,
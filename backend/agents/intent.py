@@ -0,0 +1,150 @@
+"""Rule-based intent classifier that lets the router skip Bedrock for obvious messages.
+
+Each rule is a compiled pattern with a score. The best-scoring intent wins, but a
+close runner-up lowers the confidence so mixed requests still go to the LLM.
+"""
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from config import ROUTER_FAST_PATH_THRESHOLD
+
+URL_PATTERN = re.compile(r"https?://\S+|\bwww\.\S+", re.IGNORECASE)
+
+# (intent, pattern, score, requires a URL in the message)
+_RULES = [
+    ("crawl", r"\bcrawl(?:ing)?\b", 0.95, True),
+    ("crawl", r"\bcrawl(?:ing)?\b", 0.7, False),
+    ("map", r"^\s*map\b|\bmap (?:out )?(?:the |this )?(?:site|page|category|papers|urls|links)\b", 0.95, True),
+    ("map", r"\bmap\b", 0.6, True),
+    ("extract", r"\b(?:extract|summari[sz]e|read|scrape|pull (?:the )?content)\b", 0.9, True),
+    # Confident only as a request; "which of my papers build on BERT?" is a question about the collection
+    ("find_related", r"^\s*(?:please )?(?:find|show|search for|list|get)\b.*\b(?:related to|similar to|cit(?:e|es|ing)|cited by|build(?:s|ing)? on)\b", 0.9, False),
+    ("find_related", r"^\s*(?:what|which) (?:papers|work) (?:cite|cites)\b", 0.9, False),
+    ("find_related", r"\b(?:related to|similar to|papers? (?:that )?cit(?:e|es|ing)|citing|cited by|build(?:s|ing)? on)\b", 0.6, False),
+    ("find_connections", r"\b(?:find|show|discover|list) (?:the |all |any )?connections?\b", 0.95, False),
+    ("find_connections", r"\bhow (?:are|do) (?:my|these|the) papers (?:connect(?:ed)?|relate(?:d)?)\b", 0.9, False),
+    ("find_connections", r"\bconnect (?:my|the|these) papers\b", 0.9, False),
+    ("search_paper", r"^\s*(?:please )?(?:search|look up|discover|find|get) (?:for )?(?:some |recent |new |the latest )?papers? (?:on|about|for|regarding)\b", 0.9, False),
+    ("search_paper", r"^\s*search (?:arxiv )?for\b", 0.85, False),
+    ("search_paper", r"^\s*what are (?:some |the )?(?:latest|recent|newest|new) papers (?:on|about|in)\b", 0.85, False),
+    ("add_paper", r"^\s*(?:please )?(?:add|import|ingest|save)\b.*\bpaper\b", 0.85, False),
+]
+# Only considered when no task-specific rule matched, since "question" is the catch-all
+_QUESTION_RULE = re.compile(r"^\s*(?:what|why|how|which|who|when|where|explain|compare|describe|can you explain)\b", re.IGNORECASE)
+_QUESTION_SCORE = 0.8
+# A leading "what"/"how" is weak evidence: questions that also ask for new papers or an add go to the LLM
+_TASK_WORDING = re.compile(
+    r"\b(?:add|import|ingest|save|search|find|look up|download|latest|recent|newest|new|read next|"
+    r"papers? (?:on|about|regarding))\b",
+    re.IGNORECASE,
+)
+_TASK_QUESTION_SCORE = 0.5
+
+_COMPILED = [(intent, re.compile(pattern, re.IGNORECASE), score, needs_url) for intent, pattern, score, needs_url in _RULES]
+
+
+def classify_intent(message: str) -> Tuple[Optional[str], float]:
+    """Return (intent, confidence); intent is None when no rule matched."""
+    has_url = bool(URL_PATTERN.search(message))
+    scores: Dict[str, float] = {}
+    for intent, pattern, score, needs_url in _COMPILED:
+        if needs_url and not has_url:
+            continue
+        if score > scores.get(intent, 0.0) and pattern.search(message):
+            scores[intent] = score
+
+    if not scores:
+        if not has_url and _QUESTION_RULE.search(message):
+            return "question", _TASK_QUESTION_SCORE if _TASK_WORDING.search(message) else _QUESTION_SCORE
+        return None, 0.0
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    intent, best = ranked[0]
+    if len(ranked) > 1:
+        # Two plausible intents: confidence is the margin between them
+        return intent, best - ranked[1][1]
+    return intent, best
+
+
+def is_confident(confidence: float, threshold: float = ROUTER_FAST_PATH_THRESHOLD) -> bool:
+    return confidence >= threshold
+
+
+class IntentMetrics:
+    """Counts fast-path hits and, for LLM-checked messages, how often the rules disagreed."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"messages": 0, "fast_path_hits": 0, "llm_calls": 0, "compared": 0, "disagreements": 0}
+        self.fast_path_intents: Counter = Counter()
+
+    def reset(self):
+        with self._lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+            self.fast_path_intents.clear()
+
+    def record_fast_path(self, intent: str):
+        with self._lock:
+            self.stats["messages"] += 1
+            self.stats["fast_path_hits"] += 1
+            self.fast_path_intents[intent] += 1
+
+    def record_llm(self, rule_intent: Optional[str], llm_intent: str, shadow: bool = False):
+        """Record an LLM classification; shadow checks re-verify a message the fast path already answered."""
+        with self._lock:
+            if not shadow:
+                self.stats["messages"] += 1
+            self.stats["llm_calls"] += 1
+            if rule_intent is not None:
+                self.stats["compared"] += 1
+                if rule_intent != llm_intent:
+                    self.stats["disagreements"] += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["fast_path_intents"] = dict(self.fast_path_intents)
+        stats["hit_rate"] = stats["fast_path_hits"] / stats["messages"] if stats["messages"] else 0.0
+        stats["disagreement_rate"] = stats["disagreements"] / stats["compared"] if stats["compared"] else 0.0
+        return stats
+
+
+intent_metrics = IntentMetrics()
+
+
+def evaluate_fast_path(
+    samples: Iterable[Tuple[str, str]],
+    llm_classify: Optional[Callable[[str], str]] = None,
+    threshold: float = ROUTER_FAST_PATH_THRESHOLD,
+) -> dict:
+    """Score the rules against (message, expected_intent) pairs.
+
+    Reports how many messages the fast path would resolve, how accurate those
+    answers are, and (given an LLM classifier) how often the two disagree.
+    """
+    total = hits = correct = compared = disagreements = 0
+    mistakes = []
+    for message, expected in samples:
+        total += 1
+        intent, confidence = classify_intent(message)
+        if intent is None or not is_confident(confidence, threshold):
+            continue
+        hits += 1
+        if intent == expected:
+            correct += 1
+        else:
+            mistakes.append({"message": message, "expected": expected, "predicted": intent})
+        if llm_classify is not None:
+            compared += 1
+            if llm_classify(message) != intent:
+                disagreements += 1
+
+    return {
+        "samples": total,
+        "fast_path_hits": hits,
+        "hit_rate": hits / total if total else 0.0,
+        "precision": correct / hits if hits else 0.0,
+        "disagreement_rate": disagreements / compared if compared else 0.0,
+        "mistakes": mistakes,
+    }
@@ -0,0 +1,129 @@
+"""Content-addressed cache for deterministic Bedrock calls.
+
+An in-memory LRU sits in front of a SQLite file so hits survive restarts and are
+shared between workers on the same host.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from config import LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MEMORY_ENTRIES
+
+
+def make_key(model_id: str, prompt: str, max_tokens: int, temperature: float, attachment: Optional[bytes] = None) -> str:
+    payload = json.dumps([model_id, prompt, max_tokens, temperature], ensure_ascii=False)
+    digest = hashlib.sha256(payload.encode("utf-8"))
+    if attachment is not None:
+        digest.update(hashlib.sha256(attachment).digest())
+    return digest.hexdigest()
+
+
+class LLMCache:
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int, memory_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0}
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+        return self._db
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: str, created_at: float):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and not self._expired(cached[1], now):
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return cached[0]
+            self._memory.pop(key, None)
+
+            db = self._conn()
+            row = db.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row and not self._expired(row[1], now):
+                db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                db.commit()
+                self._remember(key, row[0], row[1])
+                self.stats["disk_hits"] += 1
+                return row[0]
+            if row:
+                db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                db.commit()
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict(db, now)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        if self.ttl_seconds > 0:
+            db.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            db.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def record_bypass(self):
+        with self._lock:
+            self.stats["bypassed"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn().execute("DELETE FROM llm_cache")
+            self._conn().commit()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+llm_cache: Optional[LLMCache] = LLMCache(
+    LLM_CACHE_PATH,
+    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    memory_entries=LLM_CACHE_MEMORY_ENTRIES,
+) if LLM_CACHE_ENABLED else None
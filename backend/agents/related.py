@@ -1,13 +1,11 @@
 from typing import List
-from tavily import TavilyClient
 from agents.base import invoke_bedrock
+from agents.tavily_gateway import tavily
 from agents.utils import extract_arxiv_id
 from agents.prompts import PAPER_TITLE_EXTRACTION_PROMPT
 from models import PaperCandidate
 from storage import storage
-from config import TAVILY_API_KEY
-
-tavily = TavilyClient(api_key=TAVILY_API_KEY)
+from config import TITLE_MATCH_THRESHOLD
 
 
 def search_related_papers(paper_title: str, max_results: int = 10) -> List[dict]:
@@ -33,14 +31,12 @@ def find_related_agent(state: dict) -> dict:
         temperature=0
     ).strip()
 
-    all_papers = storage.get_all_papers()
     source_paper_id = None
-
-    for paper in all_papers:
-        if paper_query.lower() in paper.title.lower():
-            source_paper_id = paper.id
-            paper_query = paper.title
-            break
+    matches = storage.get_title_index().search(paper_query, k=1, min_score=TITLE_MATCH_THRESHOLD)
+    source_paper = storage.get_paper(matches[0][0]) if matches else None
+    if source_paper:
+        source_paper_id = source_paper.id
+        paper_query = source_paper.title
 
     search_results = search_related_papers(paper_query)
 
@@ -51,7 +47,6 @@ def find_related_agent(state: dict) -> dict:
             "response": f"No related papers found for '{paper_query}'."
         }
 
-    existing_ids = {p.id for p in all_papers}
     candidates = []
     seen_ids = set()
 
@@ -59,7 +54,7 @@ def find_related_agent(state: dict) -> dict:
         url = result.get("url", "")
         arxiv_id = extract_arxiv_id(url)
 
-        if not arxiv_id or arxiv_id in existing_ids or arxiv_id in seen_ids:
+        if not arxiv_id or arxiv_id in seen_ids or storage.get_paper(arxiv_id):
             continue
 
         seen_ids.add(arxiv_id)
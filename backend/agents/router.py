@@ -1,19 +1,13 @@
+import random
+from typing import Optional
 from agents.base import invoke_bedrock
+from agents.intent import classify_intent, is_confident, intent_metrics
 from agents.utils import extract_arxiv_id
 from agents.prompts import ROUTER_PROMPT
+from config import ROUTER_SHADOW_SAMPLE_RATE
 
 
-def router_agent(state: dict) -> dict:
-    message = state.get("user_message", "")
-    if not message:
-        return {**state, "intent": "question", "error": "No message provided"}
-
-    # If we do find an arxiv ID, we assume the user wants to add that paper
-    arxiv_id = extract_arxiv_id(message)
-    if arxiv_id:
-        return {**state, "intent": "add_paper", "arxiv_id": arxiv_id}
-
-    # Use LLM for other intent classification
+def classify_with_llm(message: str) -> str:
     response = invoke_bedrock(
         ROUTER_PROMPT.format(message=message),
         max_tokens=20,
@@ -23,20 +17,42 @@ def router_agent(state: dict) -> dict:
     intent = response.strip().lower()
 
     if "add_paper" in intent:
-        intent = "add_paper"
+        return "add_paper"
     elif "search_paper" in intent:
-        intent = "search_paper"
+        return "search_paper"
     elif "find_related" in intent:
-        intent = "find_related"
+        return "find_related"
     elif "find_connections" in intent:
-        intent = "find_connections"
+        return "find_connections"
     elif "extract" in intent:
-        intent = "extract"
+        return "extract"
     elif "crawl" in intent:
-        intent = "crawl"
+        return "crawl"
     elif "map" in intent:
-        intent = "map"
-    else:
-        intent = "question"
+        return "map"
+    return "question"
+
+
+def router_agent(state: dict) -> dict:
+    message = state.get("user_message", "")
+    if not message:
+        return {**state, "intent": "question", "error": "No message provided"}
+
+    # If we do find an arxiv ID, we assume the user wants to add that paper
+    arxiv_id = extract_arxiv_id(message)
+    if arxiv_id:
+        intent_metrics.record_fast_path("add_paper")
+        return {**state, "intent": "add_paper", "arxiv_id": arxiv_id}
+
+    # Obvious requests are classified locally; only ambiguous ones pay for a Bedrock call
+    rule_intent: Optional[str]
+    rule_intent, confidence = classify_intent(message)
+    if rule_intent and is_confident(confidence):
+        intent_metrics.record_fast_path(rule_intent)
+        if ROUTER_SHADOW_SAMPLE_RATE > 0 and random.random() < ROUTER_SHADOW_SAMPLE_RATE:
+            intent_metrics.record_llm(rule_intent, classify_with_llm(message), shadow=True)
+        return {**state, "intent": rule_intent}
 
+    intent = classify_with_llm(message)
+    intent_metrics.record_llm(rule_intent, intent)
     return {**state, "intent": intent}
@@ -26,6 +26,7 @@ def build_cytoscape_graph(graph_data: GraphData) -> dict:
                 "id": edge.id,
                 "source": edge.source_id,
                 "target": edge.target_id,
+                "edge_type": edge.edge_type,
             }
         })
 
@@ -0,0 +1,132 @@
+"""Single Tavily client shared by all agents, with a per-operation response cache.
+
+Responses are kept in an in-memory LRU keyed on the normalized call parameters.
+Concurrent identical calls are coalesced so only one of them reaches the network.
+"""
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+from lazy import LazyClient
+from metrics import track_call
+from config import (
+    TAVILY_API_KEY, TAVILY_CACHE_ENABLED, TAVILY_CACHE_MAX_ENTRIES,
+    TAVILY_SEARCH_TTL_SECONDS, TAVILY_EXTRACT_TTL_SECONDS, TAVILY_CRAWL_TTL_SECONDS, TAVILY_MAP_TTL_SECONDS,
+)
+
+# Parameters whose order never affects the response
+_UNORDERED_PARAMS = {"include_domains", "exclude_domains"}
+
+
+def _normalize(name: str, value: Any) -> Any:
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value.lower() if name == "query" else value
+    if isinstance(value, (list, tuple)):
+        items = [_normalize(name, v) for v in value]
+        return sorted(items) if name in _UNORDERED_PARAMS else items
+    return value
+
+
+def make_key(operation: str, params: Dict[str, Any]) -> str:
+    normalized = {name: _normalize(name, value) for name, value in params.items() if value is not None}
+    return json.dumps([operation, normalized], sort_keys=True, default=str)
+
+
+class TavilyGateway:
+
+    def __init__(self, client, ttl_seconds: Dict[str, float], max_entries: int):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {op: {"hits": 0, "misses": 0, "coalesced": 0} for op in ttl_seconds}
+
+    def search(self, **params):
+        return self._call("search", self.client.search, params)
+
+    def extract(self, **params):
+        return self._call("extract", self.client.extract, params)
+
+    def crawl(self, **params):
+        return self._call("crawl", self.client.crawl, params)
+
+    def map(self, **params):
+        return self._call("map", self.client.map, params)
+
+    def _call(self, operation: str, fn: Callable, params: Dict[str, Any]):
+        ttl = self.ttl_seconds.get(operation, 0)
+        key = make_key(operation, params)
+        owner = False
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[1] < ttl:
+                self._cache.move_to_end(key)
+                self.stats[operation]["hits"] += 1
+                return copy.deepcopy(cached[0])
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+                self.stats[operation]["misses"] += 1
+            else:
+                self.stats[operation]["coalesced"] += 1
+
+        if not owner:
+            return copy.deepcopy(pending.result())
+
+        try:
+            with track_call("tavily", operation):
+                response = fn(**params)
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            if ttl > 0:
+                self._cache[key] = (response, time.monotonic())
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            self._inflight.pop(key, None)
+        pending.set_result(response)
+        return copy.deepcopy(response)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            operations = {op: dict(counts) for op, counts in self.stats.items()}
+            entries = len(self._cache)
+        served = sum(c["hits"] + c["coalesced"] for c in operations.values())
+        calls = served + sum(c["misses"] for c in operations.values())
+        return {**operations, "entries": entries, "hit_rate": served / calls if calls else 0.0}
+
+
+def _create_tavily_client():
+    from tavily import TavilyClient
+    return TavilyClient(api_key=TAVILY_API_KEY)
+
+
+_ttls = {
+    "search": TAVILY_SEARCH_TTL_SECONDS,
+    "extract": TAVILY_EXTRACT_TTL_SECONDS,
+    "crawl": TAVILY_CRAWL_TTL_SECONDS,
+    "map": TAVILY_MAP_TTL_SECONDS,
+}
+
+tavily = TavilyGateway(
+    LazyClient(_create_tavily_client),
+    ttl_seconds=_ttls if TAVILY_CACHE_ENABLED else dict.fromkeys(_ttls, 0),
+    max_entries=TAVILY_CACHE_MAX_ENTRIES,
+)
@@ -1,8 +1,20 @@
 import arxiv
+import hashlib
+import json
+import os
 import re
-import time
 import requests
-from typing import List, Optional
+import tempfile
+from typing import Dict, List, Optional
+from agents.arxiv_gateway import arxiv_gateway, pdf_limiter, retry_after_seconds
+from indexes import normalize_arxiv_id
+from metrics import track_call
+from config import PDF_CACHE_DIR, PDF_MAX_BYTES, ARXIV_BACKOFF_SECONDS
+
+_http = requests.Session()
+_PDF_CHUNK_SIZE = 64 * 1024
+# arXiv's API returns at most this many entries for one id_list query page
+ARXIV_ID_LIST_CHUNK = 100
 
 
 def extract_arxiv_id(text: str) -> Optional[str]:
@@ -15,35 +27,101 @@ def extract_arxiv_id(text: str) -> Optional[str]:
     return None
 
 
-def search_arxiv_by_name(query: str, max_results: int = 5, max_retries: int = 3) -> List:
+def fetch_arxiv_metadata(arxiv_ids: List[str]) -> Dict[str, arxiv.Result]:
+    """Resolve many IDs with chunked id_list queries, keyed by versionless ID."""
+    found = {}
+    for start in range(0, len(arxiv_ids), ARXIV_ID_LIST_CHUNK):
+        chunk = arxiv_ids[start:start + ARXIV_ID_LIST_CHUNK]
+        search = arxiv.Search(id_list=chunk, max_results=len(chunk))
+        for result in arxiv_gateway.results(search):
+            found[normalize_arxiv_id(result.get_short_id())] = result
+    return found
+
+
+def search_arxiv_by_name(query: str, max_results: int = 5) -> List:
     search = arxiv.Search(
         query=query,
         max_results=max_results,
         sort_by=arxiv.SortCriterion.Relevance
     )
-    client = arxiv.Client(
-        page_size=max_results,
-        delay_seconds=3.0,
-        num_retries=max_retries
-    )
+    return arxiv_gateway.results(search)
+
+
+def _pdf_cache_path(arxiv_id: Optional[str], pdf_url: str) -> str:
+    name = arxiv_id or hashlib.sha256(pdf_url.encode("utf-8")).hexdigest()
+    return os.path.join(PDF_CACHE_DIR, f"{name}.pdf")
+
+
+def _read_pdf_meta(meta_path: str) -> dict:
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
 
-    for attempt in range(max_retries):
+def _is_arxiv_url(url: str) -> bool:
+    return bool(re.match(r"https?://(?:[\w-]+\.)?arxiv\.org/", url, re.IGNORECASE))
+
+
+def download_pdf(pdf_url: str, max_bytes: int = PDF_MAX_BYTES) -> bytes:
+    arxiv_id = extract_arxiv_id(pdf_url)
+    path = _pdf_cache_path(arxiv_id, pdf_url)
+    meta_path = path + ".json"
+    cached = os.path.exists(path)
+
+    # Versioned arXiv PDFs never change, so a local copy needs no revalidation
+    if cached and arxiv_id and re.search(r"v\d+$", arxiv_id):
+        with open(path, "rb") as f:
+            return f.read()
+
+    headers = {}
+    if cached:
+        meta = _read_pdf_meta(meta_path)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    if _is_arxiv_url(pdf_url):
+        pdf_limiter.acquire()
+    with track_call("pdf", "download"), _http.get(pdf_url, headers=headers, stream=True, timeout=30) as response:
+        if response.status_code == 304 and cached:
+            with open(path, "rb") as f:
+                return f.read()
+        if response.status_code in (429, 503) and _is_arxiv_url(pdf_url):
+            # Hold back every worker's next download, not just this one
+            pdf_limiter.pause(retry_after_seconds(response) or ARXIV_BACKOFF_SECONDS)
+        response.raise_for_status()
+
+        declared = int(response.headers.get("Content-Length") or 0)
+        if declared > max_bytes:
+            raise ValueError(f"PDF too large ({declared} bytes, limit {max_bytes})")
+
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        # A unique temp file per download, so concurrent fetches of one PDF never share a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=PDF_CACHE_DIR, suffix=".part")
+        size = 0
         try:
-            if attempt > 0:
-                time.sleep(5 * attempt)
-            return list(client.results(search))
-        except Exception as e:
-            error_str = str(e)
-            if ("429" in error_str or "rate" in error_str.lower()) and attempt < max_retries - 1:
-                continue
-            raise
-
-    return []
-
-
-def download_pdf(pdf_url: str) -> bytes:
-    response = requests.get(pdf_url, timeout=30)
-    response.raise_for_status()
-    return response.content
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=_PDF_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ValueError(f"PDF exceeds {max_bytes} bytes: {pdf_url}")
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with open(meta_path, "w") as f:
+            json.dump({
+                "url": pdf_url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }, f)
+
+    with open(path, "rb") as f:
+        return f.read()
 
 
@@ -0,0 +1,304 @@
+import threading
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from models import Paper, Edge
+from config import GRAPH_BETWEENNESS_SAMPLES, GRAPH_PAGERANK_DAMPING
+
+
+def _csr(n: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Compressed sparse rows (indptr, indices) of the undirected graph with edges ``src[i] - dst[i]``."""
+    rows = np.concatenate([src, dst])
+    cols = np.concatenate([dst, src])
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order]
+
+
+def _expand(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Every (u, v) adjacency entry with u in ``frontier``, gathered without a Python loop."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return np.repeat(frontier, counts), indices[offsets]
+
+
+def _rank_labels(labels: np.ndarray) -> np.ndarray:
+    """Relabel groups 0..k-1, largest first (ties by smallest member)."""
+    _, first, inverse, counts = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+    order = np.lexsort((first, -counts))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank[inverse]
+
+
+def pagerank(n: int, src: np.ndarray, dst: np.ndarray, damping: float = GRAPH_PAGERANK_DAMPING,
+             tol: float = 1e-10, max_iter: int = 200) -> np.ndarray:
+    """Power iteration over the directed links ``src[i] -> dst[i]``; dangling papers spread their rank evenly."""
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.bincount(src, minlength=n).astype(np.float64)
+    dangling = out_degree == 0
+    share = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = np.bincount(dst, weights=(rank * share)[src], minlength=n)
+        updated = (1 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+        converged = np.abs(updated - rank).sum() < tol
+        rank = updated
+        if converged:
+            break
+    return rank
+
+
+def connected_components(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Component label per node: min-label propagation with pointer jumping."""
+    labels = np.arange(n)
+    while True:
+        lowest = np.minimum(labels[src], labels[dst])
+        updated = labels.copy()
+        np.minimum.at(updated, src, lowest)
+        np.minimum.at(updated, dst, lowest)
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def betweenness(indptr: np.ndarray, indices: np.ndarray, samples: int = GRAPH_BETWEENNESS_SAMPLES,
+                seed: int = 0) -> Tuple[np.ndarray, bool]:
+    """Normalized betweenness centrality (Brandes), with each BFS run a level at a time.
+
+    Exact when the graph has at most ``samples`` nodes; otherwise estimated from that many
+    random sources and scaled up. Returns the scores and whether they are exact.
+    """
+    n = len(indptr) - 1
+    scores = np.zeros(n)
+    if n < 3:
+        return scores, True
+    if samples <= 0:
+        return scores, False
+    exact = samples >= n
+    sources = np.arange(n) if exact else np.random.default_rng(seed).choice(n, samples, replace=False)
+    for source in sources:
+        dist = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)
+        dist[source] = 0
+        sigma[source] = 1.0
+        frontier = np.array([source])
+        levels = []
+        depth = 0
+        while frontier.size:
+            u, v = _expand(indptr, indices, frontier)
+            unseen = v[dist[v] < 0]
+            frontier = np.unique(unseen)
+            dist[frontier] = depth + 1
+            on_path = dist[v] == depth + 1
+            u, v = u[on_path], v[on_path]
+            # Path counts at this depth are final: all their predecessors sit one level up
+            sigma += np.bincount(v, weights=sigma[u], minlength=n)
+            levels.append((u, v))
+            depth += 1
+        delta = np.zeros(n)
+        for u, v in reversed(levels):
+            delta += np.bincount(u, weights=sigma[u] / sigma[v] * (1 + delta[v]), minlength=n)
+        delta[source] = 0
+        scores += delta
+    if not exact:
+        scores *= n / samples
+    # Each undirected path is counted from both ends
+    return scores / ((n - 1) * (n - 2)), exact
+
+
+def label_propagation(indptr: np.ndarray, indices: np.ndarray, seed: int = 0, max_iter: int = 100) -> np.ndarray:
+    """Community label per node: each node repeatedly adopts its neighbours' most common label.
+
+    Each round a random half of the nodes update at once, which keeps synchronous updates
+    from oscillating; a node keeps its label when it is among the most common.
+    """
+    n = len(indptr) - 1
+    labels = np.arange(n)
+    degree = np.diff(indptr)
+    rows = np.repeat(np.arange(n), degree)
+    connected = np.flatnonzero(degree)
+    rng = np.random.default_rng(seed)
+    for _ in range(max_iter):
+        if not connected.size:
+            break
+        keys, counts = np.unique(rows * n + labels[indices], return_counts=True)
+        nodes, candidates = keys // n, keys % n
+        # One group of keys per connected node, in node order
+        group_starts = np.flatnonzero(np.r_[True, nodes[1:] != nodes[:-1]])
+        best_count = np.maximum.reduceat(counts, group_starts)
+        # Keys are sorted, so the first top-count entry per node carries its smallest top label
+        top = counts == np.repeat(best_count, np.diff(np.r_[group_starts, len(keys)]))
+        _, first = np.unique(nodes[top], return_index=True)
+        wanted = labels.copy()
+        wanted[connected] = candidates[top][first]
+
+        current = connected * n + labels[connected]
+        position = np.minimum(np.searchsorted(keys, current), len(keys) - 1)
+        current_count = np.where(keys[position] == current, counts[position], 0)
+        keep = connected[current_count == best_count]
+        wanted[keep] = labels[keep]
+
+        changing = np.flatnonzero(wanted != labels)
+        if not changing.size:
+            break
+        chosen = changing[rng.random(changing.size) < 0.5]
+        labels[chosen] = wanted[chosen]
+    return labels
+
+
+def modularity(indptr: np.ndarray, indices: np.ndarray, labels: np.ndarray) -> float:
+    entries = len(indices)
+    if not entries:
+        return 0.0
+    rows = np.repeat(np.arange(len(labels)), np.diff(indptr))
+    groups = labels.max() + 1
+    # Adjacency entries count each edge twice, on both sides of the sums
+    inside = np.bincount(labels[rows], weights=labels[rows] == labels[indices], minlength=groups)
+    degree = np.bincount(labels[rows], minlength=groups)
+    return float((inside / entries - (degree / entries) ** 2).sum())
+
+
+def shortest_path(indptr: np.ndarray, indices: np.ndarray, source: int, target: int) -> Optional[List[int]]:
+    """Fewest-hop path as node indices (breadth-first, a level at a time), or None if unreachable."""
+    n = len(indptr) - 1
+    parent = np.full(n, -1, dtype=np.int64)
+    parent[source] = source
+    frontier = np.array([source])
+    while frontier.size and parent[target] < 0:
+        u, v = _expand(indptr, indices, frontier)
+        unseen = parent[v] < 0
+        frontier, first = np.unique(v[unseen], return_index=True)
+        parent[frontier] = u[unseen][first]
+    if parent[target] < 0:
+        return None
+    path = [target]
+    while path[-1] != source:
+        path.append(int(parent[path[-1]]))
+    return path[::-1]
+
+
+class GraphAnalytics:
+    """Centrality, components and communities of one version of the paper graph.
+
+    All edges count as undirected links, except for PageRank where a "cites" edge only
+    passes rank from the citing paper to the cited one.
+    """
+
+    def __init__(self, papers: Sequence[Paper], edges: Sequence[Edge], version: int = 0,
+                 betweenness_samples: int = GRAPH_BETWEENNESS_SAMPLES):
+        self.version = version
+        self.papers = list(papers)
+        self._index = {paper.id: i for i, paper in enumerate(self.papers)}
+        n = len(self.papers)
+
+        links = [
+            (self._index[e.source_id], self._index[e.target_id], e.edge_type == "cites")
+            for e in edges
+            if e.source_id in self._index and e.target_id in self._index and e.source_id != e.target_id
+        ]
+        src, dst, cites = (np.array(column, dtype=np.int64) for column in zip(*links)) if links else (
+            np.zeros(0, dtype=np.int64),) * 3
+        cites = cites.astype(bool)
+
+        # Undirected graph: one entry per unordered pair, whatever the edge types between them
+        pairs = np.unique(np.minimum(src, dst) * n + np.maximum(src, dst))
+        self.edge_count = len(pairs)
+        self._indptr, self._indices = _csr(n, pairs // n, pairs % n)
+        # Directed links for PageRank: "related" both ways, "cites" one way
+        out_src = np.concatenate([src, dst[~cites]])
+        out_dst = np.concatenate([dst, src[~cites]])
+        directed = np.unique(out_src * n + out_dst)
+
+        self.pagerank = pagerank(n, directed // n, directed % n)
+        self.degree = np.diff(self._indptr)
+        self.degree_centrality = self.degree / (n - 1) if n > 1 else np.zeros(n)
+        self.betweenness, self.betweenness_exact = betweenness(self._indptr, self._indices, betweenness_samples)
+        self.components = _rank_labels(connected_components(n, pairs // n, pairs % n))
+        self.communities = _rank_labels(label_propagation(self._indptr, self._indices))
+        self.modularity = modularity(self._indptr, self._indices, self.communities)
+
+        concepts: dict = {}
+        for paper, community in zip(self.papers, self.communities.tolist()):
+            concepts.setdefault(community, Counter()).update({c.lower() for c in paper.key_concepts})
+        self._community_concepts = {c: [name for name, _ in counts.most_common(5)] for c, counts in concepts.items()}
+
+    def _paper_stats(self, i: int) -> dict:
+        return {
+            "id": self.papers[i].id,
+            "title": self.papers[i].title,
+            "pagerank": float(self.pagerank[i]),
+            "degree": int(self.degree[i]),
+            "degree_centrality": float(self.degree_centrality[i]),
+            "betweenness": float(self.betweenness[i]),
+            "component": int(self.components[i]),
+            "community": int(self.communities[i]),
+        }
+
+    def summary(self, limit: int = 20) -> dict:
+        """The ``limit`` papers with the highest PageRank and the ``limit`` largest communities."""
+        n = len(self.papers)
+        hubs = np.lexsort((np.arange(n), -self.pagerank))[:limit]
+        community_sizes = np.bincount(self.communities, minlength=1 if n else 0)
+        communities = []
+        for community in range(min(limit, len(community_sizes))):
+            members = np.flatnonzero(self.communities == community)
+            central = members[np.argmax(self.pagerank[members])]
+            communities.append({
+                "id": community,
+                "size": int(community_sizes[community]),
+                "central_paper": self.papers[central].id,
+                "top_concepts": self._community_concepts.get(community, []),
+            })
+        return {
+            "version": self.version,
+            "papers": n,
+            "edges": self.edge_count,
+            "components": int(self.components.max() + 1) if n else 0,
+            "component_sizes": np.bincount(self.components).tolist()[:limit] if n else [],
+            "communities": communities,
+            "modularity": self.modularity,
+            "betweenness_exact": self.betweenness_exact,
+            "hubs": [self._paper_stats(i) for i in hubs],
+        }
+
+    def paper(self, paper_id: str) -> Optional[dict]:
+        i = self._index.get(paper_id)
+        return None if i is None else self._paper_stats(i)
+
+    def shortest_path(self, source_id: str, target_id: str) -> Optional[List[str]]:
+        """Paper ids along a fewest-hop path, or None when the papers aren't connected."""
+        path = shortest_path(self._indptr, self._indices, self._index[source_id], self._index[target_id])
+        return None if path is None else [self.papers[i].id for i in path]
+
+
+class AnalyticsCache:
+    """GraphAnalytics for the current storage version, recomputed by the first request after a change.
+
+    The storage version only moves when papers or edges change, so a TTL reload that finds
+    the same data keeps the computed analytics.
+    """
+
+    def __init__(self, store):
+        self._storage = store
+        self._analytics: Optional[GraphAnalytics] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> GraphAnalytics:
+        analytics = self._analytics
+        if analytics is not None and analytics.version == self._storage.current_version():
+            return analytics
+        # Concurrent requests wait for one recompute instead of each running their own
+        with self._lock:
+            version, graph = self._storage.get_versioned_graph_data()
+            if self._analytics is None or self._analytics.version != version:
+                self._analytics = GraphAnalytics(graph.nodes, graph.edges, version)
+            return self._analytics
@@ -0,0 +1,21 @@
+from .base import StorageBackend, encode_cursor, decode_cursor
+from config import STORAGE_BACKEND, SQLITE_PATH
+
+
+def create_backend(name: str = STORAGE_BACKEND) -> StorageBackend:
+    # Engines are imported lazily so a SQLite deployment doesn't need the supabase package
+    if name == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend(SQLITE_PATH)
+    if name == "supabase":
+        from .supabase_backend import SupabaseBackend
+        return SupabaseBackend()
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+__all__ = [
+    "StorageBackend",
+    "create_backend",
+    "encode_cursor",
+    "decode_cursor",
+]
@@ -0,0 +1,174 @@
+import base64
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple, Union
+from models import Paper, PaperLite, Edge, Reference, ChatMessage, Role
+
+PaperPage = Tuple[List[Union[Paper, PaperLite]], Optional[str]]
+ChatPage = Tuple[List[ChatMessage], Optional[str]]
+
+
+class StorageBackend(ABC):
+    """Persistence engine behind Storage. Storage adds caching and indexes on top."""
+
+    @abstractmethod
+    def load_papers(self) -> List[Paper]:
+        """All papers, newest first."""
+
+    @abstractmethod
+    def load_edges(self) -> List[Edge]:
+        ...
+
+    @abstractmethod
+    def load_embeddings(self) -> Dict[str, List[float]]:
+        """Stored paper embeddings by paper id. load_papers leaves them out."""
+
+    @abstractmethod
+    def save_embeddings(self, embeddings: Dict[str, List[float]]):
+        """Store embeddings for existing papers, by paper id."""
+
+    @abstractmethod
+    def upsert_papers(self, papers: List[Paper]):
+        ...
+
+    @abstractmethod
+    def insert_edges(self, edges: List[Edge]) -> List[Edge]:
+        """Insert edges whose canonical key isn't stored yet. Returns the ones inserted."""
+
+    @abstractmethod
+    def existing_edge_keys(self, keys: List[str]) -> Set[str]:
+        """The given edge keys that are stored, via the unique key index."""
+
+    @abstractmethod
+    def delete_edges(self, edge_ids: List[str]):
+        ...
+
+    @abstractmethod
+    def delete_paper(self, paper_id: str):
+        """Delete a paper and every edge touching it."""
+
+    @abstractmethod
+    def papers_page(self, limit: int, after: Optional[str], light: bool) -> PaperPage:
+        """Keyset page ordered by (created_at, id) descending."""
+
+    @abstractmethod
+    def add_chat_message(self, role: Role, content: str):
+        ...
+
+    @abstractmethod
+    def chat_history(self) -> List[ChatMessage]:
+        ...
+
+    @abstractmethod
+    def chat_history_page(self, limit: int, after: Optional[str]) -> ChatPage:
+        """Keyset page ordered by id ascending."""
+
+    @abstractmethod
+    def clear_chat_history(self):
+        ...
+
+
+# Every engine call is timed as an external call under this operation name
+STORAGE_OPERATIONS = tuple(sorted(StorageBackend.__abstractmethods__))
+
+
+def encode_cursor(*parts) -> str:
+    return base64.urlsafe_b64encode(json.dumps(parts).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        parts = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(parts, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return parts
+
+
+def decode_paper_cursor(cursor: str) -> Tuple[str, str]:
+    parts = decode_cursor(cursor)
+    if len(parts) != 2 or not all(isinstance(p, str) for p in parts):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return parts[0], parts[1]
+
+
+def decode_chat_cursor(cursor: str) -> int:
+    parts = decode_cursor(cursor)
+    if len(parts) != 1 or not isinstance(parts[0], int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return parts[0]
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def paper_to_row(paper: Paper) -> dict:
+    return {
+        "id": paper.id,
+        "title": paper.title,
+        "authors": paper.authors,
+        "summary": paper.summary,
+        "published": paper.published.isoformat(),
+        "pdf_url": paper.pdf_url,
+        "key_concepts": paper.key_concepts,
+        "references": [r.model_dump() for r in paper.references],
+        "embedding": paper.embedding,
+    }
+
+
+def edge_to_row(edge: Edge) -> dict:
+    return {
+        "id": edge.id,
+        "source_id": edge.source_id,
+        "target_id": edge.target_id,
+        "edge_type": edge.edge_type,
+        "edge_key": edge.key,
+    }
+
+
+def row_to_paper(row: dict) -> Paper:
+    references = [Reference(**r) for r in row.get("references") or []]
+    return Paper(
+        id=row["id"],
+        title=row["title"],
+        authors=row["authors"],
+        summary=row["summary"],
+        published=datetime.fromisoformat(row["published"].replace("Z", "+00:00")),
+        pdf_url=row["pdf_url"],
+        key_concepts=row.get("key_concepts") or [],
+        references=references,
+        embedding=row.get("embedding"),
+    )
+
+
+def row_to_paper_lite(row: dict) -> PaperLite:
+    return PaperLite(
+        id=row["id"],
+        title=row["title"],
+        authors=row["authors"],
+        published=datetime.fromisoformat(row["published"].replace("Z", "+00:00")),
+        pdf_url=row["pdf_url"],
+        key_concepts=row.get("key_concepts") or [],
+    )
+
+
+def row_to_edge(row: dict) -> Edge:
+    return Edge(
+        id=row["id"],
+        source_id=row["source_id"],
+        target_id=row["target_id"],
+        edge_type=row.get("edge_type") or "related",
+        created_at=parse_timestamp(row.get("created_at")),
+    )
+
+
+def row_to_chat_message(row: dict) -> ChatMessage:
+    return ChatMessage(
+        id=row.get("id"),
+        role=row["role"],
+        content=row["content"],
+        created_at=parse_timestamp(row.get("created_at")),
+    )
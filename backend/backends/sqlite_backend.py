@@ -0,0 +1,240 @@
+import json
+from array import array
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Set
+from models import Paper, Edge, ChatMessage, Role, edge_key
+from metrics import instrument_methods
+from backends.base import (
+    StorageBackend, STORAGE_OPERATIONS, PaperPage, ChatPage, encode_cursor, decode_paper_cursor, decode_chat_cursor,
+    paper_to_row, edge_to_row, row_to_paper, row_to_paper_lite, row_to_edge, row_to_chat_message,
+)
+
+# Millisecond UTC timestamps sort lexicographically, which the keyset pagination relies on
+_NOW = "(strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS papers (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL DEFAULT '[]',
+    summary TEXT,
+    published TEXT NOT NULL,
+    pdf_url TEXT,
+    key_concepts TEXT NOT NULL DEFAULT '[]',
+    "references" TEXT NOT NULL DEFAULT '[]',
+    embedding BLOB,
+    created_at TEXT NOT NULL DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS edges (
+    id TEXT PRIMARY KEY,
+    source_id TEXT NOT NULL REFERENCES papers(id) ON DELETE CASCADE,
+    target_id TEXT NOT NULL REFERENCES papers(id) ON DELETE CASCADE,
+    edge_type TEXT NOT NULL DEFAULT 'related',
+    edge_key TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS chat_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT {_NOW}
+);
+
+CREATE INDEX IF NOT EXISTS idx_edges_source ON edges(source_id);
+CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target_id);
+CREATE INDEX IF NOT EXISTS idx_papers_created ON papers(created_at DESC, id DESC);
+"""
+
+_JSON_COLUMNS = ("authors", "key_concepts", "references")
+_LITE_COLUMNS = 'id, title, authors, published, pdf_url, key_concepts, created_at'
+# Embeddings are loaded separately (load_embeddings), only when the vector index is rebuilt
+_FULL_COLUMNS = 'id, title, authors, summary, published, pdf_url, key_concepts, "references", created_at'
+
+
+def _encode_embedding(embedding: Optional[List[float]]) -> Optional[bytes]:
+    # Packed float32 is a quarter of the size of the JSON text and much faster to load
+    return array("f", embedding).tobytes() if embedding else None
+
+
+def _decode_embedding(blob: Optional[bytes]) -> Optional[List[float]]:
+    if not blob:
+        return None
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+@instrument_methods("sqlite", STORAGE_OPERATIONS)
+class SQLiteBackend(StorageBackend):
+    """Embedded single-node engine. One WAL-mode connection shared across threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+
+    def _migrate(self):
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(papers)")}
+        if "embedding" not in columns:
+            self._conn.execute("ALTER TABLE papers ADD COLUMN embedding BLOB")
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(edges)")}
+        if "edge_type" not in columns:
+            self._conn.execute("ALTER TABLE edges ADD COLUMN edge_type TEXT NOT NULL DEFAULT 'related'")
+        if "edge_key" not in columns:
+            self._conn.execute("ALTER TABLE edges ADD COLUMN edge_key TEXT")
+            self._backfill_edge_keys()
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_edges_key ON edges(edge_key)")
+
+    def _backfill_edge_keys(self):
+        # The oldest edge for each key is kept; later duplicates (including reversed "related" pairs) are dropped
+        rows = self._conn.execute("SELECT id, source_id, target_id, edge_type FROM edges ORDER BY created_at, id")
+        seen, keyed, duplicates = set(), [], []
+        for row in rows.fetchall():
+            key = edge_key(row["source_id"], row["target_id"], row["edge_type"])
+            if key in seen:
+                duplicates.append((row["id"],))
+            else:
+                seen.add(key)
+                keyed.append((key, row["id"]))
+        with self._conn:
+            self._conn.executemany("DELETE FROM edges WHERE id = ?", duplicates)
+            self._conn.executemany("UPDATE edges SET edge_key = ? WHERE id = ?", keyed)
+
+    def _query(self, sql: str, params: tuple = ()) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def _write(self, sql: str, rows: list):
+        with self._lock, self._conn:
+            self._conn.executemany(sql, rows)
+
+    def _decode(self, row: sqlite3.Row) -> dict:
+        data = dict(row)
+        for column in _JSON_COLUMNS:
+            if column in data and isinstance(data[column], str):
+                data[column] = json.loads(data[column])
+        if "embedding" in data:
+            data["embedding"] = _decode_embedding(data["embedding"])
+        return data
+
+    def load_papers(self) -> List[Paper]:
+        rows = self._query(f"SELECT {_FULL_COLUMNS} FROM papers ORDER BY created_at DESC, id DESC")
+        return [row_to_paper(row) for row in rows]
+
+    def load_edges(self) -> List[Edge]:
+        return [row_to_edge(row) for row in self._query("SELECT id, source_id, target_id, edge_type, created_at FROM edges")]
+
+    def load_embeddings(self) -> Dict[str, List[float]]:
+        rows = self._query("SELECT id, embedding FROM papers WHERE embedding IS NOT NULL")
+        return {row["id"]: row["embedding"] for row in rows}
+
+    def save_embeddings(self, embeddings: Dict[str, List[float]]):
+        self._write(
+            "UPDATE papers SET embedding = ? WHERE id = ?",
+            [(_encode_embedding(vector), paper_id) for paper_id, vector in embeddings.items()],
+        )
+
+    def upsert_papers(self, papers: List[Paper]):
+        rows = []
+        for paper in papers:
+            row = paper_to_row(paper)
+            rows.append((
+                row["id"], row["title"], json.dumps(row["authors"]), row["summary"], row["published"],
+                row["pdf_url"], json.dumps(row["key_concepts"]), json.dumps(row["references"]),
+                _encode_embedding(row["embedding"]),
+            ))
+        self._write(
+            'INSERT INTO papers (id, title, authors, summary, published, pdf_url, key_concepts, "references", embedding) '
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET title = excluded.title, authors = excluded.authors, "
+            "summary = excluded.summary, published = excluded.published, pdf_url = excluded.pdf_url, "
+            'key_concepts = excluded.key_concepts, "references" = excluded."references", '
+            "embedding = COALESCE(excluded.embedding, papers.embedding)",
+            rows,
+        )
+
+    def insert_edges(self, edges: List[Edge]) -> List[Edge]:
+        inserted = []
+        with self._lock, self._conn:
+            for edge in edges:
+                row = edge_to_row(edge)
+                cursor = self._conn.execute(
+                    "INSERT INTO edges (id, source_id, target_id, edge_type, edge_key) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT DO NOTHING",
+                    (row["id"], row["source_id"], row["target_id"], row["edge_type"], row["edge_key"]),
+                )
+                if cursor.rowcount:
+                    inserted.append(edge)
+        return inserted
+
+    def existing_edge_keys(self, keys: List[str]) -> Set[str]:
+        found = set()
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._query(f"SELECT edge_key FROM edges WHERE edge_key IN ({placeholders})", tuple(chunk))
+            found.update(row["edge_key"] for row in rows)
+        return found
+
+    def delete_edges(self, edge_ids: List[str]):
+        self._write("DELETE FROM edges WHERE id = ?", [(edge_id,) for edge_id in edge_ids])
+
+    def delete_paper(self, paper_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM edges WHERE source_id = ? OR target_id = ?", (paper_id, paper_id))
+            self._conn.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
+
+    def papers_page(self, limit: int, after: Optional[str], light: bool) -> PaperPage:
+        columns = _LITE_COLUMNS if light else _FULL_COLUMNS
+        if after:
+            created_at, paper_id = decode_paper_cursor(after)
+            rows = self._query(
+                f"SELECT {columns} FROM papers WHERE created_at < ? OR (created_at = ? AND id < ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (created_at, created_at, paper_id, limit + 1),
+            )
+        else:
+            rows = self._query(f"SELECT {columns} FROM papers ORDER BY created_at DESC, id DESC LIMIT ?", (limit + 1,))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        to_model = row_to_paper_lite if light else row_to_paper
+        return [to_model(row) for row in rows], next_cursor
+
+    def add_chat_message(self, role: Role, content: str):
+        self._write("INSERT INTO chat_history (role, content) VALUES (?, ?)", [(role, content)])
+
+    def chat_history(self) -> List[ChatMessage]:
+        return [row_to_chat_message(row) for row in self._query("SELECT * FROM chat_history ORDER BY id")]
+
+    def chat_history_page(self, limit: int, after: Optional[str]) -> ChatPage:
+        after_id = decode_chat_cursor(after) if after else 0
+        rows = self._query("SELECT * FROM chat_history WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit + 1))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["id"])
+        return [row_to_chat_message(row) for row in rows], next_cursor
+
+    def clear_chat_history(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chat_history")
@@ -0,0 +1,115 @@
+from typing import Dict, Iterator, List, Optional, Set
+from supabase import create_client, Client
+from models import Paper, Edge, ChatMessage, Role
+from config import SUPABASE_URL, SUPABASE_KEY, STORAGE_BATCH_SIZE
+from metrics import instrument_methods
+from backends.base import (
+    StorageBackend, STORAGE_OPERATIONS, PaperPage, ChatPage, encode_cursor, decode_paper_cursor, decode_chat_cursor,
+    paper_to_row, edge_to_row, row_to_paper, row_to_paper_lite, row_to_edge, row_to_chat_message,
+)
+
+# Columns needed for PaperLite plus the created_at sort key
+PAPER_LITE_COLUMNS = "id,title,authors,published,pdf_url,key_concepts,created_at"
+# Everything but the embedding, which is only fetched to rebuild the vector index
+PAPER_COLUMNS = 'id,title,authors,summary,published,pdf_url,key_concepts,"references",created_at'
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@instrument_methods("supabase", STORAGE_OPERATIONS)
+class SupabaseBackend(StorageBackend):
+
+    def __init__(self, client: Optional[Client] = None, batch_size: int = STORAGE_BATCH_SIZE):
+        self.client: Client = client or create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.batch_size = batch_size
+
+    def load_papers(self) -> List[Paper]:
+        result = self.client.table("papers").select(PAPER_COLUMNS).order("created_at", desc=True).execute()
+        return [row_to_paper(row) for row in result.data]
+
+    def load_embeddings(self) -> Dict[str, List[float]]:
+        result = self.client.table("papers").select("id,embedding").not_.is_("embedding", "null").execute()
+        return {row["id"]: row["embedding"] for row in result.data}
+
+    def save_embeddings(self, embeddings: Dict[str, List[float]]):
+        # One save_paper_embeddings call (see supabase_schema.sql) per chunk instead of an UPDATE per paper
+        rows = [{"id": paper_id, "embedding": vector} for paper_id, vector in embeddings.items()]
+        for chunk in _chunks(rows, self.batch_size):
+            self.client.rpc("save_paper_embeddings", {"rows": chunk}).execute()
+
+    def load_edges(self) -> List[Edge]:
+        result = self.client.table("edges").select("*").execute()
+        return [row_to_edge(row) for row in result.data]
+
+    def upsert_papers(self, papers: List[Paper]):
+        for chunk in _chunks(papers, self.batch_size):
+            self.client.table("papers").upsert([paper_to_row(p) for p in chunk]).execute()
+
+    def insert_edges(self, edges: List[Edge]) -> List[Edge]:
+        inserted_ids = set()
+        for chunk in _chunks(edges, self.batch_size):
+            # ON CONFLICT (edge_key) DO NOTHING; only the inserted rows come back
+            result = self.client.table("edges").upsert(
+                [edge_to_row(e) for e in chunk], on_conflict="edge_key", ignore_duplicates=True,
+            ).execute()
+            inserted_ids.update(row["id"] for row in result.data)
+        return [e for e in edges if e.id in inserted_ids]
+
+    def existing_edge_keys(self, keys: List[str]) -> Set[str]:
+        found = set()
+        for chunk in _chunks(keys, self.batch_size):
+            result = self.client.table("edges").select("edge_key").in_("edge_key", chunk).execute()
+            found.update(row["edge_key"] for row in result.data)
+        return found
+
+    def delete_edges(self, edge_ids: List[str]):
+        for chunk in _chunks(edge_ids, self.batch_size):
+            self.client.table("edges").delete().in_("id", chunk).execute()
+
+    def delete_paper(self, paper_id: str):
+        self.client.table("edges").delete().or_(f"source_id.eq.{paper_id},target_id.eq.{paper_id}").execute()
+        self.client.table("papers").delete().eq("id", paper_id).execute()
+
+    def papers_page(self, limit: int, after: Optional[str], light: bool) -> PaperPage:
+        query = (
+            self.client.table("papers")
+            .select(PAPER_LITE_COLUMNS if light else PAPER_COLUMNS)
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+        )
+        if after:
+            created_at, paper_id = decode_paper_cursor(after)
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{paper_id}")')
+        rows = query.limit(limit + 1).execute().data
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        to_model = row_to_paper_lite if light else row_to_paper
+        return [to_model(row) for row in rows], next_cursor
+
+    def add_chat_message(self, role: Role, content: str):
+        self.client.table("chat_history").insert({"role": role, "content": content}).execute()
+
+    def chat_history(self) -> List[ChatMessage]:
+        result = self.client.table("chat_history").select("*").order("created_at").execute()
+        return [row_to_chat_message(row) for row in result.data]
+
+    def chat_history_page(self, limit: int, after: Optional[str]) -> ChatPage:
+        query = self.client.table("chat_history").select("*").order("id")
+        if after:
+            query = query.gt("id", decode_chat_cursor(after))
+        rows = query.limit(limit + 1).execute().data
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["id"])
+        return [row_to_chat_message(row) for row in rows], next_cursor
+
+    def clear_chat_history(self):
+        self.client.table("chat_history").delete().not_.is_("id", "null").execute()
@@ -0,0 +1,301 @@
+"""In-process stand-ins for Bedrock, Tavily, arXiv, PDF downloads and the storage engine.
+
+Each fake sleeps for a configurable latency (with jitter) and fails at a
+configurable rate, so the benchmark exercises the real agent, graph and storage
+code without touching the network.
+"""
+import hashlib
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+from models import Paper, Edge, ChatMessage, Role
+from backends.base import StorageBackend, PaperPage, ChatPage, encode_cursor, decode_cursor
+from agents.intent import classify_intent
+
+CONCEPTS = [f"concept {i}" for i in range(200)]
+URL_PATTERN = re.compile(r"https?://\S+")
+
+
+class FakeServiceError(RuntimeError):
+    pass
+
+
+@dataclass
+class LatencyProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+
+class FakeService:
+
+    def __init__(self, name: str, profile: LatencyProfile, seed: int = 0):
+        self.name = name
+        self.profile = profile
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _simulate(self):
+        with self._lock:
+            self.calls += 1
+            jitter = self._rng.uniform(-self.profile.jitter_ms, self.profile.jitter_ms)
+            fail = self._rng.random() < self.profile.error_rate
+        delay = max(0.0, self.profile.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeServiceError(f"{self.name}: injected failure")
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def fake_arxiv_id(n: int) -> str:
+    return f"{23 + n // 100000}{(n // 10000) % 10 + 1:02d}.{n % 10000:05d}"
+
+
+def concepts_for(key: str, count: int = 3) -> List[str]:
+    start = _digest(key)
+    return [CONCEPTS[(start + i * 37) % len(CONCEPTS)] for i in range(count)]
+
+
+def _prompt_field(prompt: str, label: str) -> str:
+    match = re.search(rf"{label}:\s*(.*)", prompt)
+    return match.group(1).strip() if match else ""
+
+
+class FakeBedrock(FakeService):
+    """Answers each prompt in ``agents/prompts.py`` with a plausible canned reply."""
+
+    def __init__(self, profile: LatencyProfile, seed: int = 0):
+        super().__init__("bedrock", profile, seed)
+
+    def respond(self, prompt: str) -> str:
+        if prompt.startswith("You are a router agent"):
+            intent, _ = classify_intent(_prompt_field(prompt, "User message"))
+            return intent or "question"
+        if prompt.startswith("Extract 3-5 key concepts"):
+            return ", ".join(concepts_for(_prompt_field(prompt, "Title")))
+        if prompt.startswith("Analyze the references"):
+            refs = [fake_arxiv_id(_digest(prompt) % 5000 + i) for i in range(3)]
+            return "[" + ", ".join(f'{{"title": "Ref {r}", "arxiv_id": "{r}", "author": "Doe"}}' for r in refs) + "]"
+        if prompt.startswith(("Extract the paper name", "Extract the paper title")):
+            return "attention mechanisms"
+        if prompt.startswith(("Extract the URL", "Extract the URL or site")):
+            urls = URL_PATTERN.findall(_prompt_field(prompt, "User message"))
+            return urls[0] if urls else "https://arxiv.org/list/cs.AI/recent"
+        if prompt.startswith("Based on the user's request"):
+            return "Find paper abstract pages."
+        return "Benchmark answer. " * 40
+
+    def converse(self, modelId: str, messages: list, inferenceConfig: dict) -> dict:
+        self._simulate()
+        prompt = next(block["text"] for block in messages[0]["content"] if "text" in block)
+        return {"output": {"message": {"content": [{"text": self.respond(prompt)}]}}}
+
+    def converse_stream(self, modelId: str, messages: list, inferenceConfig: dict) -> dict:
+        self._simulate()
+        prompt = next(block["text"] for block in messages[0]["content"] if "text" in block)
+        words = self.respond(prompt).split(" ")
+        return {"stream": [{"contentBlockDelta": {"delta": {"text": word + " "}}} for word in words]}
+
+
+class FakeTavily(FakeService):
+
+    def __init__(self, profile: LatencyProfile, seed: int = 0):
+        super().__init__("tavily", profile, seed)
+
+    def _arxiv_urls(self, key: str, count: int) -> List[str]:
+        start = _digest(key) % 90000
+        return [f"https://arxiv.org/abs/{fake_arxiv_id(100000 + start + i)}" for i in range(count)]
+
+    def search(self, query: str, max_results: int = 5, **params) -> dict:
+        self._simulate()
+        results = [
+            {"url": url, "title": f"Result {i} for {query}", "content": "Snippet about " + query, "score": 0.9}
+            for i, url in enumerate(self._arxiv_urls(query, max_results))
+        ]
+        return {"query": query, "results": results}
+
+    def extract(self, urls: List[str], **params) -> dict:
+        self._simulate()
+        return {"results": [{"url": url, "raw_content": "Extracted page text. " * 200} for url in urls]}
+
+    def crawl(self, url: str, limit: int = 20, **params) -> dict:
+        self._simulate()
+        pages = self._arxiv_urls(url, min(limit, 10))
+        return {"results": [{"url": page, "raw_content": f"See {page} for details."} for page in pages]}
+
+    def map(self, url: str, **params) -> dict:
+        self._simulate()
+        return {"urls": self._arxiv_urls(url, 20) + [f"{url}/about", f"{url}/contact"]}
+
+
+class FakeAuthor:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeArxivResult:
+    """Duck-types the arxiv.Result attributes build_paper and the search agents read."""
+
+    def __init__(self, arxiv_id: str):
+        self._id = arxiv_id
+        self.title = f"Paper {arxiv_id}"
+        self.authors = [FakeAuthor("Ada Lovelace"), FakeAuthor("Alan Turing")]
+        self.summary = f"Abstract of {arxiv_id}. " * 20
+        self.published = datetime(2024, 1, 1) + timedelta(days=_digest(arxiv_id) % 365)
+        self.pdf_url = f"https://arxiv.org/pdf/{arxiv_id}v1"
+
+    def get_short_id(self) -> str:
+        return f"{self._id}v1"
+
+
+class FakeArxiv(FakeService):
+
+    def __init__(self, profile: LatencyProfile, seed: int = 0):
+        super().__init__("arxiv", profile, seed)
+
+    def results(self, search) -> List[FakeArxivResult]:
+        self._simulate()
+        if search.id_list:
+            return [FakeArxivResult(re.sub(r"v\d+$", "", i)) for i in search.id_list]
+        start = _digest(search.query) % 90000
+        return [FakeArxivResult(fake_arxiv_id(200000 + start + i)) for i in range(search.max_results or 5)]
+
+
+class FakePdf(FakeService):
+
+    def __init__(self, profile: LatencyProfile, seed: int = 0):
+        super().__init__("pdf", profile, seed)
+
+    def download(self, pdf_url: str, max_bytes: Optional[int] = None) -> bytes:
+        self._simulate()
+        return b"%PDF-1.4 benchmark"
+
+
+class FakeStorageBackend(FakeService, StorageBackend):
+    """Dict-backed engine that models a hosted database's round-trip latency."""
+
+    def __init__(self, profile: LatencyProfile, seed: int = 0):
+        FakeService.__init__(self, "storage", profile, seed)
+        self._papers: Dict[str, Paper] = {}
+        self._embeddings: Dict[str, List[float]] = {}
+        # Keyed by canonical edge key, like the unique index of the real engines
+        self._edges: Dict[str, Edge] = {}
+        self._chat: List[ChatMessage] = []
+
+    def seed(self, papers: List[Paper], edges: List[Edge]):
+        """Replace the stored data without simulated latency."""
+        self._papers = {}
+        self._embeddings = {}
+        self._store_papers(papers)
+        self._edges = {e.key: e for e in edges}
+
+    def _store_papers(self, papers: List[Paper]):
+        for paper in papers:
+            if paper.embedding:
+                self._embeddings[paper.id] = paper.embedding
+            self._papers[paper.id] = paper.model_copy(update={"embedding": None})
+
+    def load_papers(self) -> List[Paper]:
+        self._simulate()
+        return list(reversed(list(self._papers.values())))
+
+    def load_edges(self) -> List[Edge]:
+        self._simulate()
+        return list(self._edges.values())
+
+    def load_embeddings(self) -> Dict[str, List[float]]:
+        self._simulate()
+        return dict(self._embeddings)
+
+    def save_embeddings(self, embeddings: Dict[str, List[float]]):
+        self._simulate()
+        self._embeddings.update((k, v) for k, v in embeddings.items() if k in self._papers)
+
+    def upsert_papers(self, papers: List[Paper]):
+        self._simulate()
+        self._store_papers(papers)
+
+    def insert_edges(self, edges: List[Edge]) -> List[Edge]:
+        self._simulate()
+        inserted = []
+        for edge in edges:
+            if edge.key not in self._edges:
+                self._edges[edge.key] = edge
+                inserted.append(edge)
+        return inserted
+
+    def existing_edge_keys(self, keys: List[str]) -> Set[str]:
+        self._simulate()
+        return {key for key in keys if key in self._edges}
+
+    def delete_edges(self, edge_ids: List[str]):
+        self._simulate()
+        edge_ids = set(edge_ids)
+        self._edges = {k: e for k, e in self._edges.items() if e.id not in edge_ids}
+
+    def delete_paper(self, paper_id: str):
+        self._simulate()
+        self._papers.pop(paper_id, None)
+        self._embeddings.pop(paper_id, None)
+        self._edges = {k: e for k, e in self._edges.items() if paper_id not in (e.source_id, e.target_id)}
+
+    def papers_page(self, limit: int, after: Optional[str], light: bool) -> PaperPage:
+        self._simulate()
+        papers = list(reversed(list(self._papers.values())))
+        offset = decode_cursor(after)[0] if after else 0
+        page = papers[offset:offset + limit]
+        cursor = encode_cursor(offset + limit) if offset + limit < len(papers) else None
+        return page, cursor
+
+    def add_chat_message(self, role: Role, content: str):
+        self._simulate()
+        self._chat.append(ChatMessage(id=len(self._chat) + 1, role=role, content=content, created_at=datetime.now()))
+
+    def chat_history(self) -> List[ChatMessage]:
+        self._simulate()
+        return list(self._chat)
+
+    def chat_history_page(self, limit: int, after: Optional[str]) -> ChatPage:
+        self._simulate()
+        offset = decode_cursor(after)[0] if after else 0
+        page = self._chat[offset:offset + limit]
+        cursor = encode_cursor(offset + limit) if offset + limit < len(self._chat) else None
+        return page, cursor
+
+    def clear_chat_history(self):
+        self._simulate()
+        self._chat.clear()
+
+
+def build_collection(size: int, edges_per_paper: int = 2, seed: int = 0):
+    """Synthetic papers with overlapping concepts, plus random edges between them."""
+    rng = random.Random(seed)
+    papers = [
+        Paper(
+            id=fake_arxiv_id(n),
+            title=f"Synthetic paper {n}",
+            authors=["Ada Lovelace"],
+            summary="Synthetic abstract about " + " and ".join(concepts_for(str(n))) + ".",
+            published=datetime(2020, 1, 1) + timedelta(days=n % 1500),
+            pdf_url=f"https://arxiv.org/pdf/{fake_arxiv_id(n)}",
+            key_concepts=concepts_for(str(n)),
+        )
+        for n in range(size)
+    ]
+    edges = []
+    if size > 1:
+        for n, paper in enumerate(papers):
+            for k in range(edges_per_paper):
+                other = papers[rng.randrange(size)]
+                if other.id != paper.id:
+                    edges.append(Edge(id=f"e{n}-{k}", source_id=paper.id, target_id=other.id))
+    return papers, edges
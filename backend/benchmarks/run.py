@@ -0,0 +1,267 @@
+"""End-to-end latency benchmark for the pipeline and the heaviest endpoints.
+
+Runs every intent through run_pipeline, plus POST /papers/select (until its job
+finishes) and GET /graph/cytoscape, against collections of several sizes. All
+external services are replaced by the fakes in benchmarks/fakes.py.
+
+    python -m benchmarks.run --sizes 10,1000,10000 --output bench.json
+    python -m benchmarks.run --baseline bench.json   # exit 1 on p95 regressions
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Dummy credentials and local engines so config validation passes without a .env
+os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", ":memory:")
+os.environ.setdefault("JOBS_DB_PATH", ":memory:")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+
+from unittest.mock import patch  # noqa: E402
+from benchmarks.fakes import (  # noqa: E402
+    LatencyProfile, FakeBedrock, FakeTavily, FakeArxiv, FakePdf, FakeStorageBackend, build_collection, fake_arxiv_id,
+)
+
+# Larger collections are opt-in through --sizes: find_connections alone takes seconds per run at 5k papers
+DEFAULT_SIZES = [10, 100, 1000, 5000]
+
+# Per-iteration message for each intent; add_paper uses a fresh ID so it never short-circuits
+INTENT_MESSAGES: Dict[str, Callable[[int], str]] = {
+    "add_paper": lambda i: f"add https://arxiv.org/abs/{fake_arxiv_id(300000 + i)}",
+    "search_paper": lambda i: "search for papers on attention mechanisms",
+    "find_related": lambda i: "find papers related to Synthetic paper 1",
+    "find_connections": lambda i: "find connections",
+    "question": lambda i: "What are the main themes in my collection?",
+    "extract": lambda i: "extract https://blog.example.com/post",
+    "crawl": lambda i: "crawl https://example.edu/~lab/publications",
+    "map": lambda i: "map https://arxiv.org/list/cs.LG/recent",
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(name: str, size: int, durations: List[float], errors: int, wall_seconds: float) -> dict:
+    ordered = sorted(durations)
+    runs = len(durations) + errors
+    return {
+        "scenario": name,
+        "size": size,
+        "iterations": runs,
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "throughput_per_s": round(runs / wall_seconds, 3) if wall_seconds else 0.0,
+    }
+
+
+def measure(name: str, size: int, fn: Callable[[int], None], iterations: int, warmup: int,
+            budget_seconds: float) -> dict:
+    """Time ``fn(i)`` sequentially within ``budget_seconds``, warmup included.
+
+    A run is skipped when the previous one's duration says it would end past the budget,
+    though at least one measured run always happens.
+    """
+    deadline = time.perf_counter() + budget_seconds
+    last = 0.0
+    for i in range(warmup):
+        if time.perf_counter() + last > deadline:
+            break
+        t0 = time.perf_counter()
+        try:
+            fn(-1 - i)
+        except Exception:
+            pass
+        last = time.perf_counter() - t0
+    durations, errors = [], 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        if (durations or errors) and time.perf_counter() + last > deadline:
+            break
+        t0 = time.perf_counter()
+        try:
+            fn(i)
+            durations.append(time.perf_counter() - t0)
+        except Exception:
+            errors += 1
+        last = time.perf_counter() - t0
+    return summarize(name, size, durations, errors, time.perf_counter() - started)
+
+
+@contextmanager
+def fake_services(profiles: Dict[str, LatencyProfile], seed: int = 0) -> Iterator[FakeStorageBackend]:
+    """Swap every external client for a fake; yields the fake storage engine."""
+    from agents import base, llm_cache
+    from agents.tavily_gateway import tavily
+    from agents.arxiv_gateway import arxiv_gateway
+    from storage import storage
+
+    backend = FakeStorageBackend(profiles["storage"], seed)
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(base, "bedrock", FakeBedrock(profiles["bedrock"], seed)))
+        stack.enter_context(patch.object(llm_cache, "llm_cache", None))
+        stack.enter_context(patch.object(tavily, "client", FakeTavily(profiles["tavily"], seed)))
+        stack.enter_context(patch.dict(tavily.ttl_seconds, dict.fromkeys(tavily.ttl_seconds, 0)))
+        stack.enter_context(patch.object(arxiv_gateway, "results", FakeArxiv(profiles["arxiv"], seed).results))
+        stack.enter_context(patch("agents.ingest.download_pdf", FakePdf(profiles["pdf"], seed).download))
+        stack.enter_context(patch.object(storage, "_backend", backend))
+        stack.callback(storage.invalidate)
+        storage.invalidate()
+        yield backend
+
+
+def load_collection(backend: FakeStorageBackend, size: int, seed: int = 0):
+    from storage import storage
+    papers, edges = build_collection(size, seed=seed)
+    backend.seed(papers, edges)
+    storage.invalidate()
+
+
+def _wait_for_job(job_id: str, timeout: float = 60.0):
+    from jobs import job_manager
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = job_manager.get(job_id)
+        if job and job.status in ("succeeded", "failed"):
+            if job.status == "failed":
+                raise RuntimeError(job.error)
+            return
+        time.sleep(0.001)
+    raise TimeoutError(job_id)
+
+
+def run_benchmarks(sizes: List[int], iterations: int, warmup: int, budget_seconds: float,
+                   profiles: Dict[str, LatencyProfile], intents: Optional[List[str]] = None, seed: int = 0) -> dict:
+    from fastapi.testclient import TestClient
+    from graph import run_pipeline
+    from main import app
+
+    results = []
+    with fake_services(profiles, seed) as backend, TestClient(app) as client:
+        for size in sizes:
+            load_collection(backend, size, seed)
+            papers = backend.load_papers()
+            print(f"size={size}", file=sys.stderr)
+
+            for intent in intents or list(INTENT_MESSAGES):
+                message = INTENT_MESSAGES[intent]
+                results.append(measure(
+                    f"pipeline:{intent}", size, lambda i: run_pipeline(message(i)), iterations, warmup, budget_seconds))
+                # Keep each intent's writes from growing the collection for the next one
+                load_collection(backend, size, seed)
+
+            def select_paper(i: int):
+                response = client.post("/papers/select", json={
+                    "arxiv_id": fake_arxiv_id(400000 + i + warmup),
+                    "source_paper_id": papers[0].id,
+                })
+                response.raise_for_status()
+                _wait_for_job(response.json()["job_id"])
+
+            results.append(measure("POST /papers/select", size, select_paper, iterations, warmup, budget_seconds))
+            load_collection(backend, size, seed)
+
+            def cytoscape(i: int):
+                client.get("/graph/cytoscape").raise_for_status()
+
+            results.append(measure("GET /graph/cytoscape", size, cytoscape, iterations, warmup, budget_seconds))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "sizes": sizes,
+            "profiles": {name: vars(profile) for name, profile in profiles.items()},
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def find_regressions(current: dict, baseline: dict, tolerance: float) -> List[dict]:
+    """Scenarios whose p95 grew by more than ``tolerance`` (a fraction) over the baseline."""
+    previous = {(r["scenario"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["scenario"], result["size"]))
+        if before and before["p95_ms"] > 0 and result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append({
+                "scenario": result["scenario"],
+                "size": result["size"],
+                "baseline_p95_ms": before["p95_ms"],
+                "p95_ms": result["p95_ms"],
+            })
+    return regressions
+
+
+def _profile(latency_ms: float, jitter_pct: float, error_rate: float) -> LatencyProfile:
+    return LatencyProfile(latency_ms=latency_ms, jitter_ms=latency_ms * jitter_pct, error_rate=error_rate)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--intents", default="", help="comma-separated subset of intents (default: all)")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--budget-seconds", type=float, default=30.0, help="time cap per scenario and size, warmup included")
+    parser.add_argument("--bedrock-ms", type=float, default=400.0)
+    parser.add_argument("--tavily-ms", type=float, default=250.0)
+    parser.add_argument("--arxiv-ms", type=float, default=300.0)
+    parser.add_argument("--pdf-ms", type=float, default=150.0)
+    parser.add_argument("--storage-ms", type=float, default=20.0)
+    parser.add_argument("--jitter", type=float, default=0.2, help="jitter as a fraction of each latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="injected failure rate for every fake")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 growth over the baseline")
+    args = parser.parse_args(argv)
+
+    profiles = {
+        "bedrock": _profile(args.bedrock_ms, args.jitter, args.error_rate),
+        "tavily": _profile(args.tavily_ms, args.jitter, args.error_rate),
+        "arxiv": _profile(args.arxiv_ms, args.jitter, args.error_rate),
+        "pdf": _profile(args.pdf_ms, args.jitter, args.error_rate),
+        "storage": _profile(args.storage_ms, args.jitter, args.error_rate),
+    }
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    intents = [i for i in args.intents.split(",") if i] or None
+
+    report = run_benchmarks(sizes, args.iterations, args.warmup, args.budget_seconds, profiles, intents, args.seed)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = find_regressions(report, json.load(f), args.tolerance)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if report.get("regressions"):
+        print(f"{len(report['regressions'])} p95 regression(s) over {args.tolerance:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
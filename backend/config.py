@@ -10,14 +10,103 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-if not TAVILY_API_KEY:
-    raise ValueError("TAVILY_API_KEY environment variable is required")
+# Storage engine: "supabase" (hosted Postgres) or "sqlite" (embedded, single node)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "data/research.sqlite3")
 
-if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
-    raise ValueError("AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables are required")
+# Max concurrent Bedrock requests per worker process (also sizes the HTTP pool)
+BEDROCK_MAX_CONCURRENCY = int(os.getenv("BEDROCK_MAX_CONCURRENCY", "8"))
+BEDROCK_READ_TIMEOUT = int(os.getenv("BEDROCK_READ_TIMEOUT", "120"))
 
-if not SUPABASE_URL:
-    raise ValueError("SUPABASE_URL environment variable is required")
+# Cache for temperature=0 Bedrock calls (memory LRU in front of a SQLite file)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "1024"))
 
-if not SUPABASE_KEY:
-    raise ValueError("SUPABASE_KEY environment variable is required")
+# Parallel paper enrichments for POST /papers/batch (each uses up to two Bedrock calls)
+BATCH_INGEST_WORKERS = int(os.getenv("BATCH_INGEST_WORKERS", "4"))
+
+# Background ingestion jobs (persisted so they survive a worker restart)
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "data/jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+
+# Shared arXiv API limiter: arXiv asks for at most one request every three seconds
+ARXIV_RATE_PER_SECOND = float(os.getenv("ARXIV_RATE_PER_SECOND", str(1 / 3)))
+ARXIV_BURST = float(os.getenv("ARXIV_BURST", "1"))
+ARXIV_MAX_RETRIES = int(os.getenv("ARXIV_MAX_RETRIES", "3"))
+# Base for exponential backoff when arXiv fails without a Retry-After header
+ARXIV_BACKOFF_SECONDS = float(os.getenv("ARXIV_BACKOFF_SECONDS", "3"))
+# Separate limiter for PDF downloads from arxiv.org, shared by every ingest and batch worker
+ARXIV_PDF_RATE_PER_SECOND = float(os.getenv("ARXIV_PDF_RATE_PER_SECOND", "1"))
+ARXIV_PDF_BURST = float(os.getenv("ARXIV_PDF_BURST", "2"))
+
+# Local store for downloaded arXiv PDFs
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", ".cache/pdfs")
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# In-process papers/edges cache; reloaded after this many seconds to pick up other workers' writes (0 = never)
+STORAGE_CACHE_TTL_SECONDS = float(os.getenv("STORAGE_CACHE_TTL_SECONDS", "30"))
+# Max rows per multi-row upsert/delete request
+STORAGE_BATCH_SIZE = int(os.getenv("STORAGE_BATCH_SIZE", "500"))
+
+# Shared Tavily response cache (in memory, per worker); TTL per operation, 0 disables caching for it
+TAVILY_CACHE_ENABLED = os.getenv("TAVILY_CACHE_ENABLED", "true").lower() == "true"
+TAVILY_CACHE_MAX_ENTRIES = int(os.getenv("TAVILY_CACHE_MAX_ENTRIES", "512"))
+TAVILY_SEARCH_TTL_SECONDS = float(os.getenv("TAVILY_SEARCH_TTL_SECONDS", "3600"))
+TAVILY_EXTRACT_TTL_SECONDS = float(os.getenv("TAVILY_EXTRACT_TTL_SECONDS", str(24 * 3600)))
+TAVILY_CRAWL_TTL_SECONDS = float(os.getenv("TAVILY_CRAWL_TTL_SECONDS", str(6 * 3600)))
+TAVILY_MAP_TTL_SECONDS = float(os.getenv("TAVILY_MAP_TTL_SECONDS", str(6 * 3600)))
+
+# Router messages whose rule-based intent scores at least this skip the Bedrock classifier
+ROUTER_FAST_PATH_THRESHOLD = float(os.getenv("ROUTER_FAST_PATH_THRESHOLD", "0.8"))
+# Fraction of fast-path messages also sent to Bedrock to measure rule/LLM disagreement
+ROUTER_SHADOW_SAMPLE_RATE = float(os.getenv("ROUTER_SHADOW_SAMPLE_RATE", "0"))
+
+# Paper embeddings for semantic connections: "hashing" (local, offline) or "bedrock" (Titan text embeddings)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "hashing").lower()
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "512"))
+BEDROCK_EMBEDDING_MODEL_ID = os.getenv("BEDROCK_EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0")
+# Nearest-neighbour index over the embeddings: "bruteforce" (NumPy) or "hnsw" (needs hnswlib)
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "bruteforce").lower()
+# A paper is connected to at most SEMANTIC_TOP_K neighbours whose cosine similarity reaches the threshold.
+# Hashed word features score lower than learned embeddings, hence the per-provider default.
+SEMANTIC_CONNECTIONS_ENABLED = os.getenv("SEMANTIC_CONNECTIONS_ENABLED", "true").lower() == "true"
+SEMANTIC_SIMILARITY_THRESHOLD = float(
+    os.getenv("SEMANTIC_SIMILARITY_THRESHOLD", "0.2" if EMBEDDING_PROVIDER == "hashing" else "0.5"))
+SEMANTIC_TOP_K = int(os.getenv("SEMANTIC_TOP_K", "5"))
+
+# answer_agent prompts with the papers most relevant to the question (plus their edges), not the whole collection
+ANSWER_TOP_K = int(os.getenv("ANSWER_TOP_K", "8"))
+ANSWER_CONTEXT_TOKEN_BUDGET = int(os.getenv("ANSWER_CONTEXT_TOKEN_BUDGET", "3000"))
+
+# Fuzzy title lookups (0-1 trigram score): the least a collection paper must score to count as the one named,
+# and the score above which ingest-by-name treats the paper as already in the collection
+TITLE_MATCH_THRESHOLD = float(os.getenv("TITLE_MATCH_THRESHOLD", "0.5"))
+TITLE_DUPLICATE_THRESHOLD = float(os.getenv("TITLE_DUPLICATE_THRESHOLD", "0.9"))
+
+# /graph/analytics: betweenness is estimated from this many BFS sources (exact for smaller collections, 0 skips it)
+GRAPH_BETWEENNESS_SAMPLES = int(os.getenv("GRAPH_BETWEENNESS_SAMPLES", "64"))
+GRAPH_PAGERANK_DAMPING = float(os.getenv("GRAPH_PAGERANK_DAMPING", "0.85"))
+
+
+def validate_config():
+    """Raise if required settings are missing; called at app startup rather than on import."""
+    if not TAVILY_API_KEY:
+        raise ValueError("TAVILY_API_KEY environment variable is required")
+
+    if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
+        raise ValueError("AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables are required")
+
+    if STORAGE_BACKEND not in ("supabase", "sqlite"):
+        raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+    if STORAGE_BACKEND == "supabase" and not SUPABASE_URL:
+        raise ValueError("SUPABASE_URL environment variable is required")
+
+    if STORAGE_BACKEND == "supabase" and not SUPABASE_KEY:
+        raise ValueError("SUPABASE_KEY environment variable is required")
+
+    if EMBEDDING_PROVIDER not in ("hashing", "bedrock"):
+        raise ValueError(f"Unknown EMBEDDING_PROVIDER: {EMBEDDING_PROVIDER}")
@@ -1,3 +1,6 @@
+import asyncio
+import time
+from typing import AsyncIterator, Optional, Tuple
 from langgraph.graph import StateGraph, END
 from state import ResearchGraphState
 from agents import router_agent, ingest_agent, connection_agent, answer_agent, synthesis_agent
@@ -5,6 +8,7 @@ from agents.ingest import search_papers_agent
 from agents.related import find_related_agent
 from agents.extract import extract_agent
 from agents.crawl import crawl_agent, map_agent
+from metrics import instrument_node, pipeline_seconds
 
 
 def route_by_intent(state: ResearchGraphState) -> str:
@@ -40,16 +44,20 @@ def create_workflow() -> StateGraph:
 
     workflow = StateGraph(ResearchGraphState)
 
-    workflow.add_node("router", router_agent)
-    workflow.add_node("ingest", ingest_agent)
-    workflow.add_node("search", search_papers_agent)
-    workflow.add_node("related", find_related_agent)
-    workflow.add_node("connections", connection_agent)
-    workflow.add_node("answer", answer_agent)
-    workflow.add_node("extract", extract_agent)
-    workflow.add_node("crawl", crawl_agent)
-    workflow.add_node("map", map_agent)
-    workflow.add_node("synthesis", synthesis_agent)
+    nodes = {
+        "router": router_agent,
+        "ingest": ingest_agent,
+        "search": search_papers_agent,
+        "related": find_related_agent,
+        "connections": connection_agent,
+        "answer": answer_agent,
+        "extract": extract_agent,
+        "crawl": crawl_agent,
+        "map": map_agent,
+        "synthesis": synthesis_agent,
+    }
+    for name, node in nodes.items():
+        workflow.add_node(name, instrument_node(name, node))
 
     workflow.set_entry_point("router")
 
@@ -94,6 +102,14 @@ workflow = create_workflow()
 app = workflow.compile()
 
 
+def _observe_pipeline(start: float, final_state: Optional[dict]):
+    if final_state is None:
+        pipeline_seconds.observe(time.perf_counter() - start, intent="unknown", outcome="error")
+        return
+    outcome = "error" if final_state.get("error") else "ok"
+    pipeline_seconds.observe(time.perf_counter() - start, intent=final_state.get("intent", "question"), outcome=outcome)
+
+
 def run_pipeline(user_message: str) -> dict:
 
     initial_state: ResearchGraphState = {
@@ -101,6 +117,87 @@ def run_pipeline(user_message: str) -> dict:
         "papers_added": [],
         "connection_edges": [],
     }
-    result = app.invoke(initial_state)
+    start = time.perf_counter()
+    result = None
+    try:
+        result = app.invoke(initial_state)
+    finally:
+        _observe_pipeline(start, result)
+
+    return result
 
+
+async def arun_pipeline(user_message: str) -> dict:
+    """Async entry point for request handlers.
+
+    Nodes are sync; LangGraph runs them in its executor so Bedrock, Tavily and
+    arXiv calls never block the event loop.
+    """
+    initial_state: ResearchGraphState = {
+        "user_message": user_message,
+        "papers_added": [],
+        "connection_edges": [],
+    }
+    start = time.perf_counter()
+    result = None
+    try:
+        result = await app.ainvoke(initial_state)
+    finally:
+        _observe_pipeline(start, result)
     return result
+
+
+async def astream_pipeline(user_message: str) -> AsyncIterator[Tuple[str, dict]]:
+    """Run the pipeline, yielding ``(event, data)`` pairs as it progresses.
+
+    Events: ``intent`` once routed, ``node`` as each node finishes, ``token`` for
+    each streamed LLM text delta, and finally ``result`` with the final state.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    # Nodes run in executor threads, so tokens are handed back to the loop thread-safely
+    def on_token(text: str):
+        loop.call_soon_threadsafe(queue.put_nowait, ("token", {"text": text}))
+
+    async def run():
+        initial_state: ResearchGraphState = {
+            "user_message": user_message,
+            "papers_added": [],
+            "connection_edges": [],
+        }
+        final_state: dict = {}
+        finished = False
+        start = time.perf_counter()
+        try:
+            async for mode, chunk in app.astream(
+                initial_state,
+                config={"configurable": {"on_token": on_token}},
+                stream_mode=["updates", "values"],
+            ):
+                if mode == "values":
+                    final_state = chunk
+                    continue
+                for node, update in chunk.items():
+                    if node == "router" and update.get("intent"):
+                        await queue.put(("intent", {"intent": update["intent"]}))
+                    await queue.put(("node", {"node": node}))
+            finished = True
+            await queue.put(("result", final_state))
+        finally:
+            _observe_pipeline(start, final_state if finished else None)
+            await queue.put(done)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            yield item
+        # Surface pipeline exceptions to the caller
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
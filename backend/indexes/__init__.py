@@ -0,0 +1,30 @@
+from .base import PaperIndex
+from .concepts import ConceptIndex
+from .lexical import LexicalIndex
+from .references import ReferenceIndex, normalize_arxiv_id
+from .titles import TitleIndex
+from .embeddings import Embedder, HashingEmbedder, BedrockEmbedder, create_embedder
+from .vectors import (
+    VectorIndex, BruteForceIndex, HnswIndex, SemanticIndex, create_vector_index, register_vector_backend,
+    embed_missing,
+)
+
+__all__ = [
+    "PaperIndex",
+    "ConceptIndex",
+    "LexicalIndex",
+    "ReferenceIndex",
+    "normalize_arxiv_id",
+    "TitleIndex",
+    "Embedder",
+    "HashingEmbedder",
+    "BedrockEmbedder",
+    "create_embedder",
+    "VectorIndex",
+    "BruteForceIndex",
+    "HnswIndex",
+    "SemanticIndex",
+    "create_vector_index",
+    "register_vector_backend",
+    "embed_missing",
+]
@@ -0,0 +1,52 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Iterable, Type, TypeVar
+from models import Paper
+
+IndexT = TypeVar("IndexT", bound="PaperIndex")
+
+
+class PaperIndex(ABC):
+    """An in-memory index over papers, kept in step with the storage cache.
+
+    Owns the lock and the rebuild/add/remove plumbing; subclasses create their
+    structures in ``_reset`` and update them in ``_add`` and ``_remove``, which are
+    always called with the lock held.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    @classmethod
+    def from_papers(cls: Type[IndexT], papers: Iterable[Paper]) -> IndexT:
+        index = cls()
+        index.rebuild(papers)
+        return index
+
+    def rebuild(self, papers: Iterable[Paper]):
+        with self._lock:
+            self._reset()
+            for paper in papers:
+                self._add(paper)
+
+    def add(self, paper: Paper):
+        with self._lock:
+            self._remove(paper.id)
+            self._add(paper)
+
+    def remove(self, paper_id: str):
+        with self._lock:
+            self._remove(paper_id)
+
+    @abstractmethod
+    def _reset(self):
+        """Start from an empty index."""
+
+    @abstractmethod
+    def _add(self, paper: Paper):
+        ...
+
+    @abstractmethod
+    def _remove(self, paper_id: str):
+        """Drop ``paper_id``; a no-op when it isn't indexed."""
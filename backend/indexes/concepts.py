@@ -0,0 +1,43 @@
+from typing import Dict, Set
+from models import Paper
+from indexes.base import PaperIndex
+
+
+def normalize_concept(concept: str) -> str:
+    return concept.lower()
+
+
+class ConceptIndex(PaperIndex):
+    """Inverted index from normalized key concept to the ids of papers tagged with it."""
+
+    def _reset(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._paper_concepts: Dict[str, Set[str]] = {}
+
+    def matches(self, paper: Paper) -> Set[str]:
+        """Ids of indexed papers sharing at least one concept with ``paper`` (excluding itself)."""
+        concepts = {normalize_concept(c) for c in paper.key_concepts}
+        with self._lock:
+            found: Set[str] = set()
+            for concept in concepts:
+                found.update(self._postings.get(concept, ()))
+        found.discard(paper.id)
+        return found
+
+    def __len__(self) -> int:
+        return len(self._paper_concepts)
+
+    def _add(self, paper: Paper):
+        concepts = {normalize_concept(c) for c in paper.key_concepts}
+        self._paper_concepts[paper.id] = concepts
+        for concept in concepts:
+            self._postings.setdefault(concept, set()).add(paper.id)
+
+    def _remove(self, paper_id: str):
+        for concept in self._paper_concepts.pop(paper_id, ()):
+            posting = self._postings.get(concept)
+            if posting is None:
+                continue
+            posting.discard(paper_id)
+            if not posting:
+                del self._postings[concept]
@@ -0,0 +1,96 @@
+import math
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import List, Sequence
+import numpy as np
+from models import Paper
+from config import EMBEDDING_PROVIDER, EMBEDDING_DIM, BEDROCK_EMBEDDING_MODEL_ID
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be been by can do does for from has have in into is it its of on or our over such than that the
+their them then there these they this those to under using via was we were what when where which while with without
+paper papers propose proposed present show shows study approach method methods based new results
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords; shared by the embedder and the lexical index."""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        # Crude plural folding so "transformers" and "transformer" share a feature
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def paper_text(paper: Paper) -> str:
+    return f"{paper.title}\n{paper.summary}"
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class Embedder(ABC):
+    """Maps texts to fixed-size vectors; rows of the returned matrix are L2-normalized."""
+
+    name: str
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+
+class HashingEmbedder(Embedder):
+    """Signed feature hashing of word unigrams and bigrams. Local and deterministic, no model needed."""
+
+    name = "hashing"
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+            for feature, count in features.items():
+                # crc32 is stable across processes, unlike hash()
+                h = zlib.crc32(feature.encode("utf-8"))
+                sign = -1.0 if h & 0x80000000 else 1.0
+                vectors[row, h % self.dim] += sign * (1.0 + math.log(count))
+        return normalize_rows(vectors)
+
+
+class BedrockEmbedder(Embedder):
+    """Amazon Titan text embeddings through the shared Bedrock client."""
+
+    name = "bedrock"
+
+    def __init__(self, model_id: str = BEDROCK_EMBEDDING_MODEL_ID, dim: int = EMBEDDING_DIM):
+        self.model_id = model_id
+        self.dim = dim
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        from agents.base import invoke_bedrock_embedding
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row] = invoke_bedrock_embedding(text, self.dim, self.model_id)
+        return normalize_rows(vectors)
+
+
+def create_embedder(name: str = EMBEDDING_PROVIDER) -> Embedder:
+    if name == "hashing":
+        return HashingEmbedder()
+    if name == "bedrock":
+        return BedrockEmbedder()
+    raise ValueError(f"Unknown embedding provider: {name}")
@@ -0,0 +1,72 @@
+import heapq
+import math
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, Tuple
+from models import Paper
+from indexes.base import PaperIndex
+from indexes.embeddings import tokenize
+
+
+def paper_terms(paper: Paper) -> List[str]:
+    # Title terms count twice, a cheap stand-in for per-field weighting
+    title = tokenize(paper.title)
+    return title + title + tokenize(paper.summary) + tokenize(" ".join(paper.key_concepts))
+
+
+class LexicalIndex(PaperIndex):
+    """BM25 inverted index over each paper's title, abstract and key concepts."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        super().__init__()
+
+    def _reset(self):
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._paper_terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """Top-``k`` (paper id, BM25 score) pairs; only papers sharing a term with the query are scored."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n = len(self._lengths)
+            if not n or not terms:
+                return []
+            average_length = self._total_length / n
+            scores: Dict[str, float] = {}
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for paper_id, tf in posting.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[paper_id] / average_length)
+                    scores[paper_id] = scores.get(paper_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=itemgetter(1))
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def _add(self, paper: Paper):
+        counts = Counter(paper_terms(paper))
+        self._lengths[paper.id] = sum(counts.values())
+        self._total_length += self._lengths[paper.id]
+        self._paper_terms[paper.id] = list(counts)
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[paper.id] = tf
+
+    def _remove(self, paper_id: str):
+        length = self._lengths.pop(paper_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._paper_terms.pop(paper_id, ()):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(paper_id, None)
+            if not posting:
+                del self._postings[term]
@@ -0,0 +1,65 @@
+import re
+from typing import Dict, Set
+from models import Paper
+from indexes.base import PaperIndex
+
+
+def normalize_arxiv_id(arxiv_id: str) -> str:
+    """Versionless, lowercased arXiv ID, so "arXiv:1706.03762v5" and "1706.03762" match."""
+    value = arxiv_id.strip().lower()
+    if value.startswith("arxiv:"):
+        value = value[len("arxiv:"):]
+    return re.sub(r"v\d+$", "", value)
+
+
+class ReferenceIndex(PaperIndex):
+    """Inverted index from cited arXiv ID to the ids of papers whose references include it.
+
+    Also maps each indexed paper's versionless ID to its paper id, so citations resolve
+    in both directions with dictionary lookups.
+    """
+
+    def _reset(self):
+        self._citing: Dict[str, Set[str]] = {}
+        self._paper_refs: Dict[str, Set[str]] = {}
+        self._paper_ids: Dict[str, str] = {}
+
+    def cites(self, paper: Paper) -> Set[str]:
+        """Ids of indexed papers that ``paper`` references."""
+        refs = {normalize_arxiv_id(r.arxiv_id) for r in paper.references if r.arxiv_id}
+        with self._lock:
+            found = {self._paper_ids[ref] for ref in refs if ref in self._paper_ids}
+        found.discard(paper.id)
+        return found
+
+    def cited_by(self, paper: Paper) -> Set[str]:
+        """Ids of indexed papers whose references include ``paper``."""
+        with self._lock:
+            found = set(self._citing.get(normalize_arxiv_id(paper.id), ()))
+        found.discard(paper.id)
+        return found
+
+    def __len__(self) -> int:
+        return len(self._paper_refs)
+
+    def _add(self, paper: Paper):
+        refs = {normalize_arxiv_id(r.arxiv_id) for r in paper.references if r.arxiv_id}
+        self._paper_refs[paper.id] = refs
+        self._paper_ids[normalize_arxiv_id(paper.id)] = paper.id
+        for ref in refs:
+            self._citing.setdefault(ref, set()).add(paper.id)
+
+    def _remove(self, paper_id: str):
+        refs = self._paper_refs.pop(paper_id, None)
+        if refs is None:
+            return
+        base_id = normalize_arxiv_id(paper_id)
+        if self._paper_ids.get(base_id) == paper_id:
+            del self._paper_ids[base_id]
+        for ref in refs:
+            citing = self._citing.get(ref)
+            if citing is None:
+                continue
+            citing.discard(paper_id)
+            if not citing:
+                del self._citing[ref]
@@ -0,0 +1,66 @@
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Set, Tuple
+from models import Paper
+from indexes.base import PaperIndex
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", title.lower()).split())
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    padded = f"  {normalize_title(text)} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TitleIndex(PaperIndex):
+    """Character-trigram index over paper titles for fuzzy, ranked title lookups.
+
+    A match scores the mean of the Dice coefficient (overall similarity) and the
+    fraction of the query's trigrams found in the title (so a short query that is
+    part of a long title still ranks well). Only titles sharing a trigram with the
+    query are scored.
+    """
+
+    def _reset(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._paper_grams: Dict[str, FrozenSet[str]] = {}
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """Up to ``k`` (paper id, score in [0, 1]) pairs, best first."""
+        query_grams = trigrams(query)
+        if not normalize_title(query):
+            return []
+        with self._lock:
+            shared: Counter = Counter()
+            for gram in query_grams:
+                shared.update(self._postings.get(gram, ()))
+            scored = []
+            for paper_id, overlap in shared.items():
+                title_size = len(self._paper_grams[paper_id])
+                dice = 2 * overlap / (len(query_grams) + title_size)
+                score = (dice + overlap / len(query_grams)) / 2
+                if score >= min_score:
+                    scored.append((paper_id, score, title_size))
+        # Ties go to the shorter title, the closer match for a contained query
+        scored.sort(key=lambda item: (-item[1], item[2], item[0]))
+        return [(paper_id, score) for paper_id, score, _ in scored[:k]]
+
+    def __len__(self) -> int:
+        return len(self._paper_grams)
+
+    def _add(self, paper: Paper):
+        grams = trigrams(paper.title)
+        self._paper_grams[paper.id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(paper.id)
+
+    def _remove(self, paper_id: str):
+        for gram in self._paper_grams.pop(paper_id, ()):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(paper_id)
+            if not posting:
+                del self._postings[gram]
@@ -0,0 +1,276 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from indexes.embeddings import Embedder, normalize_rows, paper_text
+from models import Paper
+
+Neighbors = List[Tuple[str, float]]
+
+# Query rows scored per matrix product, bounding the (rows x collection) score matrix
+SEARCH_BLOCK_ROWS = 256
+
+
+class VectorIndex(ABC):
+    """Cosine-similarity k-nearest-neighbour index over string ids."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    @abstractmethod
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Insert or replace the vectors for ``ids``."""
+
+    @abstractmethod
+    def remove(self, item_id: str):
+        ...
+
+    @abstractmethod
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        """The stored (normalized) vector for ``item_id``, if indexed."""
+
+    @abstractmethod
+    def search(self, queries: np.ndarray, k: int) -> List[Neighbors]:
+        """For each query row, up to ``k`` (id, cosine similarity) pairs, most similar first."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class BruteForceIndex(VectorIndex):
+    """Exact search: one matrix product per block of queries against every stored vector."""
+
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix = np.zeros((64, dim), dtype=np.float32)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        needed = len(self._ids) + len(ids)
+        if needed > len(self._matrix):
+            grown = np.zeros((max(needed, 2 * len(self._matrix)), self.dim), dtype=np.float32)
+            grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+            self._matrix = grown
+        for item_id, vector in zip(ids, vectors):
+            row = self._rows.get(item_id)
+            if row is None:
+                row = self._rows[item_id] = len(self._ids)
+                self._ids.append(item_id)
+            self._matrix[row] = vector
+
+    def remove(self, item_id: str):
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+        # Move the last row into the hole so the live rows stay contiguous
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        row = self._rows.get(item_id)
+        return None if row is None else self._matrix[row].copy()
+
+    def search(self, queries: np.ndarray, k: int) -> List[Neighbors]:
+        queries = normalize_rows(np.asarray(queries, dtype=np.float32).reshape(-1, self.dim))
+        n = len(self._ids)
+        k = min(k, n)
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        matrix = self._matrix[:n]
+        results: List[Neighbors] = []
+        for start in range(0, len(queries), SEARCH_BLOCK_ROWS):
+            scores = queries[start:start + SEARCH_BLOCK_ROWS] @ matrix.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for rows, row_scores in zip(top, top_scores):
+                results.append([(self._ids[r], float(s)) for r, s in zip(rows, row_scores)])
+        return results
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class HnswIndex(VectorIndex):
+    """Approximate search with hnswlib (optional dependency), for collections where exact search gets slow."""
+
+    def __init__(self, dim: int, ef: int = 64, m: int = 16, ef_construction: int = 200):
+        try:
+            import hnswlib
+        except ImportError as e:
+            raise ImportError("VECTOR_INDEX_BACKEND=hnsw requires the hnswlib package") from e
+        super().__init__(dim)
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        self._index.init_index(max_elements=1024, ef_construction=ef_construction, M=m)
+        self._index.set_ef(ef)
+        self._labels: Dict[str, int] = {}
+        self._ids: Dict[int, str] = {}
+        self._next_label = 0
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        labels = []
+        for item_id in ids:
+            label = self._labels.get(item_id)
+            if label is None:
+                label = self._labels[item_id] = self._next_label
+                self._ids[label] = item_id
+                self._next_label += 1
+            labels.append(label)
+        capacity = self._index.get_max_elements()
+        if self._next_label > capacity:
+            self._index.resize_index(max(self._next_label, 2 * capacity))
+        self._index.add_items(np.asarray(vectors, dtype=np.float32), labels)
+
+    def remove(self, item_id: str):
+        label = self._labels.pop(item_id, None)
+        if label is not None:
+            self._index.mark_deleted(label)
+            del self._ids[label]
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        label = self._labels.get(item_id)
+        return None if label is None else np.asarray(self._index.get_items([label])[0], dtype=np.float32)
+
+    def search(self, queries: np.ndarray, k: int) -> List[Neighbors]:
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        k = min(k, len(self._labels))
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        labels, distances = self._index.knn_query(queries, k=k)
+        return [
+            [(self._ids[int(label)], 1.0 - float(distance)) for label, distance in zip(row_labels, row_distances)]
+            for row_labels, row_distances in zip(labels, distances)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+
+VECTOR_BACKENDS: Dict[str, Callable[[int], VectorIndex]] = {
+    "bruteforce": BruteForceIndex,
+    "hnsw": HnswIndex,
+}
+
+
+def register_vector_backend(name: str, factory: Callable[[int], VectorIndex]):
+    """Plug in another ANN engine; ``factory(dim)`` must return a VectorIndex."""
+    VECTOR_BACKENDS[name] = factory
+
+
+def create_vector_index(name: str, dim: int) -> VectorIndex:
+    factory = VECTOR_BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown vector index backend: {name}")
+    return factory(dim)
+
+
+def embed_missing(embedder: Embedder, papers: Sequence[Paper]) -> List[Paper]:
+    """Embed papers with no stored embedding (or one from a model of another size). Returns those papers."""
+    missing = [p for p in papers if not p.embedding or len(p.embedding) != embedder.dim]
+    if missing:
+        vectors = embedder.embed([paper_text(p) for p in missing])
+        for paper, vector in zip(missing, vectors):
+            paper.embedding = vector.tolist()
+    return missing
+
+
+class SemanticIndex:
+    """Paper embeddings kept in a vector index, maintained alongside the storage cache.
+
+    The index holds the only in-memory copy of each vector; ``Paper.embedding`` is just
+    how a vector travels between the embedder, the backend and this index.
+    """
+
+    def __init__(self, embedder: Embedder, backend: str):
+        self.embedder = embedder
+        self.backend = backend
+        self._index = create_vector_index(backend, embedder.dim)
+        self._lock = threading.Lock()
+
+    def embed_missing(self, papers: Sequence[Paper]) -> List[Paper]:
+        return embed_missing(self.embedder, papers)
+
+    def rebuild(self, papers: Iterable[Paper], embeddings: Optional[Dict[str, List[float]]] = None) -> Dict[str, List[float]]:
+        """Index ``papers`` with their vectors from ``embeddings`` (else ``Paper.embedding``).
+
+        Papers with neither are embedded; their new vectors are returned so they can be stored.
+        """
+        papers = list(papers)
+        embeddings = embeddings or {}
+        vectors = np.zeros((len(papers), self.embedder.dim), dtype=np.float32)
+        missing = []
+        for row, paper in enumerate(papers):
+            vector = embeddings.get(paper.id) or paper.embedding
+            if vector and len(vector) == self.embedder.dim:
+                vectors[row] = vector
+            else:
+                missing.append(row)
+        if missing:
+            vectors[missing] = self.embedder.embed([paper_text(papers[row]) for row in missing])
+        index = create_vector_index(self.backend, self.embedder.dim)
+        if papers:
+            index.add([p.id for p in papers], vectors)
+        with self._lock:
+            self._index = index
+        return {papers[row].id: vectors[row].tolist() for row in missing}
+
+    def add(self, paper: Paper):
+        vector = paper.embedding
+        if not vector or len(vector) != self.embedder.dim:
+            vector = self.embedder.embed([paper_text(paper)])[0]
+        with self._lock:
+            self._index.add([paper.id], np.asarray(vector, dtype=np.float32)[None, :])
+
+    def remove(self, paper_id: str):
+        with self._lock:
+            self._index.remove(paper_id)
+
+    def neighbors(self, papers: Iterable[Paper], k: int, threshold: float) -> Dict[str, Neighbors]:
+        """Top-``k`` indexed papers with cosine similarity >= ``threshold`` for each paper (excluding itself).
+
+        All queries are answered with one batched index search.
+        """
+        papers = list(papers)
+        if not papers:
+            return {}
+        queries = np.zeros((len(papers), self.embedder.dim), dtype=np.float32)
+        missing = []
+        with self._lock:
+            for row, paper in enumerate(papers):
+                vector = self._index.get(paper.id)
+                if vector is None:
+                    missing.append(row)
+                else:
+                    queries[row] = vector
+        if missing:
+            queries[missing] = self.embedder.embed([paper_text(papers[row]) for row in missing])
+        with self._lock:
+            # One extra hit since each indexed paper finds itself first
+            hits = self._index.search(queries, k + 1)
+        return {
+            paper.id: [(other, score) for other, score in row if other != paper.id and score >= threshold][:k]
+            for paper, row in zip(papers, hits)
+        }
+
+    def search_text(self, text: str, k: int) -> Neighbors:
+        """Indexed papers most similar to free text, such as a question."""
+        query = self.embedder.embed([text])
+        if not query.any():
+            return []
+        with self._lock:
+            return self._index.search(query, k)[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
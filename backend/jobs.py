@@ -0,0 +1,174 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from models import Job
+from config import JOBS_DB_PATH, JOB_WORKERS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    timings TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+"""
+
+
+class JobStore:
+    """SQLite-backed job table, so queued and finished jobs survive a worker restart."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._open_lock = threading.Lock()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Opened on first use, so importing the job module touches no files."""
+        if self._db is None:
+            with self._open_lock:
+                if self._db is None:
+                    directory = os.path.dirname(self.path)
+                    if directory and self.path != ":memory:":
+                        os.makedirs(directory, exist_ok=True)
+                    db = sqlite3.connect(self.path, check_same_thread=False)
+                    db.row_factory = sqlite3.Row
+                    db.execute("PRAGMA journal_mode=WAL")
+                    db.executescript(SCHEMA)
+                    self._db = db
+        return self._db
+
+    def create(self, kind: str, payload: dict) -> Job:
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) VALUES (?, ?, 'pending', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), now, now),
+            )
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, job_id: str) -> bool:
+        """Atomically move a pending job to running; False if another worker got it first."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ? AND status = 'pending'",
+                (time.time(), job_id),
+            )
+        return cursor.rowcount == 1
+
+    def update(self, job_id: str, **fields):
+        for key in ("result", "timings"):
+            if key in fields:
+                fields[key] = json.dumps(fields[key])
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def requeue_interrupted(self) -> List[str]:
+        """Reset running jobs to pending, and return every pending job id.
+
+        Only called at startup, when no worker from an earlier process can still be running them.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running'")
+            rows = self._conn.execute("SELECT id FROM jobs WHERE status = 'pending' ORDER BY created_at").fetchall()
+        return [row["id"] for row in rows]
+
+    def _row_to_job(self, row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            status=row["status"],
+            stage=row["stage"],
+            payload=json.loads(row["payload"]),
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            timings=json.loads(row["timings"] or "{}"),
+            created_at=datetime.fromtimestamp(row["created_at"], tz=timezone.utc),
+            updated_at=datetime.fromtimestamp(row["updated_at"], tz=timezone.utc),
+        )
+
+
+class JobContext:
+    """Handed to job handlers to report the current stage and collect stage timings."""
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self.timings: Dict[str, float] = {}
+
+    def stage(self, name: str):
+        self.store.update(self.job_id, stage=name, timings=dict(self.timings))
+
+
+JobHandler = Callable[[dict, JobContext], dict]
+
+
+class JobManager:
+
+    def __init__(self, store: JobStore, max_workers: int = JOB_WORKERS):
+        self.store = store
+        self._handlers: Dict[str, JobHandler] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, payload: dict) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = self.store.create(kind, payload)
+        self._executor.submit(self._run, job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def resume(self) -> List[str]:
+        """Re-queue jobs left pending or interrupted by a previous process."""
+        job_ids = self.store.requeue_interrupted()
+        for job_id in job_ids:
+            self._executor.submit(self._run, job_id)
+        return job_ids
+
+    def _run(self, job_id: str):
+        if not self.store.claim(job_id):
+            return
+        job = self.store.get(job_id)
+        assert job is not None
+        context = JobContext(self.store, job_id)
+        try:
+            handler = self._handlers[job.kind]
+            result = handler(job.payload, context)
+            self.store.update(job_id, status="succeeded", stage="done", result=result, timings=context.timings)
+        except Exception as e:
+            traceback.print_exc()
+            self.store.update(job_id, status="failed", error=str(e), timings=context.timings)
+
+
+job_manager = JobManager(JobStore(JOBS_DB_PATH))
@@ -0,0 +1,31 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LazyClient(Generic[T]):
+    """Stands in for a client that is built on first use, once per process.
+
+    Attribute access is forwarded to the real client, so call sites keep using
+    the module-level name (``bedrock.converse(...)``) and tests can still patch it.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
@@ -1,96 +1,78 @@
+import asyncio
+import json
 import uuid
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from typing import List, Optional, Union
 
-from models import Paper, ChatRequest, ChatResponse, AddPaperRequest, GraphData, SelectPaperRequest, Edge
+from models import (
+    Paper, PaperLite, ChatMessage, ChatRequest, ChatResponse, AddPaperRequest, GraphData, SelectPaperRequest, Edge,
+    BatchIngestRequest, Job, JobAccepted,
+)
+from config import validate_config
 from storage import storage
-from graph import run_pipeline
+from jobs import job_manager, JobContext
+from graph import arun_pipeline, astream_pipeline
 from agents.utils import extract_arxiv_id
 from agents.ingest import fetch_paper_from_arxiv
+from agents.batch import ingest_batch
+from agents.connection import link_citations
 from agents.synthesis import build_cytoscape_graph
+from analytics import AnalyticsCache
+from agents.intent import intent_metrics
+from agents.tavily_gateway import tavily
+from agents.arxiv_gateway import arxiv_gateway
+from agents import llm_cache
+from metrics import render_metrics
 
-app = FastAPI(title="Research Paper Connection Agent")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-@app.get("/")
-async def root():
-    return {"message": "Research Paper Connection Agent API"}
 
-
-@app.post("/papers", response_model=Paper)
-async def add_paper(request: AddPaperRequest):
-    arxiv_id = extract_arxiv_id(request.arxiv_id)
+def run_add_paper_job(payload: dict, job: JobContext) -> dict:
+    arxiv_id = payload["arxiv_id"]
     existing = storage.get_paper(arxiv_id)
     if existing:
-        return existing
-    paper = fetch_paper_from_arxiv(arxiv_id)
+        return existing.model_dump(mode="json")
+    paper = fetch_paper_from_arxiv(arxiv_id, timings=job.timings, on_stage=job.stage)
+    job.stage("store")
     storage.add_paper(paper)
-    return paper
-
+    link_citations([paper])
+    return paper.model_dump(mode="json")
 
-@app.get("/papers", response_model=List[Paper])
-async def get_papers():
-    return storage.get_all_papers()
 
-
-@app.get("/papers/{paper_id}", response_model=Paper)
-async def get_paper(paper_id: str):
-    paper = storage.get_paper(paper_id)
-    if not paper:
-        raise HTTPException(status_code=404, detail="Paper not found")
-    return paper
-
-
-@app.post("/papers/select", response_model=ChatResponse)
-async def select_paper(request: SelectPaperRequest):
-    """Add a paper by arXiv ID and optionally link it to a source paper."""
+def run_select_paper_job(payload: dict, job: JobContext) -> dict:
     papers_added = []
     error_message = None
 
-    arxiv_id = extract_arxiv_id(request.arxiv_id)
+    arxiv_id = extract_arxiv_id(payload["arxiv_id"])
+    source_paper_id = payload.get("source_paper_id")
 
     if not arxiv_id:
-        error_message = f"Invalid arXiv ID: {request.arxiv_id}"
+        error_message = f"Invalid arXiv ID: {payload['arxiv_id']}"
     else:
         existing = storage.get_paper(arxiv_id)
         if existing:
             papers_added = [existing.id]
         else:
             try:
-                paper = fetch_paper_from_arxiv(arxiv_id)
+                paper = fetch_paper_from_arxiv(arxiv_id, timings=job.timings, on_stage=job.stage)
+                job.stage("store")
                 storage.add_paper(paper)
+                link_citations([paper])
                 papers_added = [paper.id]
             except Exception as e:
                 error_message = f"Could not fetch paper: {str(e)}"
 
     # Create edge linking source paper to added paper
     edge_created = False
-    if request.source_paper_id and papers_added:
-        added_paper_id = papers_added[0]
-        existing_edges = storage.get_edges()
-        edge_exists = any(
-            (e.source_id == request.source_paper_id and e.target_id == added_paper_id) or
-            (e.source_id == added_paper_id and e.target_id == request.source_paper_id)
-            for e in existing_edges
+    if source_paper_id and papers_added:
+        edge = Edge(
+            id=str(uuid.uuid4()),
+            source_id=source_paper_id,
+            target_id=papers_added[0]
         )
-
-        if not edge_exists:
-            edge = Edge(
-                id=str(uuid.uuid4()),
-                source_id=request.source_paper_id,
-                target_id=added_paper_id
-            )
-            storage.add_edge(edge)
-            edge_created = True
+        # The insert is a no-op when the pair is already linked in either direction
+        edge_created = storage.add_edge(edge) is not None
 
     graph_updated = bool(papers_added) or edge_created
 
@@ -111,61 +93,250 @@ async def select_paper(request: SelectPaperRequest):
     )
 
     storage.add_chat_message("assistant", response.message)
-    return response
+    return response.model_dump(mode="json")
+
+
+def run_batch_ingest_job(payload: dict, job: JobContext) -> dict:
+    # Every built paper is reported, so GET /jobs shows how far a long batch has got
+    job.stage("ingest")
+    return ingest_batch(payload["arxiv_ids"], progress=job.stage).model_dump(mode="json")
+
+
+job_manager.register("add_paper", run_add_paper_job)
+job_manager.register("select_paper", run_select_paper_job)
+job_manager.register("batch_ingest", run_batch_ingest_job)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fail fast on missing settings here rather than at import, so tooling can import the app freely
+    validate_config()
+    # Pick up jobs that were queued or interrupted before this worker started
+    job_manager.resume()
+    yield
+
+
+app = FastAPI(title="Research Paper Connection Agent", lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
+)
+
+# Paginated list endpoints return the page as the body and the next cursor in this header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _accepted(job: Job) -> JobAccepted:
+    return JobAccepted(job_id=job.id, status=job.status, status_url=f"/jobs/{job.id}")
+
+
+@app.get("/")
+async def root():
+    return {"message": "Research Paper Connection Agent API"}
+
+
+# Handlers that touch storage or the job table are plain def, so FastAPI runs their blocking calls in its threadpool
+@app.post("/papers", response_model=JobAccepted, status_code=202)
+def add_paper(request: AddPaperRequest):
+    """Queue an ingest; poll GET /jobs/{job_id} for stage progress and the stored paper."""
+    arxiv_id = extract_arxiv_id(request.arxiv_id)
+    if not arxiv_id:
+        raise HTTPException(status_code=400, detail=f"Invalid arXiv ID: {request.arxiv_id}")
+    return _accepted(job_manager.submit("add_paper", {"arxiv_id": arxiv_id}))
+
+
+@app.post("/papers/batch", response_model=JobAccepted, status_code=202)
+def add_papers_batch(request: BatchIngestRequest):
+    """Ingest many arXiv IDs or URLs, skipping ones already stored, then link them in one pass.
+
+    The job result is a BatchIngestResponse.
+    """
+    return _accepted(job_manager.submit("batch_ingest", {"arxiv_ids": request.arxiv_ids}))
+
+
+@app.get("/papers", response_model=Union[List[Paper], List[PaperLite]])
+def get_papers(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = None,
+    light: bool = False,
+):
+    if limit is None and after is None:
+        papers = storage.get_all_papers()
+        if light:
+            return [PaperLite.model_validate(p.model_dump(include=set(PaperLite.model_fields))) for p in papers]
+        return papers
+
+    try:
+        papers, next_cursor = storage.get_papers_page(limit or 100, after=after, light=light)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return papers
+
+
+@app.get("/papers/{paper_id}", response_model=Paper)
+def get_paper(paper_id: str):
+    paper = storage.get_paper(paper_id)
+    if not paper:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    return paper
+
+
+@app.post("/papers/select", response_model=JobAccepted, status_code=202)
+def select_paper(request: SelectPaperRequest):
+    """Add a paper by arXiv ID and optionally link it to a source paper.
+
+    The job result is a ChatResponse.
+    """
+    payload = {"arxiv_id": request.arxiv_id, "source_paper_id": request.source_paper_id}
+    return _accepted(job_manager.submit("select_paper", payload))
+
+
+@app.get("/jobs/{job_id}", response_model=Job)
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @app.get("/graph", response_model=GraphData)
-async def get_graph():
+def get_graph():
     return storage.get_graph_data()
 
 
 @app.get("/graph/cytoscape")
-async def get_cytoscape_graph():
+def get_cytoscape_graph():
     graph_data = storage.get_graph_data()
     return build_cytoscape_graph(graph_data)
 
 
+graph_analytics = AnalyticsCache(storage)
+
+
+# Plain def: a recompute after a graph change is CPU-bound, so it runs in the threadpool
+@app.get("/graph/analytics")
+def get_graph_analytics(limit: int = Query(20, ge=1, le=1000)):
+    """PageRank hubs, communities and component sizes, cached until the graph changes."""
+    return graph_analytics.get().summary(limit)
+
+
+@app.get("/graph/analytics/papers/{paper_id}")
+def get_paper_analytics(paper_id: str):
+    stats = graph_analytics.get().paper(paper_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    return stats
+
+
+@app.get("/graph/path")
+def get_shortest_path(source: str, target: str):
+    """Fewest-hop chain of papers linking ``source`` to ``target``; ``path`` is null when they aren't connected."""
+    analytics = graph_analytics.get()
+    if analytics.paper(source) is None or analytics.paper(target) is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    path = analytics.shortest_path(source, target)
+    return {"path": path, "hops": len(path) - 1 if path else None}
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
-    storage.add_chat_message("user", request.message)
+    await asyncio.to_thread(storage.add_chat_message, "user", request.message)
 
     try:
-        result = run_pipeline(request.message)
-        message = result.get("final_response", "I processed your request.")
-        papers_added = [p.id for p in result.get("papers_added", [])]
-        graph_updated = bool(papers_added) or bool(result.get("connection_edges", []))
-        paper_candidates = result.get("paper_candidates", [])
-
-        response = ChatResponse(
-            message=message,
-            graph_updated=graph_updated,
-            papers_added=papers_added,
-            paper_candidates=paper_candidates
-        )
+        result = await arun_pipeline(request.message)
+        response = _chat_response(result)
     except Exception as e:
-        response = ChatResponse(
-            message=f"Error processing request: {str(e)}",
-            graph_updated=False,
-            papers_added=[]
-        )
+        response = _chat_error(e)
 
-    storage.add_chat_message("assistant", response.message)
+    await asyncio.to_thread(storage.add_chat_message, "assistant", response.message)
     return response
 
 
-@app.get("/chat/history")
-async def get_chat_history():
-    return storage.get_chat_history()
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Server-Sent Events version of /chat.
+
+    Emits ``intent``, ``node`` and ``token`` events while the pipeline runs and a
+    final ``done`` event carrying the ChatResponse.
+    """
+    await asyncio.to_thread(storage.add_chat_message, "user", request.message)
+
+    async def events():
+        response = ChatResponse(message="I processed your request.")
+        try:
+            async for event, data in astream_pipeline(request.message):
+                if event == "result":
+                    response = _chat_response(data)
+                else:
+                    yield _sse(event, data)
+        except Exception as e:
+            response = _chat_error(e)
+        await asyncio.to_thread(storage.add_chat_message, "assistant", response.message)
+        yield _sse("done", response.model_dump(mode="json"))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _chat_response(result: dict) -> ChatResponse:
+    papers_added = [p.id for p in result.get("papers_added", [])]
+    return ChatResponse(
+        message=result.get("final_response", "I processed your request."),
+        graph_updated=bool(papers_added) or bool(result.get("connection_edges", [])),
+        papers_added=papers_added,
+        paper_candidates=result.get("paper_candidates", [])
+    )
+
+
+def _chat_error(error: Exception) -> ChatResponse:
+    return ChatResponse(
+        message=f"Error processing request: {str(error)}",
+        graph_updated=False,
+        papers_added=[]
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/chat/history", response_model=List[ChatMessage])
+def get_chat_history(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = None,
+):
+    if limit is None and after is None:
+        return storage.get_chat_history()
+
+    try:
+        messages, next_cursor = storage.get_chat_history_page(limit or 100, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return messages
 
 
 @app.delete("/chat/history")
-async def clear_chat_history():
+def clear_chat_history():
     storage.clear_chat_history()
     return {"message": "Chat history cleared"}
 
 
 @app.delete("/papers/{paper_id}")
-async def delete_paper(paper_id: str):
+def delete_paper(paper_id: str):
     paper = storage.get_paper(paper_id)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
@@ -174,11 +345,32 @@ async def delete_paper(paper_id: str):
 
 
 @app.delete("/edges/{edge_id}")
-async def delete_edge(edge_id: str):
+def delete_edge(edge_id: str):
     storage.delete_edge(edge_id)
     return {"message": "Edge deleted"}
 
 
+@app.get("/router/stats")
+async def get_router_stats():
+    """Fast-path hit rate of the rule-based intent classifier and its disagreement with Bedrock."""
+    return intent_metrics.get_stats()
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return {
+        "llm": llm_cache.llm_cache.get_stats() if llm_cache.llm_cache else None,
+        "tavily": tavily.get_stats(),
+        "arxiv": arxiv_gateway.get_stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Latency histograms in the Prometheus text exposition format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
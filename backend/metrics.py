@@ -0,0 +1,135 @@
+"""In-process latency histograms, rendered in the Prometheus text exposition format.
+
+Three families cover the request path: the whole pipeline (by intent), each
+LangGraph node, and each external call (Bedrock, Tavily, arXiv, storage, PDF
+download). Every sample is labelled with an outcome of "ok" or "error".
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[len(self.buckets)] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the block's duration, adding outcome="error" if it raises."""
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            self.observe(time.perf_counter() - start, **labels, outcome=outcome)
+
+    def count(self, **labels: str) -> int:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            return series[len(self.buckets)] if series else 0
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        for key, values in series:
+            pairs = list(zip(self.label_names, key))
+            for bound, cumulative in zip(self.buckets, values):
+                lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', repr(bound))])} {cumulative}")
+            total = values[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {total}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {values[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {total}")
+        return "\n".join(lines)
+
+
+pipeline_seconds = Histogram(
+    "research_pipeline_seconds", "End-to-end LangGraph pipeline latency.", ["intent", "outcome"])
+node_seconds = Histogram(
+    "research_node_seconds", "Latency of each LangGraph node.", ["node", "outcome"])
+external_call_seconds = Histogram(
+    "research_external_call_seconds", "Latency of calls to external services.", ["service", "operation", "outcome"])
+
+REGISTRY = [pipeline_seconds, node_seconds, external_call_seconds]
+
+
+def render_metrics() -> str:
+    return "\n".join(h.render() for h in REGISTRY) + "\n"
+
+
+def track_call(service: str, operation: str):
+    """Context manager timing one external call."""
+    return external_call_seconds.time(service=service, operation=operation)
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """Wrap a graph node so its latency is recorded.
+
+    functools.wraps keeps the original signature visible, so LangGraph still
+    passes ``config`` to nodes that accept it.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with node_seconds.time(node=name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def instrument_methods(service: str, names: Sequence[str]):
+    """Class decorator recording each listed method as an external call to ``service``."""
+    def decorate(cls):
+        for method_name in names:
+            method = getattr(cls, method_name)
+
+            def make_wrapper(method, operation):
+                @functools.wraps(method)
+                def wrapper(*args, **kwargs):
+                    with track_call(service, operation):
+                        return method(*args, **kwargs)
+                return wrapper
+
+            setattr(cls, method_name, make_wrapper(method, method_name))
+        return cls
+    return decorate
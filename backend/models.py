@@ -1,8 +1,11 @@
-from pydantic import BaseModel
-from typing import List, Optional, Literal
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Literal
 from datetime import datetime
 
 Role = Literal["user", "assistant"]
+JobStatus = Literal["pending", "running", "succeeded", "failed"]
+# "cites" edges point from the citing paper to the cited one; "related" edges are undirected
+EdgeType = Literal["related", "cites"]
 
 
 class Reference(BaseModel):
@@ -11,15 +14,14 @@ class Reference(BaseModel):
     author: Optional[str] = None
 
 
-class Paper(BaseModel):
+class PaperLite(BaseModel):
+    """Paper without summary and references, for list views."""
     id: str
     title: str
     authors: List[str]
-    summary: str
     published: datetime
     pdf_url: str
     key_concepts: List[str] = []
-    references: List[Reference] = []
 
     @property
     def arxiv_url(self) -> str:
@@ -30,14 +32,35 @@ class Paper(BaseModel):
         return self.published.year
 
 
+class Paper(PaperLite):
+    summary: str
+    references: List[Reference] = []
+    # Title + abstract embedding, computed once when the paper is stored. Only set while a paper is on its way
+    # to the backend or the semantic index: cached papers don't keep it, and it is never sent to clients
+    embedding: Optional[List[float]] = Field(default=None, exclude=True)
+
+
+def edge_key(source_id: str, target_id: str, edge_type: EdgeType = "related") -> str:
+    """Canonical identity of an edge, unique per backend: endpoint order only counts for "cites"."""
+    if edge_type == "related" and target_id < source_id:
+        source_id, target_id = target_id, source_id
+    return f"{edge_type}|{source_id}|{target_id}"
+
+
 class Edge(BaseModel):
     id: str
     source_id: str
     target_id: str
+    edge_type: EdgeType = "related"
     created_at: Optional[datetime] = None
 
+    @property
+    def key(self) -> str:
+        return edge_key(self.source_id, self.target_id, self.edge_type)
+
 
 class ChatMessage(BaseModel):
+    id: Optional[int] = None
     role: Role
     content: str
     created_at: Optional[datetime] = None
@@ -74,3 +97,34 @@ class AddPaperRequest(BaseModel):
 class SelectPaperRequest(BaseModel):
     arxiv_id: str
     source_paper_id: Optional[str] = None
+
+
+class BatchIngestRequest(BaseModel):
+    arxiv_ids: List[str] = Field(min_length=1, max_length=1000)  # arXiv IDs or URLs
+
+
+class BatchIngestResponse(BaseModel):
+    added: List[str] = []
+    skipped: List[str] = []  # already in the collection
+    invalid: List[str] = []  # no arXiv ID could be parsed
+    failed: Dict[str, str] = {}
+    edges_created: int = 0
+
+
+class Job(BaseModel):
+    id: str
+    kind: str
+    status: JobStatus
+    stage: Optional[str] = None
+    payload: dict = {}
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    timings: Dict[str, float] = {}
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class JobAccepted(BaseModel):
+    job_id: str
+    status: JobStatus
+    status_url: str
@@ -1,100 +1,343 @@
-from typing import List, Optional
-from datetime import datetime
-from supabase import create_client, Client
-from models import Paper, Edge, GraphData, Reference, ChatMessage, Role
-from config import SUPABASE_URL, SUPABASE_KEY
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from models import Paper, PaperLite, Edge, EdgeType, GraphData, ChatMessage, Role, edge_key
+from indexes import (
+    ConceptIndex, Embedder, LexicalIndex, ReferenceIndex, SemanticIndex, TitleIndex, create_embedder, embed_missing,
+)
+from backends import StorageBackend, create_backend
+from config import STORAGE_CACHE_TTL_SECONDS, VECTOR_INDEX_BACKEND
+
+
+class _Cache:
+    """One loaded copy of the papers and edges with the secondary indexes over them."""
+
+    def __init__(self, papers: List[Paper], edges: List[Edge], embedder: Embedder,
+                 embeddings: Dict[str, List[float]]):
+        # Papers are kept newest first, matching the created_at DESC order of the table scan
+        self.papers: Dict[str, Paper] = {paper.id: paper for paper in papers}
+        self.edges: Dict[str, Edge] = {}
+        # paper id -> ids of the edges touching it
+        self.edges_by_paper: Dict[str, Set[str]] = {}
+        # canonical edge key -> edge id, mirroring the backend's unique key index
+        self.edges_by_key: Dict[str, str] = {}
+        for edge in edges:
+            self.edges[edge.id] = edge
+            self.link(edge)
+        self.concept_index = ConceptIndex.from_papers(papers)
+        self.lexical_index = LexicalIndex.from_papers(papers)
+        self.reference_index = ReferenceIndex.from_papers(papers)
+        self.title_index = TitleIndex.from_papers(papers)
+        self.semantic_index = SemanticIndex(embedder, VECTOR_INDEX_BACKEND)
+        # Vectors for papers stored before embeddings existed, for the caller to save
+        self.backfilled = self.semantic_index.rebuild(papers, embeddings)
+
+    def matches(self, papers: List[Paper], edges: List[Edge]) -> bool:
+        return list(self.papers.values()) == papers and self.edges == {edge.id: edge for edge in edges}
+
+    def link(self, edge: Edge):
+        self.edges_by_paper.setdefault(edge.source_id, set()).add(edge.id)
+        self.edges_by_paper.setdefault(edge.target_id, set()).add(edge.id)
+        self.edges_by_key[edge.key] = edge.id
+
+    def unlink(self, edge: Edge):
+        for paper_id in (edge.source_id, edge.target_id):
+            edge_ids = self.edges_by_paper.get(paper_id)
+            if edge_ids is not None:
+                edge_ids.discard(edge.id)
+                if not edge_ids:
+                    del self.edges_by_paper[paper_id]
+        if self.edges_by_key.get(edge.key) == edge.id:
+            del self.edges_by_key[edge.key]
+
+    def add_papers(self, papers: List[Paper]):
+        new_papers = {}
+        for paper in papers:
+            self.concept_index.add(paper)
+            self.lexical_index.add(paper)
+            self.reference_index.add(paper)
+            self.title_index.add(paper)
+            self.semantic_index.add(paper)
+            # The vector now lives in the semantic index only
+            if paper.embedding is not None:
+                paper = paper.model_copy(update={"embedding": None})
+            if paper.id in self.papers:
+                self.papers[paper.id] = paper
+            else:
+                new_papers[paper.id] = paper
+        # Later papers in the batch are newer, so they go first
+        self.papers = {**dict(reversed(list(new_papers.items()))), **self.papers}
+
+    def add_edges(self, edges: List[Edge]):
+        for edge in edges:
+            previous = self.edges.get(edge.id)
+            if previous is not None:
+                self.unlink(previous)
+            self.edges[edge.id] = edge
+            self.link(edge)
+
+    def delete_edges(self, edge_ids: List[str]):
+        for edge_id in edge_ids:
+            edge = self.edges.pop(edge_id, None)
+            if edge is not None:
+                self.unlink(edge)
+
+    def delete_paper(self, paper_id: str):
+        self.papers.pop(paper_id, None)
+        self.concept_index.remove(paper_id)
+        self.lexical_index.remove(paper_id)
+        self.reference_index.remove(paper_id)
+        self.title_index.remove(paper_id)
+        self.semantic_index.remove(paper_id)
+        for edge_id in list(self.edges_by_paper.get(paper_id, ())):
+            self.unlink(self.edges.pop(edge_id))
 
 
 class Storage:
 
-    def __init__(self):
-        self.client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    def __init__(self, backend: Optional[StorageBackend] = None, cache_ttl_seconds: float = STORAGE_CACHE_TTL_SECONDS):
+        # The engine (and its client) is created on first use unless one is passed in
+        self._backend: Optional[StorageBackend] = backend
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # Guards the cache; held only for dictionary-sized work, never for a reload
+        self._lock = threading.RLock()
+        # Held by the one thread reloading the cache
+        self._reload_lock = threading.Lock()
+        self._embedder = create_embedder()
+        self._cache: Optional[_Cache] = None
+        # Set by invalidate(): the next read waits for a reload instead of serving the old cache
+        self._stale = False
+        # Writes made while a reload runs, replayed onto the reloaded cache before it is swapped in
+        self._journal: Optional[List[Tuple[Callable, tuple]]] = None
+        self._loaded_at = 0.0
+        self._version = 0
+
+    @property
+    def backend(self) -> StorageBackend:
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = create_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: StorageBackend):
+        with self._lock:
+            self._backend = backend
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the cached papers or edges change; a reload that finds the same data keeps it."""
+        with self._lock:
+            return self._version
+
+    def current_version(self) -> int:
+        """The version after loading the cache, or refreshing it once the TTL has passed."""
+        self._ensure_loaded()
+        return self.version
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    def _is_fresh(self) -> bool:
+        if self._cache is None or self._stale:
+            return False
+        return self.cache_ttl_seconds <= 0 or time.monotonic() - self._loaded_at < self.cache_ttl_seconds
+
+    def _ensure_loaded(self):
+        """Load the cache, or refresh it once the TTL has passed. Must be called without holding the lock.
+
+        Only the first load and a load after invalidate() make readers wait. A TTL refresh
+        is done by one thread while the others keep reading the current cache.
+        """
+        with self._lock:
+            if self._is_fresh():
+                return
+            must_wait = self._cache is None or self._stale
+        if not self._reload_lock.acquire(blocking=must_wait):
+            return
+        try:
+            with self._lock:
+                if self._is_fresh():
+                    return
+                self._journal = []
+            self._reload()
+        finally:
+            with self._lock:
+                self._journal = None
+            self._reload_lock.release()
+
+    def _reload(self):
+        papers = self.backend.load_papers()
+        edges = self.backend.load_edges()
+        with self._lock:
+            if not self._journal and self._cache is not None and self._cache.matches(papers, edges):
+                self._loaded_at = time.monotonic()
+                self._stale = False
+                return
+        # Index building is the slow part, so it happens before taking the lock
+        cache = _Cache(papers, edges, self._embedder, self.backend.load_embeddings())
+        if cache.backfilled:
+            self.backend.save_embeddings(cache.backfilled)
+        with self._lock:
+            assert self._journal is not None
+            for apply, args in self._journal:
+                apply(cache, *args)
+            self._cache = cache
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            self._version += 1
+
+    def _loaded(self) -> _Cache:
+        self._ensure_loaded()
+        with self._lock:
+            assert self._cache is not None
+            return self._cache
+
+    def _apply(self, apply: Callable, *args):
+        """Apply a write to the cache, and record it for a reload in progress."""
+        with self._lock:
+            if self._cache is not None:
+                apply(self._cache, *args)
+            if self._journal is not None:
+                self._journal.append((apply, args))
+            self._version += 1
 
     def add_paper(self, paper: Paper) -> Paper:
-        data = {
-            "id": paper.id,
-            "title": paper.title,
-            "authors": paper.authors,
-            "summary": paper.summary,
-            "published": paper.published.isoformat(),
-            "pdf_url": paper.pdf_url,
-            "key_concepts": paper.key_concepts,
-            "references": [r.model_dump() for r in paper.references],
-        }
-        self.client.table("papers").upsert(data).execute()
+        embed_missing(self._embedder, [paper])
+        self.backend.upsert_papers([paper])
+        self._apply(_Cache.add_papers, [paper])
         return paper
 
+    def add_papers(self, papers: Iterable[Paper]) -> List[Paper]:
+        papers = list(papers)
+        if papers:
+            embed_missing(self._embedder, papers)
+            self.backend.upsert_papers(papers)
+            self._apply(_Cache.add_papers, papers)
+        return papers
+
     def get_paper(self, paper_id: str) -> Optional[Paper]:
-        result = self.client.table("papers").select("*").eq("id", paper_id).execute()
-        if result.data:
-            return self._row_to_paper(result.data[0])
-        return None
+        cache = self._loaded()
+        with self._lock:
+            return cache.papers.get(paper_id)
 
     def get_all_papers(self) -> List[Paper]:
-        result = self.client.table("papers").select("*").order("created_at", desc=True).execute()
-        return [self._row_to_paper(row) for row in result.data]
-
-    def add_edge(self, edge: Edge) -> Edge:
-        data = {
-            "id": edge.id,
-            "source_id": edge.source_id,
-            "target_id": edge.target_id,
-        }
-        self.client.table("edges").upsert(data).execute()
-        return edge
+        cache = self._loaded()
+        with self._lock:
+            return list(cache.papers.values())
+
+    def get_papers_page(self, limit: int, after: Optional[str] = None,
+                        light: bool = False) -> Tuple[List[Union[Paper, PaperLite]], Optional[str]]:
+        """Keyset-paginated papers, newest first. Returns the page and the cursor for the next one."""
+        return self.backend.papers_page(limit, after, light)
+
+    def get_concept_index(self) -> ConceptIndex:
+        return self._loaded().concept_index
+
+    def get_semantic_index(self) -> SemanticIndex:
+        return self._loaded().semantic_index
+
+    def get_reference_index(self) -> ReferenceIndex:
+        return self._loaded().reference_index
+
+    def get_title_index(self) -> TitleIndex:
+        return self._loaded().title_index
+
+    def get_lexical_index(self) -> LexicalIndex:
+        return self._loaded().lexical_index
+
+    def add_edge(self, edge: Edge) -> Optional[Edge]:
+        """Store the edge unless one with the same canonical key exists. Returns it if it was added."""
+        added = self.add_edges([edge])
+        return added[0] if added else None
+
+    def add_edges(self, edges: Iterable[Edge]) -> List[Edge]:
+        """Idempotent insert: edges whose key is already stored (or repeated in the batch) are skipped.
+
+        Returns the edges that were added.
+        """
+        unique: Dict[str, Edge] = {}
+        for edge in edges:
+            unique.setdefault(edge.key, edge)
+        with self._lock:
+            if self._cache is not None:
+                edges = [edge for key, edge in unique.items() if key not in self._cache.edges_by_key]
+            else:
+                edges = list(unique.values())
+        if not edges:
+            return []
+        # The unique index settles races with other writers; only rows it accepted are cached
+        inserted = self.backend.insert_edges(edges)
+        if inserted:
+            self._apply(_Cache.add_edges, inserted)
+        return inserted
+
+    def existing_edge_keys(self, keys: Iterable[str]) -> Set[str]:
+        """Which of the given edge keys are stored: dictionary lookups on a loaded cache,
+        otherwise one indexed query, never a full edge scan."""
+        keys = list(keys)
+        with self._lock:
+            if self._cache is not None:
+                return {key for key in keys if key in self._cache.edges_by_key}
+        return self.backend.existing_edge_keys(keys) if keys else set()
+
+    def has_edge(self, source_id: str, target_id: str, edge_type: EdgeType = "related") -> bool:
+        key = edge_key(source_id, target_id, edge_type)
+        return key in self.existing_edge_keys([key])
 
     def get_edges(self) -> List[Edge]:
-        result = self.client.table("edges").select("*").execute()
-        return [self._row_to_edge(row) for row in result.data]
+        cache = self._loaded()
+        with self._lock:
+            return list(cache.edges.values())
+
+    def get_edges_for(self, paper_ids: Iterable[str]) -> List[Edge]:
+        """Edges touching any of the given papers, without scanning the whole edge list."""
+        cache = self._loaded()
+        with self._lock:
+            edge_ids = set()
+            for paper_id in paper_ids:
+                edge_ids.update(cache.edges_by_paper.get(paper_id, ()))
+            return [cache.edges[edge_id] for edge_id in sorted(edge_ids)]
 
     def get_graph_data(self) -> GraphData:
-        return GraphData(nodes=self.get_all_papers(), edges=self.get_edges())
+        return self.get_versioned_graph_data()[1]
+
+    def get_versioned_graph_data(self) -> Tuple[int, GraphData]:
+        """The graph together with the version it was read at."""
+        self._ensure_loaded()
+        with self._lock:
+            assert self._cache is not None
+            graph = GraphData(nodes=list(self._cache.papers.values()), edges=list(self._cache.edges.values()))
+            return self._version, graph
 
     def delete_edge(self, edge_id: str):
-        self.client.table("edges").delete().eq("id", edge_id).execute()
+        self.delete_edges([edge_id])
+
+    def delete_edges(self, edge_ids: Iterable[str]):
+        edge_ids = list(edge_ids)
+        if not edge_ids:
+            return
+        self.backend.delete_edges(edge_ids)
+        self._apply(_Cache.delete_edges, edge_ids)
 
     def delete_paper(self, paper_id: str):
-        self.client.table("edges").delete().eq("source_id", paper_id).execute()
-        self.client.table("edges").delete().eq("target_id", paper_id).execute()
-        self.client.table("papers").delete().eq("id", paper_id).execute()
+        self.backend.delete_paper(paper_id)
+        self._apply(_Cache.delete_paper, paper_id)
 
     def add_chat_message(self, role: Role, content: str):
-        self.client.table("chat_history").insert({"role": role, "content": content}).execute()
+        self.backend.add_chat_message(role, content)
 
     def get_chat_history(self) -> List[ChatMessage]:
-        result = self.client.table("chat_history").select("*").order("created_at").execute()
-        return [self._row_to_chat_message(row) for row in result.data]
+        return self.backend.chat_history()
 
-    def _row_to_chat_message(self, row: dict) -> ChatMessage:
-        return ChatMessage(
-            role=row["role"],
-            content=row["content"],
-            created_at=datetime.fromisoformat(row["created_at"].replace("Z", "+00:00")) if row.get("created_at") else None,
-        )
+    def get_chat_history_page(self, limit: int, after: Optional[str] = None) -> Tuple[List[ChatMessage], Optional[str]]:
+        """Oldest-first chat messages keyed on the serial id."""
+        return self.backend.chat_history_page(limit, after)
 
     def clear_chat_history(self):
-        self.client.table("chat_history").delete().not_.is_("id", "null").execute()
-
-    def _row_to_paper(self, row: dict) -> Paper:
-        references = [Reference(**r) for r in row.get("references") or []]
-        return Paper(
-            id=row["id"],
-            title=row["title"],
-            authors=row["authors"],
-            summary=row["summary"],
-            published=datetime.fromisoformat(row["published"].replace("Z", "+00:00")),
-            pdf_url=row["pdf_url"],
-            key_concepts=row.get("key_concepts", []),
-            references=references,
-        )
-
-    def _row_to_edge(self, row: dict) -> Edge:
-        return Edge(
-            id=row["id"],
-            source_id=row["source_id"],
-            target_id=row["target_id"],
-            created_at=datetime.fromisoformat(row["created_at"].replace("Z", "+00:00")) if row.get("created_at") else None,
-        )
+        self.backend.clear_chat_history()
 
 
 storage = Storage()
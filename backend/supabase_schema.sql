@@ -5,13 +5,19 @@ CREATE TABLE IF NOT EXISTS papers (
     summary TEXT,
     published TIMESTAMPTZ NOT NULL,
     pdf_url TEXT,
-    key_concepts TEXT[] DEFAULT '{}'
+    key_concepts TEXT[] DEFAULT '{}',
+    "references" JSONB DEFAULT '[]',
+    embedding REAL[],
+    created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
 CREATE TABLE IF NOT EXISTS edges (
     id TEXT PRIMARY KEY,
     source_id TEXT NOT NULL REFERENCES papers(id) ON DELETE CASCADE,
     target_id TEXT NOT NULL REFERENCES papers(id) ON DELETE CASCADE,
+    edge_type TEXT NOT NULL DEFAULT 'related',
+    -- Canonical identity (see models.edge_key): "related" endpoints sorted, "cites" kept in order
+    edge_key TEXT NOT NULL,
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -24,3 +30,32 @@ CREATE TABLE IF NOT EXISTS chat_history (
 
 CREATE INDEX IF NOT EXISTS idx_edges_source ON edges(source_id);
 CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target_id);
+
+-- Keyset pagination for GET /papers?limit=&after=
+CREATE INDEX IF NOT EXISTS idx_papers_created ON papers(created_at DESC, id DESC);
+
+-- Collections created before embeddings and edge types were stored
+ALTER TABLE papers ADD COLUMN IF NOT EXISTS embedding REAL[];
+
+-- Bulk embedding backfill: one call updates a whole chunk of [{"id": ..., "embedding": [...]}] rows
+CREATE OR REPLACE FUNCTION save_paper_embeddings(rows JSONB) RETURNS VOID LANGUAGE sql AS $$
+    UPDATE papers SET embedding = r.embedding
+    FROM jsonb_to_recordset(rows) AS r(id TEXT, embedding REAL[])
+    WHERE papers.id = r.id;
+$$;
+ALTER TABLE edges ADD COLUMN IF NOT EXISTS edge_type TEXT NOT NULL DEFAULT 'related';
+
+-- Collections created before edge keys: backfill with the same byte-wise ordering as Python,
+-- keep the oldest edge per key, then enforce uniqueness
+ALTER TABLE edges ADD COLUMN IF NOT EXISTS edge_key TEXT;
+UPDATE edges SET edge_key = CASE
+    WHEN edge_type = 'related' AND target_id COLLATE "C" < source_id COLLATE "C"
+        THEN edge_type || '|' || target_id || '|' || source_id
+    ELSE edge_type || '|' || source_id || '|' || target_id
+END
+WHERE edge_key IS NULL;
+DELETE FROM edges a USING edges b
+WHERE a.edge_key = b.edge_key
+  AND (COALESCE(a.created_at, 'infinity'), a.id) > (COALESCE(b.created_at, 'infinity'), b.id);
+ALTER TABLE edges ALTER COLUMN edge_key SET NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_edges_key ON edges(edge_key);
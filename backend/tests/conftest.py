@@ -11,6 +11,8 @@ os.environ.setdefault("TAVILY_API_KEY", "test-tavily-key")
 os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
 os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
 os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("JOBS_DB_PATH", ":memory:")
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -22,6 +24,7 @@ _mock_supabase.create_client = MagicMock(return_value=MagicMock())
 
 import pytest
 from models import Paper, Edge, GraphData
+from indexes import ConceptIndex
 
 
 @pytest.fixture
@@ -69,6 +72,7 @@ def mock_storage(sample_paper, sample_paper_2, sample_edge):
     mock.get_all_papers.return_value = list(papers.values())
     mock.get_edges.return_value = [sample_edge]
     mock.get_graph_data.return_value = GraphData(nodes=list(papers.values()), edges=[sample_edge])
+    mock.get_concept_index.return_value = ConceptIndex.from_papers(papers.values())
     mock.add_paper.side_effect = lambda paper: paper
     mock.add_edge.side_effect = lambda edge: edge
     return mock
@@ -81,6 +85,7 @@ def empty_storage():
     mock.get_all_papers.return_value = []
     mock.get_edges.return_value = []
     mock.get_graph_data.return_value = GraphData(nodes=[], edges=[])
+    mock.get_concept_index.return_value = ConceptIndex()
     mock.add_paper.side_effect = lambda paper: paper
     mock.add_edge.side_effect = lambda edge: edge
     return mock
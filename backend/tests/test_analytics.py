@@ -0,0 +1,170 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from models import Paper, Edge
+
+
+def _paper(paper_id, concepts=()):
+    return Paper(
+        id=paper_id, title=f"Paper {paper_id}", authors=["A"], summary="S",
+        published=datetime(2024, 1, 1), pdf_url="url", key_concepts=list(concepts)
+    )
+
+
+def _graph(n, pairs):
+    from analytics import _csr
+    src, dst = (np.array(column, dtype=np.int64) for column in zip(*pairs))
+    return _csr(n, src, dst)
+
+
+def _analytics(ids, pairs, **kwargs):
+    from analytics import GraphAnalytics
+    edges = [Edge(id=f"e{i}", source_id=a, target_id=b) for i, (a, b) in enumerate(pairs)]
+    return GraphAnalytics([_paper(i) for i in ids], edges, **kwargs)
+
+
+class TestAlgorithms:
+    def test_betweenness_matches_hand_counts(self):
+        from analytics import betweenness
+        # Path 0-1-2-3-4: node 1 sits on 3 of the 6 pairs it isn't part of, node 2 on 4
+        scores, exact = betweenness(*_graph(5, [(0, 1), (1, 2), (2, 3), (3, 4)]))
+        assert exact
+        assert scores == pytest.approx([0, 0.5, 4 / 6, 0.5, 0])
+
+        # Square: each corner carries half of the one pair opposite it
+        scores, _ = betweenness(*_graph(4, [(0, 1), (1, 2), (2, 3), (3, 0)]))
+        assert scores == pytest.approx([1 / 6] * 4)
+
+    def test_sampled_betweenness_ranks_the_bridge_first(self):
+        from analytics import betweenness
+        cliques = [(a, b) for base in (0, 10) for a in range(base, base + 10) for b in range(a + 1, base + 10)]
+        scores, exact = betweenness(*_graph(20, cliques + [(9, 10)]), samples=8)
+        assert not exact
+        assert set(np.argsort(-scores)[:2]) == {9, 10}
+
+    def test_pagerank_matches_dense_power_iteration(self):
+        from analytics import pagerank
+        src = np.array([0, 1, 2, 2, 3])
+        dst = np.array([1, 2, 0, 1, 2])
+        ranks = pagerank(5, src, dst, damping=0.85)
+
+        # Node 4 has no out-links, so its column spreads evenly
+        matrix = np.full((5, 5), 0.2)
+        matrix[:, :4] = 0
+        for s, d in zip(src, dst):
+            matrix[d, s] = 1 / np.sum(src == s)
+        expected = np.full(5, 0.2)
+        for _ in range(500):
+            expected = 0.15 / 5 + 0.85 * matrix @ expected
+        assert ranks == pytest.approx(expected, abs=1e-8)
+        assert ranks.sum() == pytest.approx(1.0)
+
+    def test_components_and_communities(self):
+        from analytics import connected_components, label_propagation, modularity
+        cliques = [(a, b) for base in (0, 5) for a in range(base, base + 5) for b in range(a + 1, base + 5)]
+        pairs = cliques + [(4, 5), (10, 11)]
+        indptr, indices = _graph(13, pairs)
+
+        components = connected_components(13, *(np.array(c) for c in zip(*pairs)))
+        assert len(set(components[:10])) == 1
+        assert components[10] == components[11] != components[0]
+        assert components[12] == 12
+
+        communities = label_propagation(indptr, indices)
+        assert len(set(communities[:5])) == 1 and len(set(communities[5:10])) == 1
+        assert communities[0] != communities[5]
+        assert modularity(indptr, indices, communities) > 0.4
+
+    def test_shortest_path(self):
+        from analytics import shortest_path
+        indptr, indices = _graph(6, [(0, 1), (1, 2), (2, 3), (0, 4), (4, 3)])
+        assert shortest_path(indptr, indices, 0, 3) == [0, 4, 3]
+        assert shortest_path(indptr, indices, 2, 2) == [2]
+        assert shortest_path(indptr, indices, 0, 5) is None
+
+
+class TestGraphAnalytics:
+    def test_summary_ranks_hubs_and_labels_communities(self):
+        from analytics import GraphAnalytics
+        papers = [_paper("hub", ["transformers"])] + [_paper(f"s{i}", ["transformers"]) for i in range(4)]
+        papers.append(_paper("lonely", ["biology"]))
+        edges = [Edge(id=f"e{i}", source_id=f"s{i}", target_id="hub") for i in range(4)]
+        edges.append(Edge(id="cite", source_id="s0", target_id="hub", edge_type="cites"))
+        edges.append(Edge(id="gone", source_id="hub", target_id="deleted-paper"))
+
+        summary = GraphAnalytics(papers, edges, version=7).summary(limit=3)
+
+        assert summary["version"] == 7
+        assert (summary["papers"], summary["edges"], summary["components"]) == (6, 4, 2)
+        assert summary["component_sizes"] == [5, 1]
+        assert [h["id"] for h in summary["hubs"]][0] == "hub"
+        assert summary["hubs"][0]["degree"] == 4
+        # On all 6 spoke pairs, out of the 10 pairs of other papers
+        assert summary["hubs"][0]["betweenness"] == pytest.approx(0.6)
+        assert summary["communities"][0]["size"] == 5
+        assert summary["communities"][0]["central_paper"] == "hub"
+        assert summary["communities"][0]["top_concepts"] == ["transformers"]
+
+    def test_citations_pass_rank_one_way(self):
+        from analytics import GraphAnalytics
+        edges = [Edge(id=f"e{i}", source_id=f"p{i}", target_id="classic", edge_type="cites") for i in range(3)]
+        analytics = GraphAnalytics([_paper("classic")] + [_paper(f"p{i}") for i in range(3)], edges)
+        ranks = {h["id"]: h["pagerank"] for h in analytics.summary(4)["hubs"]}
+        assert max(ranks, key=ranks.get) == "classic"
+        assert ranks["p0"] == pytest.approx(ranks["p1"])
+
+    def test_shortest_path_by_paper_id(self):
+        analytics = _analytics(["a", "b", "c", "d"], [("a", "b"), ("c", "b")])
+        assert analytics.shortest_path("a", "c") == ["a", "b", "c"]
+        assert analytics.shortest_path("a", "d") is None
+
+    def test_empty_collection(self):
+        summary = _analytics([], []).summary()
+        assert (summary["papers"], summary["edges"], summary["hubs"], summary["communities"]) == (0, 0, [], [])
+
+
+class TestAnalyticsCache:
+    @pytest.fixture
+    def store(self, tmp_path):
+        from storage import Storage
+        from backends.sqlite_backend import SQLiteBackend
+        store = Storage(backend=SQLiteBackend(str(tmp_path / "research.sqlite3")), cache_ttl_seconds=0)
+        store.add_papers([_paper("a"), _paper("b"), _paper("c")])
+        store.add_edge(Edge(id="e1", source_id="a", target_id="b"))
+        return store
+
+    def test_recomputes_only_after_the_graph_changes(self, store):
+        from analytics import AnalyticsCache
+        cache = AnalyticsCache(store)
+        first = cache.get()
+        assert cache.get() is first
+        assert first.summary()["edges"] == 1
+
+        store.add_edge(Edge(id="e2", source_id="b", target_id="c"))
+        second = cache.get()
+        assert second is not first
+        assert second.version == store.version
+        assert second.shortest_path("a", "c") == ["a", "b", "c"]
+
+    def test_unchanged_reload_keeps_the_analytics(self, tmp_path):
+        from unittest.mock import patch
+        from analytics import AnalyticsCache
+        from storage import Storage
+        from backends.sqlite_backend import SQLiteBackend
+        backend = SQLiteBackend(str(tmp_path / "research.sqlite3"))
+        store = Storage(backend=backend, cache_ttl_seconds=10)
+        cache = AnalyticsCache(store)
+        with patch("storage.time.monotonic", return_value=100.0):
+            store.add_papers([_paper("a"), _paper("b")])
+            first = cache.get()
+
+        # Expired, but the reload finds the same rows
+        with patch("storage.time.monotonic", return_value=111.0):
+            assert cache.get() is first
+
+        # Written by another process, and picked up by the next expired reload
+        backend.upsert_papers([_paper("c")])
+        with patch("storage.time.monotonic", return_value=122.0):
+            second = cache.get()
+        assert second is not first
+        assert second.summary()["papers"] == 3
@@ -1,6 +1,7 @@
 from unittest.mock import patch
 from datetime import datetime
-from models import Paper
+import pytest
+from models import Paper, Edge
 
 
 class TestAnswerAgent:
@@ -38,6 +39,23 @@ class TestAnswerAgent:
             assert result["response"] == "Answer"
 
 
+    def test_streams_tokens_when_config_has_sink(self):
+        with patch("agents.answer.storage") as mock_storage, \
+                patch("agents.answer.tavily") as mock_tavily, \
+                patch("agents.answer.invoke_bedrock_stream") as mock_stream:
+            mock_storage.get_all_papers.return_value = []
+            mock_storage.get_edges.return_value = []
+            mock_tavily.search.return_value = {"results": []}
+            mock_stream.return_value = "Streamed answer"
+
+            from agents.answer import answer_agent
+            sink = []
+            result = answer_agent({"user_message": "Q"}, {"configurable": {"on_token": sink.append}})
+
+            assert result["response"] == "Streamed answer"
+            assert mock_stream.call_args.args[1] == sink.append
+
+
 class TestBuildContext:
     def test_empty_papers(self):
         from agents.answer import build_papers_context
@@ -46,3 +64,83 @@ class TestBuildContext:
     def test_empty_edges(self):
         from agents.answer import build_edges_context
         assert "No connections" in build_edges_context([], [])
+
+
+@pytest.fixture
+def collection(tmp_path):
+    from storage import Storage
+    from backends.sqlite_backend import SQLiteBackend
+
+    def paper(paper_id, title, summary):
+        return Paper(
+            id=paper_id, title=title, authors=["A"], summary=summary,
+            published=datetime(2024, 1, 1), pdf_url="url", key_concepts=[]
+        )
+
+    store = Storage(backend=SQLiteBackend(str(tmp_path / "research.sqlite3")), cache_ttl_seconds=0)
+    store.add_papers([
+        paper("bert", "BERT", "Pre-training bidirectional transformer encoders for language understanding."),
+        paper("gpt3", "GPT-3", "Scaling autoregressive transformer language models enables few-shot learning."),
+        paper("resnet", "ResNet", "Residual connections make very deep convolutional image classifiers trainable."),
+        paper("alphafold", "AlphaFold", "Predicting protein structure from amino acid sequences."),
+        paper("dqn", "DQN", "Deep reinforcement learning agents playing Atari games from pixels."),
+    ])
+    store.add_edges([
+        Edge(id="e1", source_id="bert", target_id="gpt3"),
+        Edge(id="e2", source_id="gpt3", target_id="dqn"),
+        Edge(id="e3", source_id="resnet", target_id="alphafold"),
+    ])
+    with patch("agents.answer.storage", store):
+        yield store
+
+
+class TestRetrieveContext:
+    def test_ranks_relevant_papers_first(self, collection):
+        from agents.answer import retrieve_context
+        papers, _, _ = retrieve_context("How do transformer language models compare?", k=2)
+        assert {p.id for p in papers} == {"bert", "gpt3"}
+
+    def test_includes_one_hop_edges_only(self, collection):
+        from agents.answer import retrieve_context
+        papers, edges, titles = retrieve_context("protein structure prediction", k=1)
+
+        assert [p.id for p in papers] == ["alphafold"]
+        assert [e.id for e in edges] == ["e3"]
+        assert titles["resnet"] == "ResNet"
+
+    def test_respects_token_budget(self, collection):
+        from agents.answer import retrieve_context, estimate_tokens, format_paper
+        budget = estimate_tokens(format_paper(collection.get_paper("bert"))) + 1
+        papers, edges, _ = retrieve_context("bidirectional transformer encoders", k=5, token_budget=budget)
+
+        assert [p.id for p in papers] == ["bert"]
+        assert edges == []
+
+    def test_skips_papers_too_long_for_the_budget(self, collection):
+        from agents.answer import retrieve_context, estimate_tokens, format_paper
+        long_paper = collection.get_paper("gpt3").model_copy(update={"summary": "words " * 500})
+        short_paper = collection.get_paper("bert")
+        budget = estimate_tokens(format_paper(short_paper)) + 1
+        with patch("agents.answer.rank_papers", return_value=[long_paper, short_paper]):
+            papers, _, _ = retrieve_context("transformers", k=2, token_budget=budget)
+
+        assert [p.id for p in papers] == ["bert"]
+
+    def test_falls_back_to_newest_papers(self, collection):
+        from agents.answer import retrieve_context
+        papers, _, _ = retrieve_context("what is this?", k=2)
+        assert [p.id for p in papers] == [p.id for p in collection.get_all_papers()[:2]]
+
+    def test_prompt_leaves_out_unrelated_papers(self, collection):
+        with patch("agents.answer.tavily") as mock_tavily, patch("agents.answer.invoke_bedrock") as mock_bedrock, \
+                patch("agents.answer.ANSWER_TOP_K", 2):
+            mock_tavily.search.return_value = {"results": []}
+            mock_bedrock.return_value = "Answer"
+
+            from agents.answer import answer_agent
+            answer_agent({"user_message": "Which transformer language models are in my collection?"})
+
+        prompt = mock_bedrock.call_args.args[0]
+        assert "BERT" in prompt and "GPT-3" in prompt
+        assert "AlphaFold" not in prompt
+        assert "2 of 5 papers" in prompt
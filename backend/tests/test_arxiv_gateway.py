@@ -0,0 +1,117 @@
+import pytest
+import arxiv
+import requests
+from unittest.mock import MagicMock
+from agents.arxiv_gateway import ArxivGateway, TokenBucket, retry_after_seconds
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <opensearch:totalResults>1</opensearch:totalResults>
+  <opensearch:startIndex>0</opensearch:startIndex>
+  <opensearch:itemsPerPage>1</opensearch:itemsPerPage>
+  <entry>
+    <id>http://arxiv.org/abs/1706.03762v7</id>
+    <updated>2023-08-02T00:41:18Z</updated>
+    <published>2017-06-12T17:57:34Z</published>
+    <title>Attention Is All You Need</title>
+    <summary>Abstract</summary>
+    <author><name>Ashish Vaswani</name></author>
+    <link href="http://arxiv.org/pdf/1706.03762v7" rel="related" type="application/pdf" title="pdf"/>
+    <arxiv:primary_category term="cs.CL"/>
+    <category term="cs.CL"/>
+  </entry>
+</feed>"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _response(status, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+def _gateway(clock, max_retries=3):
+    gateway = ArxivGateway(rate_per_second=1 / 3, burst=1, max_retries=max_retries, backoff_seconds=1)
+    gateway.limiter = TokenBucket(1 / 3, 1, clock=clock, sleep=clock.sleep)
+    gateway.session = MagicMock()
+    return gateway
+
+
+class TestTokenBucket:
+    def test_spaces_requests_without_bursts(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=0.5, capacity=1, clock=clock, sleep=clock.sleep)
+
+        starts = []
+        for _ in range(4):
+            bucket.acquire()
+            starts.append(clock.now)
+
+        assert starts == [0.0, 2.0, 4.0, 6.0]
+
+    def test_pause_delays_next_token(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.pause(10)
+        assert bucket.reserve() == pytest.approx(10)
+
+
+class TestRetryAfter:
+    def test_parses_seconds_and_dates(self):
+        assert retry_after_seconds(_response(429, headers={"Retry-After": "7"})) == 7.0
+        assert retry_after_seconds(_response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+        assert retry_after_seconds(_response(429)) is None
+
+
+class TestArxivGateway:
+    def test_honors_retry_after_then_succeeds(self):
+        clock = FakeClock()
+        gateway = _gateway(clock)
+        gateway.session.get.side_effect = [
+            _response(429, headers={"Retry-After": "30"}),
+            _response(200, FEED),
+        ]
+
+        results = gateway.results(arxiv.Search(id_list=["1706.03762"], max_results=1))
+
+        assert [r.title for r in results] == ["Attention Is All You Need"]
+        assert clock.now == pytest.approx(30)
+        assert gateway.get_stats() == {"requests": 2, "retries": 1, "throttled": 1}
+
+    def test_gives_up_after_max_retries(self):
+        clock = FakeClock()
+        gateway = _gateway(clock, max_retries=2)
+        gateway.session.get.return_value = _response(503)
+
+        with pytest.raises(arxiv.HTTPError):
+            gateway.results(arxiv.Search(query="attention", max_results=5))
+        assert gateway.session.get.call_count == 3
+
+    def test_does_not_retry_client_errors(self):
+        gateway = _gateway(FakeClock())
+        gateway.session.get.return_value = _response(400)
+
+        with pytest.raises(arxiv.HTTPError):
+            gateway.results(arxiv.Search(query="attention", max_results=5))
+        assert gateway.session.get.call_count == 1
+
+    def test_requests_small_pages_for_small_searches(self):
+        gateway = _gateway(FakeClock())
+        gateway.session.get.return_value = _response(200, FEED)
+
+        gateway.results(arxiv.Search(query="attention", max_results=5))
+
+        assert "max_results=5" in gateway.session.get.call_args.args[0]
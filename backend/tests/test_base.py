@@ -0,0 +1,65 @@
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+
+def _converse_response(text):
+    return {"output": {"message": {"content": [{"text": text}]}}}
+
+
+class TestInvokeBedrock:
+    def test_returns_text(self):
+        with patch("agents.base.bedrock") as mock_bedrock:
+            mock_bedrock.converse.return_value = _converse_response("hello")
+
+            from agents.base import invoke_bedrock
+            assert invoke_bedrock("prompt", max_tokens=10, temperature=0) == "hello"
+
+            kwargs = mock_bedrock.converse.call_args.kwargs
+            assert kwargs["inferenceConfig"] == {"maxTokens": 10, "temperature": 0}
+
+    def test_bounds_in_flight_requests(self):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_converse(**kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return _converse_response("ok")
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = slow_converse
+
+        with patch("agents.base.bedrock", mock_bedrock), \
+                patch("agents.base._bedrock_slots", threading.BoundedSemaphore(2)):
+            from agents.base import invoke_bedrock
+            threads = [threading.Thread(target=invoke_bedrock, args=("p",)) for _ in range(6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert mock_bedrock.converse.call_count == 6
+        assert peak <= 2
+
+
+class TestInvokeBedrockStream:
+    def test_forwards_deltas_and_returns_full_text(self):
+        with patch("agents.base.bedrock") as mock_bedrock:
+            mock_bedrock.converse_stream.return_value = {"stream": [
+                {"messageStart": {"role": "assistant"}},
+                {"contentBlockDelta": {"delta": {"text": "Hel"}}},
+                {"contentBlockDelta": {"delta": {"text": "lo"}}},
+                {"messageStop": {"stopReason": "end_turn"}},
+            ]}
+
+            from agents.base import invoke_bedrock_stream
+            tokens = []
+            assert invoke_bedrock_stream("p", tokens.append) == "Hello"
+            assert tokens == ["Hel", "lo"]
@@ -0,0 +1,105 @@
+from unittest.mock import patch, MagicMock
+from datetime import datetime
+from models import Paper
+
+
+def _paper(paper_id):
+    return Paper(
+        id=paper_id, title=f"Paper {paper_id}", authors=["A"], summary="S",
+        published=datetime(2024, 1, 1), pdf_url="url", key_concepts=["c"]
+    )
+
+
+def _result(short_id):
+    result = MagicMock()
+    result.get_short_id.return_value = short_id
+    return result
+
+
+class TestIngestBatch:
+    def test_dedupes_fetches_and_links_once(self):
+        with patch("agents.batch.storage") as mock_storage, \
+                patch("agents.batch.fetch_arxiv_metadata") as mock_metadata, \
+                patch("agents.batch.build_paper") as mock_build, \
+                patch("agents.batch.connection_agent") as mock_connect:
+            mock_storage.get_all_papers.return_value = [_paper("2401.00001v1")]
+            mock_metadata.return_value = {"2401.00002": _result("2401.00002v1"), "2401.00003": _result("2401.00003v2")}
+            mock_build.side_effect = lambda result: _paper(result.get_short_id())
+            mock_connect.return_value = {"connection_edges": [MagicMock()]}
+
+            from agents.batch import ingest_batch
+            response = ingest_batch([
+                "https://arxiv.org/abs/2401.00001",
+                "2401.00002",
+                "https://arxiv.org/pdf/2401.00002v1",
+                "2401.00003",
+                "2401.00004",
+                "not an id",
+            ])
+
+            mock_metadata.assert_called_once_with(["2401.00002", "2401.00003", "2401.00004"])
+            assert response.skipped == ["2401.00001"]
+            assert response.invalid == ["not an id"]
+            assert sorted(response.added) == ["2401.00002v1", "2401.00003v2"]
+            assert response.failed == {"2401.00004": "Paper not found"}
+            assert response.edges_created == 1
+            mock_storage.add_papers.assert_called_once()
+            mock_connect.assert_called_once()
+
+    def test_records_enrichment_failures(self):
+        with patch("agents.batch.storage") as mock_storage, \
+                patch("agents.batch.fetch_arxiv_metadata") as mock_metadata, \
+                patch("agents.batch.build_paper") as mock_build, \
+                patch("agents.batch.connection_agent") as mock_connect:
+            mock_storage.get_all_papers.return_value = []
+            mock_metadata.return_value = {"2401.00002": _result("2401.00002v1")}
+            mock_build.side_effect = RuntimeError("bedrock down")
+
+            from agents.batch import ingest_batch
+            response = ingest_batch(["2401.00002"])
+
+            assert response.failed == {"2401.00002": "bedrock down"}
+            mock_storage.add_papers.assert_not_called()
+            mock_connect.assert_not_called()
+
+
+    def test_reports_progress_per_paper(self):
+        with patch("agents.batch.storage") as mock_storage, \
+                patch("agents.batch.fetch_arxiv_metadata") as mock_metadata, \
+                patch("agents.batch.build_paper") as mock_build, \
+                patch("agents.batch.connection_agent") as mock_connect:
+            mock_storage.get_all_papers.return_value = []
+            mock_metadata.return_value = {"2401.00002": _result("2401.00002v1"), "2401.00003": _result("2401.00003v1")}
+            mock_build.side_effect = lambda result: _paper(result.get_short_id())
+            mock_connect.return_value = {"connection_edges": []}
+
+            from agents.batch import ingest_batch
+            stages = []
+            ingest_batch(["2401.00002", "2401.00003"], progress=stages.append)
+
+            assert stages == ["fetch", "build 1/2", "build 2/2", "store", "connect"]
+
+    def test_results_keep_input_order(self):
+        import time
+        with patch("agents.batch.storage") as mock_storage, \
+                patch("agents.batch.fetch_arxiv_metadata") as mock_metadata, \
+                patch("agents.batch.build_paper") as mock_build, \
+                patch("agents.batch.connection_agent") as mock_connect:
+            ids = ["2401.00003", "2401.00002", "2401.00001"]
+            mock_storage.get_all_papers.return_value = []
+            mock_metadata.return_value = {i: _result(f"{i}v1") for i in ids}
+
+            def build(result):
+                # The first paper finishes last
+                short_id = result.get_short_id()
+                time.sleep(0.05 if short_id.startswith(ids[0]) else 0)
+                return _paper(short_id)
+
+            mock_build.side_effect = build
+            mock_connect.return_value = {"connection_edges": []}
+
+            from agents.batch import ingest_batch
+            response = ingest_batch(ids, max_workers=3)
+
+            assert response.added == [f"{i}v1" for i in ids]
+            assert [p.id for p in mock_storage.add_papers.call_args.args[0]] == response.added
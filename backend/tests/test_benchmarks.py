@@ -0,0 +1,52 @@
+import os
+from unittest.mock import patch
+
+
+def _import_run():
+    # benchmarks.run sets env defaults on import; keep them out of the rest of the session
+    with patch.dict(os.environ):
+        from benchmarks import run
+    return run
+
+
+class TestBenchmarkHarness:
+    def test_runs_every_scenario_against_fakes(self):
+        run = _import_run()
+        from benchmarks.fakes import LatencyProfile
+        profiles = {name: LatencyProfile() for name in ("bedrock", "tavily", "arxiv", "pdf", "storage")}
+
+        report = run.run_benchmarks(
+            sizes=[10], iterations=2, warmup=0, budget_seconds=5, profiles=profiles,
+            intents=["add_paper", "find_connections", "crawl"],
+        )
+
+        scenarios = [r["scenario"] for r in report["results"]]
+        assert scenarios == [
+            "pipeline:add_paper", "pipeline:find_connections", "pipeline:crawl",
+            "POST /papers/select", "GET /graph/cytoscape",
+        ]
+        assert all(r["errors"] == 0 and r["iterations"] == 2 for r in report["results"])
+
+    def test_stops_before_a_run_that_would_overrun_the_budget(self):
+        import time
+        run = _import_run()
+        calls = []
+
+        def slow(i):
+            calls.append(i)
+            time.sleep(0.05)
+
+        result = run.measure("slow", 10, slow, iterations=10, warmup=1, budget_seconds=0.17)
+        # Warmup and two runs fit; a third would end past the budget
+        assert calls == [-1, 0, 1]
+        assert result["iterations"] == 2
+
+    def test_percentiles_and_regressions(self):
+        run = _import_run()
+        assert run.percentile([0.1, 0.2, 0.3, 0.4], 50) == 0.2
+        assert run.percentile([0.1, 0.2, 0.3, 0.4], 99) == 0.4
+
+        baseline = {"results": [{"scenario": "s", "size": 10, "p95_ms": 100.0}]}
+        current = {"results": [{"scenario": "s", "size": 10, "p95_ms": 130.0}]}
+        assert run.find_regressions(current, baseline, tolerance=0.25)[0]["p95_ms"] == 130.0
+        assert run.find_regressions(current, baseline, tolerance=0.5) == []
@@ -1,6 +1,7 @@
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 from models import Paper
+from indexes import ConceptIndex
 
 
 class TestConnectionAgent:
@@ -26,11 +27,13 @@ class TestConnectionAgent:
             )
             mock_storage.get_all_papers.return_value = [paper1, paper2]
             mock_storage.get_edges.return_value = []
+            mock_storage.get_concept_index.return_value = ConceptIndex.from_papers([paper1, paper2])
             mock_storage.add_edge.side_effect = lambda e: e
 
             from agents.connection import connection_agent
             result = connection_agent({"papers_added": [paper1]})
             assert len(result["connection_edges"]) == 1
+            mock_storage.add_edges.assert_called_once_with(result["connection_edges"])
 
     def test_no_shared_concepts(self):
         with patch("agents.connection.storage") as mock_storage:
@@ -46,7 +49,97 @@ class TestConnectionAgent:
             )
             mock_storage.get_all_papers.return_value = [paper1, paper2]
             mock_storage.get_edges.return_value = []
+            mock_storage.get_concept_index.return_value = ConceptIndex.from_papers([paper1, paper2])
 
             from agents.connection import connection_agent
             result = connection_agent({"papers_added": [paper1]})
             assert result["connection_edges"] == []
+
+    def test_matches_pairwise_scan(self):
+        import random
+        from itertools import combinations
+        from agents.connection import connection_agent, has_shared_concepts
+
+        rng = random.Random(7)
+        vocabulary = ["Transformers", "attention", "RL", "graphs", "Vision", "nlp", "diffusion"]
+        papers = [
+            Paper(
+                id=f"p{i}", title=f"Paper {i}", authors=["A"], summary="S",
+                published=datetime(2024, 1, 1), pdf_url="url",
+                key_concepts=[c if rng.random() < 0.5 else c.lower() for c in rng.sample(vocabulary, 2)]
+            )
+            for i in range(30)
+        ]
+        expected = {(a.id, b.id) for a, b in combinations(papers, 2) if has_shared_concepts(a, b)}
+
+        with patch("agents.connection.storage") as mock_storage:
+            mock_storage.get_all_papers.return_value = papers
+            mock_storage.get_edges.return_value = []
+            mock_storage.get_concept_index.return_value = ConceptIndex.from_papers(papers)
+
+            result = connection_agent({"papers_added": [], "intent": "find_connections"})
+
+        assert {(e.source_id, e.target_id) for e in result["connection_edges"]} == expected
+
+    def test_connects_semantic_neighbors_without_shared_concepts(self):
+        paper1 = Paper(
+            id="paper1", title="Paper One", authors=["A"], summary="S",
+            published=datetime(2024, 1, 1), pdf_url="url", key_concepts=["llm"]
+        )
+        paper2 = Paper(
+            id="paper2", title="Paper Two", authors=["B"], summary="S",
+            published=datetime(2024, 1, 2), pdf_url="url", key_concepts=["large language models"]
+        )
+        with patch("agents.connection.storage") as mock_storage:
+            mock_storage.get_all_papers.return_value = [paper1, paper2]
+            mock_storage.get_edges.return_value = []
+            mock_storage.get_concept_index.return_value = ConceptIndex.from_papers([paper1, paper2])
+            semantic_index = mock_storage.get_semantic_index.return_value
+            semantic_index.neighbors.return_value = {"paper2": [("paper1", 0.8)], "paper1": []}
+
+            from agents.connection import connection_agent
+            result = connection_agent({"papers_added": [], "intent": "find_connections"})
+
+        # The later paper's neighbour is flipped into collection order
+        assert [(e.source_id, e.target_id) for e in result["connection_edges"]] == [("paper1", "paper2")]
+        assert "1 from similar abstracts" in result["connection_message"]
+        semantic_index.neighbors.assert_called_once()
+
+
+class TestLinkCitations:
+    def _paper(self, paper_id, *cited):
+        from models import Reference
+        return Paper(
+            id=paper_id, title=paper_id, authors=["A"], summary="S",
+            published=datetime(2024, 1, 1), pdf_url="url",
+            references=[Reference(title=c, arxiv_id=c) for c in cited]
+        )
+
+    def test_links_cited_and_citing_papers(self):
+        from indexes import ReferenceIndex
+        from models import Edge
+        transformer = self._paper("1706.03762")
+        survey = self._paper("2108.07258", "1810.04805")
+        bert = self._paper("1810.04805", "1706.03762")
+        existing = Edge(id="old", source_id="1810.04805", target_id="1706.03762", edge_type="cites")
+
+        with patch("agents.connection.storage") as mock_storage:
+            mock_storage.get_reference_index.return_value = ReferenceIndex.from_papers([transformer, survey, bert])
+            mock_storage.existing_edge_keys.side_effect = lambda keys: {existing.key} & set(keys)
+            mock_storage.add_edges.side_effect = lambda edges: edges
+
+            from agents.connection import link_citations
+            edges = link_citations([bert])
+
+        # bert -> transformer already exists; the survey citing bert is new
+        assert [(e.source_id, e.target_id, e.edge_type) for e in edges] == [("2108.07258", "1810.04805", "cites")]
+
+    def test_no_references_skips_storage_writes(self):
+        from indexes import ReferenceIndex
+        paper = self._paper("1706.03762")
+        with patch("agents.connection.storage") as mock_storage:
+            mock_storage.get_reference_index.return_value = ReferenceIndex.from_papers([paper])
+
+            from agents.connection import link_citations
+            assert link_citations([paper]) == []
+            mock_storage.add_edges.assert_not_called()
@@ -1,4 +1,5 @@
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import patch, MagicMock
 
 
 class TestRouteByIntent:
@@ -36,3 +37,26 @@ class TestCreateWorkflow:
         # create_workflow returns StateGraph, compile() gives the runnable app
         compiled = workflow.compile()
         assert hasattr(compiled, "invoke")
+
+
+class TestAstreamPipeline:
+    def test_emits_intent_nodes_tokens_and_result(self):
+        class FakeApp:
+            async def astream(self, state, config=None, stream_mode=None):
+                yield "updates", {"router": {"intent": "question"}}
+                config["configurable"]["on_token"]("Hi")
+                await asyncio.sleep(0)
+                yield "updates", {"answer": {"response": "Hi"}}
+                yield "values", {**state, "final_response": "Hi"}
+
+        async def collect():
+            from graph import astream_pipeline
+            return [event async for event in astream_pipeline("hello")]
+
+        with patch("graph.app", FakeApp()):
+            events = asyncio.run(collect())
+
+        assert [name for name, _ in events] == ["intent", "node", "token", "node", "result"]
+        assert events[0][1] == {"intent": "question"}
+        assert events[2][1] == {"text": "Hi"}
+        assert events[-1][1]["final_response"] == "Hi"
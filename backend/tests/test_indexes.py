@@ -0,0 +1,201 @@
+import pytest
+from datetime import datetime
+from models import Paper
+
+
+def _paper(paper_id, concepts):
+    return Paper(
+        id=paper_id, title=paper_id, authors=["A"], summary="S",
+        published=datetime(2024, 1, 1), pdf_url="url", key_concepts=concepts
+    )
+
+
+class TestConceptIndex:
+    def test_matches_case_insensitively(self):
+        from indexes import ConceptIndex
+        index = ConceptIndex.from_papers([_paper("a", ["Transformers"]), _paper("b", ["transformers", "nlp"])])
+        assert index.matches(_paper("a", ["Transformers"])) == {"b"}
+
+    def test_excludes_self_and_unrelated(self):
+        from indexes import ConceptIndex
+        index = ConceptIndex.from_papers([_paper("a", ["rl"]), _paper("b", ["vision"])])
+        assert index.matches(_paper("a", ["rl"])) == set()
+
+    def test_incremental_updates(self):
+        from indexes import ConceptIndex
+        index = ConceptIndex.from_papers([_paper("a", ["rl"])])
+        index.add(_paper("b", ["rl"]))
+        assert index.matches(_paper("new", ["rl"])) == {"a", "b"}
+
+        index.add(_paper("b", ["vision"]))
+        assert index.matches(_paper("new", ["rl"])) == {"a"}
+
+        index.remove("a")
+        assert index.matches(_paper("new", ["rl"])) == set()
+        assert len(index) == 1
+
+
+def _text_paper(paper_id, title, summary):
+    return Paper(
+        id=paper_id, title=title, authors=["A"], summary=summary,
+        published=datetime(2024, 1, 1), pdf_url="url", key_concepts=[]
+    )
+
+
+class TestHashingEmbedder:
+    def test_normalized_and_deterministic(self):
+        import numpy as np
+        from indexes import HashingEmbedder
+        embedder = HashingEmbedder(dim=64)
+        first = embedder.embed(["Attention is all you need", ""])
+        again = embedder.embed(["Attention is all you need"])
+        assert first.shape == (2, 64)
+        assert np.isclose(np.linalg.norm(first[0]), 1.0)
+        assert not first[1].any()
+        assert np.array_equal(first[0], again[0])
+
+    def test_related_texts_score_higher(self):
+        from indexes import HashingEmbedder
+        a, b, c = HashingEmbedder().embed([
+            "Transformer language models pre-trained on unlabeled text",
+            "Pre-training a transformer language model on unlabeled text corpora",
+            "Protein structure prediction from amino acid sequences",
+        ])
+        assert a @ b > a @ c
+
+
+class TestBruteForceIndex:
+    def test_matches_exact_cosine_ranking(self):
+        import numpy as np
+        from indexes import BruteForceIndex
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(300, 16)).astype(np.float32)
+        queries = rng.normal(size=(5, 16)).astype(np.float32)
+        index = BruteForceIndex(16)
+        index.add([f"v{i}" for i in range(300)], vectors)
+
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        for query, hits in zip(queries, index.search(queries, 4)):
+            expected = np.argsort(-(unit @ (query / np.linalg.norm(query))))[:4]
+            assert [item_id for item_id, _ in hits] == [f"v{i}" for i in expected]
+            assert [s for _, s in hits] == sorted((s for _, s in hits), reverse=True)
+
+    def test_replace_and_remove(self):
+        import numpy as np
+        from indexes import BruteForceIndex
+        index = BruteForceIndex(2)
+        index.add(["a", "b", "c"], np.array([[1, 0], [0, 1], [1, 1]], dtype=np.float32))
+        index.add(["a"], np.array([[0, 1]], dtype=np.float32))
+        index.remove("b")
+        index.remove("missing")
+
+        assert len(index) == 2
+        hits = index.search(np.array([[0, 1]], dtype=np.float32), 5)[0]
+        assert [item_id for item_id, _ in hits] == ["a", "c"]
+        assert hits[0][1] == pytest.approx(1.0)
+
+    def test_unknown_backend(self):
+        from indexes import create_vector_index
+        with pytest.raises(ValueError):
+            create_vector_index("annoy", 8)
+
+
+class TestSemanticIndex:
+    def _index(self, papers):
+        from indexes import HashingEmbedder, SemanticIndex
+        index = SemanticIndex(HashingEmbedder(), "bruteforce")
+        index.rebuild(papers)
+        return index
+
+    def test_neighbors_apply_threshold_and_skip_self(self):
+        papers = [
+            _text_paper("bert", "BERT", "Pre-training deep bidirectional transformer encoders for language understanding"),
+            _text_paper("roberta", "RoBERTa", "A robustly optimized approach to pre-training transformer encoders for language understanding"),
+            _text_paper("alphafold", "AlphaFold", "Highly accurate protein structure prediction from amino acid sequences"),
+        ]
+        index = self._index(papers)
+
+        found = index.neighbors(papers[:1], k=5, threshold=0.2)
+        assert [other for other, _ in found["bert"]] == ["roberta"]
+
+    def test_follows_adds_and_removes(self):
+        index = self._index([_text_paper("a", "Graph neural networks", "Message passing on molecular graphs")])
+        probe = _text_paper("probe", "Graph neural networks", "Message passing on molecular graphs")
+        index.add(_text_paper("b", "Graph neural networks", "Message passing networks on molecular graphs"))
+        assert {other for other, _ in index.neighbors([probe], 5, 0.5)["probe"]} == {"a", "b"}
+
+        index.remove("a")
+        assert [other for other, _ in index.neighbors([probe], 5, 0.5)["probe"]] == ["b"]
+
+    def test_embeds_only_papers_without_a_vector(self):
+        from unittest.mock import MagicMock
+        from indexes import SemanticIndex
+        import numpy as np
+        embedder = MagicMock(dim=4)
+        embedder.embed.return_value = np.ones((1, 4), dtype=np.float32)
+        stored = _text_paper("stored", "T", "S")
+        stored.embedding = [0.5, 0.5, 0.5, 0.5]
+        stale = _text_paper("stale", "T", "S")
+        stale.embedding = [1.0, 0.0]
+
+        assert SemanticIndex(embedder, "bruteforce").embed_missing([stored, stale]) == [stale]
+        assert stale.embedding == [1.0, 1.0, 1.0, 1.0]
+
+
+class TestReferenceIndex:
+    def _cites(self, paper_id, *arxiv_ids):
+        from models import Reference
+        paper = _paper(paper_id, [])
+        paper.references = [Reference(title=f"Ref {a}", arxiv_id=a) for a in arxiv_ids]
+        return paper
+
+    def test_resolves_both_directions_across_versions(self):
+        from indexes import ReferenceIndex
+        transformer = _paper("1706.03762v7", [])
+        bert = self._cites("1810.04805v2", "arXiv:1706.03762v5", "9999.00001")
+        index = ReferenceIndex.from_papers([transformer, bert])
+
+        assert index.cites(bert) == {"1706.03762v7"}
+        assert index.cited_by(transformer) == {"1810.04805v2"}
+        assert index.cited_by(bert) == set()
+
+    def test_follows_adds_and_removes(self):
+        from indexes import ReferenceIndex
+        index = ReferenceIndex.from_papers([self._cites("citing", "1706.03762")])
+        cited = _paper("1706.03762", [])
+        assert index.cited_by(cited) == {"citing"}
+
+        index.add(self._cites("citing", "1810.04805"))
+        assert index.cited_by(cited) == set()
+
+        index.add(cited)
+        index.remove(cited.id)
+        assert index.cites(self._cites("new", "1706.03762")) == set()
+        assert len(index) == 1
+
+
+class TestTitleIndex:
+    def test_ranks_fuzzy_matches(self):
+        from indexes import TitleIndex
+        index = TitleIndex.from_papers([
+            _paper("attention", []).model_copy(update={"title": "Attention Is All You Need"}),
+            _paper("resnet", []).model_copy(update={"title": "Deep Residual Learning for Image Recognition"}),
+        ])
+
+        best, score = index.search("Atention is all we need!", k=1)[0]
+        assert best == "attention" and score > 0.7
+        assert index.search("attention", k=2)[0][0] == "attention"
+        assert index.search("quantum chromodynamics", min_score=0.5) == []
+        assert index.search("  ") == []
+
+    def test_follows_adds_and_removes(self):
+        from indexes import TitleIndex
+        index = TitleIndex()
+        index.add(_paper("p1", []).model_copy(update={"title": "Graph Attention Networks"}))
+        index.add(_paper("p1", []).model_copy(update={"title": "Neural Ordinary Differential Equations"}))
+        assert index.search("graph attention", min_score=0.5) == []
+        assert index.search("neural ODEs")[0][0] == "p1"
+
+        index.remove("p1")
+        assert index.search("neural ordinary differential equations") == []
+        assert len(index) == 0
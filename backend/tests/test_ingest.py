@@ -1,3 +1,6 @@
+import time
+import pytest
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 
 
@@ -41,6 +44,50 @@ class TestExtractReferencesFromPdf:
             assert len(refs) == 10
 
 
+class TestFetchPaperFromArxiv:
+    def _arxiv_result(self):
+        author = MagicMock()
+        author.name = "Vaswani"
+        result = MagicMock()
+        result.get_short_id.return_value = "1706.03762v7"
+        result.title = "Attention Is All You Need"
+        result.summary = "Abstract"
+        result.authors = [author]
+        result.published = datetime(2017, 6, 12)
+        result.pdf_url = "https://arxiv.org/pdf/1706.03762v7"
+        return result
+
+    def test_runs_enrichment_stages_concurrently(self):
+        def slow_concepts(title, abstract):
+            time.sleep(0.1)
+            return ["attention"]
+
+        def slow_references(pdf_url, timings=None):
+            time.sleep(0.1)
+            return []
+
+        with patch("agents.ingest.arxiv_gateway") as mock_gateway, \
+                patch("agents.ingest.extract_key_concepts", side_effect=slow_concepts), \
+                patch("agents.ingest.extract_references_from_pdf", side_effect=slow_references):
+            mock_gateway.results.return_value = [self._arxiv_result()]
+
+            from agents.ingest import fetch_paper_from_arxiv
+            timings = {}
+            paper = fetch_paper_from_arxiv("1706.03762", timings=timings)
+
+        assert paper.key_concepts == ["attention"]
+        assert {"metadata", "concepts", "references", "total"} <= set(timings)
+        assert timings["total"] < 0.18
+
+    def test_missing_paper_raises(self):
+        with patch("agents.ingest.arxiv_gateway") as mock_gateway:
+            mock_gateway.results.return_value = []
+
+            from agents.ingest import fetch_paper_from_arxiv
+            with pytest.raises(ValueError):
+                fetch_paper_from_arxiv("0000.00000")
+
+
 class TestIngestAgent:
     def test_ingest_with_arxiv_id(self):
         with patch("agents.ingest.storage") as mock_storage, \
@@ -93,14 +140,35 @@ class TestIngestAgent:
             assert len(result["paper_candidates"]) > 0
 
 
+    def test_ingest_by_name_finds_paper_already_in_collection(self, sample_paper):
+        from indexes import TitleIndex
+        with patch("agents.ingest.invoke_bedrock") as mock_bedrock, \
+                patch("agents.ingest.search_arxiv_by_name") as mock_search, \
+                patch("agents.ingest.storage") as mock_storage:
+            mock_bedrock.return_value = "attention is all you need"
+            mock_storage.get_title_index.return_value = TitleIndex.from_papers([sample_paper])
+            mock_storage.get_paper.side_effect = {sample_paper.id: sample_paper}.get
+
+            from agents.ingest import ingest_agent
+            result = ingest_agent({"user_message": "Add the attention is all you need paper", "arxiv_id": None})
+
+            assert result["papers_added"] == [sample_paper]
+            assert "already in your collection" in result["response"]
+            mock_search.assert_not_called()
+
+
 class TestSearchPapersAgent:
     def test_search_returns_candidates(self):
         with patch("agents.ingest.invoke_bedrock") as mock_bedrock, \
                 patch("agents.ingest.tavily") as mock_tavily, \
-                patch("agents.ingest.search_arxiv_by_name") as mock_arxiv:
+                patch("agents.ingest.fetch_arxiv_metadata") as mock_arxiv:
             mock_bedrock.return_value = "ML"
             mock_tavily.search.return_value = {
-                "results": [{"url": "https://arxiv.org/abs/2401.00001", "title": "Paper"}]
+                "results": [
+                    {"url": "https://arxiv.org/abs/2401.00001", "title": "Paper"},
+                    {"url": "https://arxiv.org/pdf/2401.00001v1", "title": "Paper"},
+                    {"url": "https://arxiv.org/abs/2401.00002", "title": "Tavily Title"},
+                ]
             }
 
             mock_author = MagicMock()
@@ -111,9 +179,14 @@ class TestSearchPapersAgent:
             mock_result.title = "Paper"
             mock_result.authors = [mock_author]
             mock_result.published.year = 2024
-            mock_arxiv.return_value = [mock_result]
+            mock_arxiv.return_value = {"2401.00001": mock_result}
 
             from agents.ingest import search_papers_agent
             result = search_papers_agent({"user_message": "Search ML"})
 
-            assert len(result["paper_candidates"]) > 0
+            mock_arxiv.assert_called_once_with(["2401.00001", "2401.00002"])
+            candidates = result["paper_candidates"]
+            assert [c.arxiv_id for c in candidates] == ["2401.00001", "2401.00002"]
+            assert candidates[0].authors == ["Author"]
+            assert candidates[1].title == "Tavily Title"
+            assert candidates[1].year == 0
@@ -0,0 +1,99 @@
+from agents.intent import classify_intent, evaluate_fast_path, IntentMetrics
+
+# Hand-labeled chat messages, including ambiguous ones the fast path should leave to the LLM
+LABELED_MESSAGES = [
+    ("crawl https://example.edu/~smith/publications", "crawl"),
+    ("Can you crawl https://lab.example.org for papers on RL?", "crawl"),
+    ("map https://arxiv.org/list/cs.LG/recent", "map"),
+    ("Map out the site https://papers.example.com", "map"),
+    ("extract https://blog.example.com/transformers-explained", "extract"),
+    ("Summarize https://openai.com/research/gpt-4", "extract"),
+    ("find papers related to Attention Is All You Need", "find_related"),
+    ("What papers cite BERT?", "find_related"),
+    ("Show me work similar to ResNet", "find_related"),
+    ("find connections", "find_connections"),
+    ("Find connections between my papers", "find_connections"),
+    ("How are my papers related?", "find_connections"),
+    ("search for papers on diffusion models", "search_paper"),
+    ("Find papers about graph neural networks", "search_paper"),
+    ("Look up papers on retrieval augmented generation", "search_paper"),
+    ("add the attention is all you need paper", "add_paper"),
+    ("Please add the original GAN paper", "add_paper"),
+    ("What is the main contribution of the transformer paper?", "question"),
+    ("Explain how self-attention works", "question"),
+    ("Why do residual connections help training?", "question"),
+    ("Compare BERT and GPT pretraining objectives", "question"),
+    ("transformers", "search_paper"),
+    ("I want Vaswani et al. 2017", "add_paper"),
+    ("https://example.com/paper-list", "map"),
+    ("crawl https://example.edu and find papers related to it", "crawl"),
+    ("anything new on protein folding lately", "search_paper"),
+    ("What papers in my collection are related to reinforcement learning?", "question"),
+    ("Which of my papers build on BERT?", "question"),
+    ("What are the latest papers on diffusion models?", "search_paper"),
+    ("what papers should I read next on diffusion", "search_paper"),
+    ("What is attention? Also add the BERT paper", "add_paper"),
+]
+
+
+class TestClassifyIntent:
+    def test_url_task_needs_url(self):
+        assert classify_intent("crawl https://example.edu/lab") == ("crawl", 0.95)
+        intent, confidence = classify_intent("crawl the web for me")
+        assert intent == "crawl" and confidence < 0.8
+
+    def test_competing_intents_lower_confidence(self):
+        intent, confidence = classify_intent("crawl https://example.edu and find papers related to it")
+        assert intent == "crawl"
+        assert confidence < 0.8
+
+    def test_no_match(self):
+        assert classify_intent("transformers") == (None, 0.0)
+
+    def test_question_is_fallback_only(self):
+        assert classify_intent("Explain self-attention")[0] == "question"
+        assert classify_intent("What papers cite BERT?")[0] == "find_related"
+
+    def test_questions_asking_for_papers_are_not_confident(self):
+        assert classify_intent("What is self-attention?") == ("question", 0.8)
+        for message in ("what papers should I read next on diffusion", "What is attention? Also add the BERT paper"):
+            intent, confidence = classify_intent(message)
+            assert confidence < 0.8, message
+        assert classify_intent("What are the latest papers on diffusion models?") == ("search_paper", 0.85)
+
+    def test_related_phrases_in_questions_are_not_confident(self):
+        intent, confidence = classify_intent("Which of my papers build on BERT?")
+        assert confidence < 0.8
+        assert classify_intent("Show me papers that build on BERT") == ("find_related", 0.9)
+
+
+class TestEvaluateFastPath:
+    def test_labeled_sample_set(self):
+        report = evaluate_fast_path(LABELED_MESSAGES)
+
+        assert report["samples"] == len(LABELED_MESSAGES)
+        assert report["precision"] == 1.0, report["mistakes"]
+        # Several samples are mixed or ambiguous on purpose and should reach the LLM
+        assert report["hit_rate"] >= 0.7
+
+    def test_disagreement_against_llm(self):
+        llm = lambda message: "question"
+        report = evaluate_fast_path([("find connections", "find_connections"), ("Explain attention", "question")], llm)
+        assert report["disagreement_rate"] == 0.5
+
+
+class TestIntentMetrics:
+    def test_hit_and_disagreement_rates(self):
+        metrics = IntentMetrics()
+        metrics.record_fast_path("crawl")
+        metrics.record_fast_path("crawl")
+        metrics.record_llm(None, "question")
+        metrics.record_llm("map", "extract")
+        metrics.record_llm("crawl", "crawl", shadow=True)
+
+        stats = metrics.get_stats()
+        assert stats["messages"] == 4
+        assert stats["hit_rate"] == 0.5
+        assert stats["llm_calls"] == 3
+        assert stats["disagreement_rate"] == 0.5
+        assert stats["fast_path_intents"] == {"crawl": 2}
@@ -0,0 +1,79 @@
+import time
+import pytest
+
+
+def _wait_for(manager, job_id, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.status in ("succeeded", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def store(tmp_path):
+    from jobs import JobStore
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+class TestJobManager:
+    def test_runs_handler_and_records_stages(self, store):
+        from jobs import JobManager
+
+        def handler(payload, job):
+            job.stage("fetch")
+            job.timings["fetch"] = 0.5
+            return {"echo": payload["value"]}
+
+        manager = JobManager(store, max_workers=1)
+        manager.register("echo", handler)
+        job = manager.submit("echo", {"value": 42})
+        assert job.status == "pending"
+
+        finished = _wait_for(manager, job.id)
+        assert finished.status == "succeeded"
+        assert finished.result == {"echo": 42}
+        assert finished.timings == {"fetch": 0.5}
+
+    def test_failures_are_recorded(self, store):
+        from jobs import JobManager
+
+        def handler(payload, job):
+            raise RuntimeError("arXiv unavailable")
+
+        manager = JobManager(store, max_workers=1)
+        manager.register("boom", handler)
+        finished = _wait_for(manager, manager.submit("boom", {}).id)
+
+        assert finished.status == "failed"
+        assert finished.error == "arXiv unavailable"
+
+    def test_unknown_kind_rejected(self, store):
+        from jobs import JobManager
+        with pytest.raises(ValueError):
+            JobManager(store).submit("nope", {})
+
+
+class TestJobPersistence:
+    def test_resume_runs_jobs_left_by_previous_process(self, tmp_path):
+        from jobs import JobStore, JobManager
+        path = str(tmp_path / "jobs.sqlite3")
+
+        pending = JobStore(path).create("echo", {"value": 1})
+        interrupted = JobStore(path).create("echo", {"value": 2})
+        JobStore(path).claim(interrupted.id)
+
+        manager = JobManager(JobStore(path), max_workers=1)
+        manager.register("echo", lambda payload, job: {"echo": payload["value"]})
+        resumed = manager.resume()
+
+        assert set(resumed) == {pending.id, interrupted.id}
+        assert _wait_for(manager, pending.id).result == {"echo": 1}
+        assert _wait_for(manager, interrupted.id).result == {"echo": 2}
+
+    def test_claim_is_exclusive(self, store):
+        job = store.create("echo", {})
+        assert store.claim(job.id) is True
+        assert store.claim(job.id) is False
@@ -0,0 +1,85 @@
+from unittest.mock import patch, MagicMock
+
+
+def _make_cache(tmp_path, **overrides):
+    from agents.llm_cache import LLMCache
+    options = {"ttl_seconds": 3600, "max_entries": 100, "memory_entries": 10}
+    options.update(overrides)
+    return LLMCache(str(tmp_path / "llm.sqlite3"), **options)
+
+
+class TestLLMCache:
+    def test_miss_then_memory_hit(self, tmp_path):
+        cache = _make_cache(tmp_path)
+        assert cache.get("k") is None
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+
+    def test_disk_hit_after_restart(self, tmp_path):
+        _make_cache(tmp_path).set("k", "v")
+        cache = _make_cache(tmp_path)
+        assert cache.get("k") == "v"
+        assert cache.get_stats()["disk_hits"] == 1
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        cache = _make_cache(tmp_path, ttl_seconds=10)
+        with patch("agents.llm_cache.time.time", return_value=1000.0):
+            cache.set("k", "v")
+        with patch("agents.llm_cache.time.time", return_value=1011.0):
+            assert cache.get("k") is None
+
+    def test_evicts_least_recently_used_on_disk(self, tmp_path):
+        cache = _make_cache(tmp_path, max_entries=2, memory_entries=1)
+        with patch("agents.llm_cache.time.time", return_value=1.0):
+            cache.set("a", "1")
+        with patch("agents.llm_cache.time.time", return_value=2.0):
+            cache.set("b", "2")
+        with patch("agents.llm_cache.time.time", return_value=3.0):
+            cache.set("c", "3")
+        restarted = _make_cache(tmp_path, max_entries=2)
+        with patch("agents.llm_cache.time.time", return_value=4.0):
+            assert restarted.get("a") is None
+            assert restarted.get("c") == "3"
+
+    def test_key_includes_all_parameters(self):
+        from agents.llm_cache import make_key
+        base = make_key("m", "p", 100, 0)
+        assert base == make_key("m", "p", 100, 0)
+        assert base != make_key("m", "p", 200, 0)
+        assert base != make_key("other", "p", 100, 0)
+        assert base != make_key("m", "p", 100, 0, attachment=b"pdf")
+
+
+class TestInvokeBedrockCaching:
+    def _response(self, text):
+        return {"output": {"message": {"content": [{"text": text}]}}}
+
+    def test_deterministic_calls_are_cached(self, tmp_path):
+        cache = _make_cache(tmp_path)
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = self._response("search_paper")
+
+        with patch("agents.base.bedrock", mock_bedrock), \
+                patch("agents.llm_cache.llm_cache", cache):
+            from agents.base import invoke_bedrock
+            assert invoke_bedrock("route this", max_tokens=20, temperature=0) == "search_paper"
+            assert invoke_bedrock("route this", max_tokens=20, temperature=0) == "search_paper"
+
+        assert mock_bedrock.converse.call_count == 1
+
+    def test_sampled_calls_bypass_cache(self, tmp_path):
+        cache = _make_cache(tmp_path)
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = self._response("answer")
+
+        with patch("agents.base.bedrock", mock_bedrock), \
+                patch("agents.llm_cache.llm_cache", cache):
+            from agents.base import invoke_bedrock
+            invoke_bedrock("question", temperature=0.7)
+            invoke_bedrock("question", temperature=0.7)
+
+        assert mock_bedrock.converse.call_count == 2
+        assert cache.get_stats()["bypassed"] == 2
@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from metrics import Histogram, instrument_node, external_call_seconds
+
+
+class TestHistogram:
+    def test_renders_prometheus_text(self):
+        histogram = Histogram("test_seconds", "Test latency.", ["node", "outcome"], buckets=[0.1, 1.0])
+        histogram.observe(0.05, node="router", outcome="ok")
+        histogram.observe(0.5, node="router", outcome="ok")
+
+        text = histogram.render()
+
+        assert "# TYPE test_seconds histogram" in text
+        assert 'test_seconds_bucket{node="router",outcome="ok",le="0.1"} 1' in text
+        assert 'test_seconds_bucket{node="router",outcome="ok",le="1.0"} 2' in text
+        assert 'test_seconds_bucket{node="router",outcome="ok",le="+Inf"} 2' in text
+        assert 'test_seconds_count{node="router",outcome="ok"} 2' in text
+        assert 'test_seconds_sum{node="router",outcome="ok"} 0.55' in text
+
+    def test_time_labels_errors(self):
+        histogram = Histogram("test_seconds", "Test latency.", ["service", "outcome"])
+        with pytest.raises(RuntimeError):
+            with histogram.time(service="tavily"):
+                raise RuntimeError("boom")
+        assert histogram.count(service="tavily", outcome="error") == 1
+
+
+class TestInstrumentation:
+    def test_node_wrapper_keeps_signature(self):
+        import inspect
+        from metrics import node_seconds
+
+        def node(state, config=None):
+            return {"seen": config}
+
+        wrapped = instrument_node("test_node", node)
+        assert "config" in inspect.signature(wrapped).parameters
+        before = node_seconds.count(node="test_node", outcome="ok")
+        assert wrapped({}, config={"a": 1}) == {"seen": {"a": 1}}
+        assert node_seconds.count(node="test_node", outcome="ok") == before + 1
+
+    def test_storage_backend_calls_are_timed(self, tmp_path):
+        from backends.sqlite_backend import SQLiteBackend
+        backend = SQLiteBackend(str(tmp_path / "db.sqlite3"))
+        before = external_call_seconds.count(service="sqlite", operation="load_papers", outcome="ok")
+        backend.load_papers()
+        assert external_call_seconds.count(service="sqlite", operation="load_papers", outcome="ok") == before + 1
+
+    def test_bedrock_calls_are_timed(self):
+        with patch("agents.base.bedrock") as mock_bedrock:
+            mock_bedrock.converse.side_effect = RuntimeError("throttled")
+            from agents.base import invoke_bedrock
+            before = external_call_seconds.count(service="bedrock", operation="converse", outcome="error")
+            with pytest.raises(RuntimeError):
+                invoke_bedrock("p")
+            assert external_call_seconds.count(service="bedrock", operation="converse", outcome="error") == before + 1
+
+
+class TestRunPipelineMetrics:
+    def test_records_intent_and_outcome(self):
+        from metrics import pipeline_seconds
+        fake_app = MagicMock()
+        fake_app.invoke.return_value = {"intent": "crawl", "error": "site unreachable"}
+
+        with patch("graph.app", fake_app):
+            from graph import run_pipeline
+            before = pipeline_seconds.count(intent="crawl", outcome="error")
+            run_pipeline("crawl https://example.edu")
+
+        assert pipeline_seconds.count(intent="crawl", outcome="error") == before + 1
@@ -2,6 +2,13 @@
 from unittest.mock import patch
 from datetime import datetime
 from models import Paper
+from indexes import TitleIndex
+
+
+def _collection(mock_storage, papers):
+    by_id = {p.id: p for p in papers}
+    mock_storage.get_paper.side_effect = by_id.get
+    mock_storage.get_title_index.return_value = TitleIndex.from_papers(papers)
 
 
 class TestFindRelatedAgent:
@@ -10,7 +17,7 @@ class TestFindRelatedAgent:
                 patch("agents.related.storage") as mock_storage, \
                 patch("agents.related.tavily") as mock_tavily:
             mock_bedrock.return_value = "attention"
-            mock_storage.get_all_papers.return_value = []
+            _collection(mock_storage, [])
             mock_tavily.search.return_value = {
                 "results": [{"url": "https://arxiv.org/abs/2401.00001", "title": "Related"}]
             }
@@ -30,7 +37,7 @@ class TestFindRelatedAgent:
                 published=datetime(2024, 1, 1), pdf_url="url", key_concepts=[]
             )
             mock_bedrock.return_value = "topic"
-            mock_storage.get_all_papers.return_value = [existing]
+            _collection(mock_storage, [existing])
             mock_tavily.search.return_value = {
                 "results": [
                     {"url": "https://arxiv.org/abs/2401.00001", "title": "Existing"},
@@ -50,7 +57,7 @@ class TestFindRelatedAgent:
                 patch("agents.related.storage") as mock_storage, \
                 patch("agents.related.tavily") as mock_tavily:
             mock_bedrock.return_value = "topic"
-            mock_storage.get_all_papers.return_value = []
+            _collection(mock_storage, [])
             mock_tavily.search.return_value = {"results": []}
 
             from agents.related import find_related_agent
@@ -58,3 +65,27 @@ class TestFindRelatedAgent:
 
             assert result["paper_candidates"] == []
             assert "No related papers" in result["response"]
+
+    def test_fuzzy_title_match_sets_source_paper(self):
+        with patch("agents.related.invoke_bedrock") as mock_bedrock, \
+                patch("agents.related.storage") as mock_storage, \
+                patch("agents.related.tavily") as mock_tavily:
+            source = Paper(
+                id="1706.03762", title="Attention Is All You Need", authors=["A"], summary="S",
+                published=datetime(2017, 6, 12), pdf_url="url", key_concepts=[]
+            )
+            other = Paper(
+                id="1512.03385", title="Deep Residual Learning for Image Recognition", authors=["B"], summary="S",
+                published=datetime(2015, 12, 10), pdf_url="url", key_concepts=[]
+            )
+            mock_bedrock.return_value = "atention is all we need"
+            _collection(mock_storage, [source, other])
+            mock_tavily.search.return_value = {
+                "results": [{"url": "https://arxiv.org/abs/2401.00002", "title": "New"}]
+            }
+
+            from agents.related import find_related_agent
+            result = find_related_agent({"user_message": "Find papers related to atention is all we need"})
+
+            assert result["paper_candidates"][0].source_paper_id == "1706.03762"
+            assert "Attention Is All You Need" in mock_tavily.search.call_args.kwargs["query"]
@@ -30,3 +30,29 @@ class TestRouterAgent:
             from agents.router import router_agent
             result = router_agent({"user_message": "Something"})
             assert result["intent"] == "question"
+
+    def test_obvious_intent_skips_llm(self):
+        with patch("agents.router.invoke_bedrock") as mock:
+            from agents.router import router_agent
+            result = router_agent({"user_message": "crawl https://example.edu/~smith/papers"})
+            assert result["intent"] == "crawl"
+            mock.assert_not_called()
+
+    def test_ambiguous_message_uses_llm_and_records_disagreement(self):
+        with patch("agents.router.invoke_bedrock") as mock, \
+                patch("agents.router.intent_metrics") as mock_metrics:
+            mock.return_value = "find_related"
+            from agents.router import router_agent
+            result = router_agent({"user_message": "crawl https://example.edu and find papers related to it"})
+            assert result["intent"] == "find_related"
+            mock_metrics.record_llm.assert_called_once_with("crawl", "find_related")
+
+    def test_shadow_sample_checks_fast_path_against_llm(self):
+        with patch("agents.router.invoke_bedrock") as mock, \
+                patch("agents.router.ROUTER_SHADOW_SAMPLE_RATE", 1.0), \
+                patch("agents.router.intent_metrics") as mock_metrics:
+            mock.return_value = "map"
+            from agents.router import router_agent
+            result = router_agent({"user_message": "crawl https://example.edu/lab"})
+            assert result["intent"] == "crawl"
+            mock_metrics.record_llm.assert_called_once_with("crawl", "map", shadow=True)
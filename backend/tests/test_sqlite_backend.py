@@ -0,0 +1,251 @@
+import pytest
+from datetime import datetime
+from models import Paper, Edge, Reference
+
+
+def _paper(paper_id, concepts=("c",)):
+    return Paper(
+        id=paper_id, title=f"Paper {paper_id}", authors=["A", "B"], summary="S",
+        published=datetime(2024, 1, 1), pdf_url="url", key_concepts=list(concepts),
+        references=[Reference(title="Ref", arxiv_id="1706.03762")]
+    )
+
+
+@pytest.fixture
+def backend(tmp_path):
+    from backends.sqlite_backend import SQLiteBackend
+    return SQLiteBackend(str(tmp_path / "research.sqlite3"))
+
+
+class TestSQLiteBackend:
+    def test_uses_wal_and_indexes(self, backend):
+        assert backend._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[0] for row in backend._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_edges_source", "idx_edges_target", "idx_papers_created"} <= indexes
+
+    def test_round_trips_papers(self, backend):
+        backend.upsert_papers([_paper("p1")])
+        backend.upsert_papers([_paper("p1", concepts=["updated"])])
+
+        papers = backend.load_papers()
+        assert len(papers) == 1
+        assert papers[0].key_concepts == ["updated"]
+        assert papers[0].references[0].arxiv_id == "1706.03762"
+
+    def test_delete_paper_removes_edges(self, backend):
+        backend.upsert_papers([_paper("p1"), _paper("p2"), _paper("p3")])
+        backend.insert_edges([
+            Edge(id="e1", source_id="p1", target_id="p2"),
+            Edge(id="e2", source_id="p3", target_id="p1"),
+            Edge(id="e3", source_id="p2", target_id="p3"),
+        ])
+
+        backend.delete_paper("p1")
+
+        assert [e.id for e in backend.load_edges()] == ["e3"]
+        assert {p.id for p in backend.load_papers()} == {"p2", "p3"}
+
+    def test_papers_page_walks_whole_collection(self, backend):
+        backend.upsert_papers([_paper(f"p{i}") for i in range(5)])
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = backend.papers_page(2, cursor, light=True)
+            seen.extend(p.id for p in page)
+            if not cursor:
+                break
+
+        assert sorted(seen) == [f"p{i}" for i in range(5)]
+        assert len(seen) == 5
+        assert not hasattr(page[0], "summary")
+
+    def test_chat_history_pages(self, backend):
+        for i in range(3):
+            backend.add_chat_message("user", f"m{i}")
+
+        first, cursor = backend.chat_history_page(2, None)
+        second, last_cursor = backend.chat_history_page(2, cursor)
+
+        assert [m.content for m in first + second] == ["m0", "m1", "m2"]
+        assert last_cursor is None
+
+        backend.clear_chat_history()
+        assert backend.chat_history() == []
+
+
+    def test_round_trips_embeddings(self, backend):
+        paper = _paper("p1")
+        paper.embedding = [0.5, -0.25, 1.0]
+        backend.upsert_papers([paper])
+        # Re-upserting without a vector keeps the stored one
+        backend.upsert_papers([_paper("p1")])
+
+        assert backend.load_embeddings() == {"p1": [0.5, -0.25, 1.0]}
+        # Papers load without their vectors
+        assert backend.load_papers()[0].embedding is None
+
+    def test_adds_embedding_column_to_existing_database(self, tmp_path):
+        import sqlite3
+        from backends.sqlite_backend import SQLiteBackend
+        path = str(tmp_path / "old.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE papers (id TEXT PRIMARY KEY, title TEXT NOT NULL, authors TEXT NOT NULL DEFAULT '[]', "
+            "summary TEXT, published TEXT NOT NULL, pdf_url TEXT, key_concepts TEXT NOT NULL DEFAULT '[]', "
+            "\"references\" TEXT NOT NULL DEFAULT '[]', created_at TEXT NOT NULL DEFAULT '2024-01-01T00:00:00Z')"
+        )
+        conn.execute(
+            "INSERT INTO papers (id, title, summary, published, pdf_url) VALUES ('old', 'Old', 'S', '2024-01-01', 'url')"
+        )
+        conn.commit()
+        conn.close()
+
+        backend = SQLiteBackend(path)
+        assert [p.id for p in backend.load_papers()] == ["old"]
+        assert backend.load_embeddings() == {}
+
+
+    def test_round_trips_edge_types(self, backend):
+        backend.upsert_papers([_paper("p1"), _paper("p2")])
+        backend.insert_edges([
+            Edge(id="e1", source_id="p1", target_id="p2"),
+            Edge(id="e2", source_id="p2", target_id="p1", edge_type="cites"),
+        ])
+        assert {e.id: e.edge_type for e in backend.load_edges()} == {"e1": "related", "e2": "cites"}
+
+
+    def test_edge_keys_are_unique(self, backend):
+        backend.upsert_papers([_paper("p1"), _paper("p2")])
+        first = Edge(id="e1", source_id="p1", target_id="p2")
+
+        assert backend.insert_edges([first]) == [first]
+        assert backend.insert_edges([first, Edge(id="e2", source_id="p2", target_id="p1")]) == []
+        assert backend.existing_edge_keys(["related|p1|p2", "cites|p1|p2"]) == {"related|p1|p2"}
+        assert [e.id for e in backend.load_edges()] == ["e1"]
+
+    def test_backfills_edge_keys_and_drops_duplicates(self, tmp_path):
+        import sqlite3
+        from backends.sqlite_backend import SQLiteBackend
+        path = str(tmp_path / "old.sqlite3")
+        SQLiteBackend(path).upsert_papers([_paper("p1"), _paper("p2")])
+        conn = sqlite3.connect(path)
+        conn.execute("DROP INDEX idx_edges_key")
+        conn.execute("ALTER TABLE edges DROP COLUMN edge_key")
+        conn.executemany(
+            "INSERT INTO edges (id, source_id, target_id, edge_type, created_at) VALUES (?, ?, ?, ?, ?)",
+            [("a", "p1", "p2", "related", "2024-01-01"), ("b", "p2", "p1", "related", "2024-01-02"),
+             ("c", "p2", "p1", "cites", "2024-01-03")],
+        )
+        conn.commit()
+        conn.close()
+
+        backend = SQLiteBackend(path)
+        assert sorted(e.id for e in backend.load_edges()) == ["a", "c"]
+        assert backend.insert_edges([Edge(id="d", source_id="p2", target_id="p1")]) == []
+
+
+class TestStorageOnSQLite:
+    def test_storage_cache_over_sqlite(self, backend):
+        from storage import Storage
+        store = Storage(backend=backend, cache_ttl_seconds=0)
+        store.add_papers([_paper("p1", ["rl"]), _paper("p2", ["rl"])])
+        store.add_edge(Edge(id="e1", source_id="p1", target_id="p2"))
+
+        restarted = Storage(backend=backend, cache_ttl_seconds=0)
+        assert {p.id for p in restarted.get_all_papers()} == {"p1", "p2"}
+        assert [e.id for e in restarted.get_edges()] == ["e1"]
+        assert restarted.get_concept_index().matches(_paper("new", ["rl"])) == {"p1", "p2"}
+
+    def test_papers_are_embedded_once_when_stored(self, backend):
+        from storage import Storage
+        store = Storage(backend=backend, cache_ttl_seconds=0)
+        store.add_paper(_paper("p1"))
+
+        stored = backend.load_embeddings()["p1"]
+        assert len(stored) == store.get_semantic_index().embedder.dim
+        assert len(store.get_semantic_index()) == 1
+        # The vector is held by the semantic index, not the cached paper
+        assert store.get_paper("p1").embedding is None
+
+    def test_reload_saves_backfilled_embeddings(self, backend):
+        from unittest.mock import patch
+        from storage import Storage
+        # Stored directly, as papers were before embeddings existed
+        backend.upsert_papers([_paper("p1"), _paper("p2")])
+        store = Storage(backend=backend, cache_ttl_seconds=0)
+
+        assert len(store.get_semantic_index()) == 2
+        assert set(backend.load_embeddings()) == {"p1", "p2"}
+        assert all(paper.embedding is None for paper in store.get_all_papers())
+
+        with patch.object(type(store._embedder), "embed") as embed:
+            store.invalidate()
+            store.get_all_papers()
+            restarted = Storage(backend=backend, cache_ttl_seconds=0)
+            assert len(restarted.get_semantic_index()) == 2
+        embed.assert_not_called()
+
+    def test_reload_bumps_version_only_on_changes(self, backend):
+        from unittest.mock import patch
+        from storage import Storage
+        store = Storage(backend=backend, cache_ttl_seconds=10)
+        with patch("storage.time.monotonic", return_value=100.0):
+            store.add_papers([_paper("p1"), _paper("p2")])
+            store.get_all_papers()
+            version = store.version
+        with patch("storage.time.monotonic", return_value=111.0):
+            store.get_all_papers()
+        assert store.version == version
+
+        # A write from another worker shows up at the next expiry
+        backend.upsert_papers([_paper("p3")])
+        with patch("storage.time.monotonic", return_value=122.0):
+            assert {p.id for p in store.get_all_papers()} == {"p1", "p2", "p3"}
+        assert store.version > version
+
+    def test_refresh_runs_without_blocking_readers_or_losing_writes(self, backend):
+        import threading
+        from unittest.mock import patch
+        from storage import Storage
+        store = Storage(backend=backend, cache_ttl_seconds=10)
+        with patch("storage.time.monotonic", return_value=100.0):
+            store.add_papers([_paper("p1"), _paper("p2")])
+            store.get_all_papers()
+
+        loading, release = threading.Event(), threading.Event()
+        load_papers = backend.load_papers
+
+        def slow_load_papers():
+            loading.set()
+            release.wait(5)
+            return load_papers()
+
+        with patch("storage.time.monotonic", return_value=111.0), \
+                patch.object(backend, "load_papers", slow_load_papers):
+            refresher = threading.Thread(target=store.get_all_papers)
+            refresher.start()
+            assert loading.wait(5)
+            # The old cache keeps serving, and writes go through while the refresh is loading
+            assert {p.id for p in store.get_all_papers()} == {"p1", "p2"}
+            store.add_edge(Edge(id="e1", source_id="p1", target_id="p2"))
+            store.add_papers([_paper("p3")])
+            release.set()
+            refresher.join(5)
+
+        assert {p.id for p in store.get_all_papers()} == {"p1", "p2", "p3"}
+        assert [e.id for e in store.get_edges()] == ["e1"]
+        assert store.has_edge("p2", "p1")
+
+
+class TestCreateBackend:
+    def test_selects_sqlite(self, tmp_path):
+        from unittest.mock import patch
+        with patch("backends.SQLITE_PATH", str(tmp_path / "db.sqlite3")):
+            from backends import create_backend
+            from backends.sqlite_backend import SQLiteBackend
+            assert isinstance(create_backend("sqlite"), SQLiteBackend)
+
+    def test_rejects_unknown(self):
+        from backends import create_backend
+        with pytest.raises(ValueError):
+            create_backend("mongo")
@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Generous enough for a cold CI runner; today's cost is dominated by fastapi + langgraph (~1.2s)
+IMPORT_BUDGET_SECONDS = 3.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+from agents.base import bedrock
+from agents.tavily_gateway import tavily
+from storage import storage
+from jobs import job_manager
+print(json.dumps({
+    "seconds": elapsed,
+    "modules": [m for m in ("boto3", "tavily", "supabase") if m in sys.modules],
+    "bedrock": bedrock.created,
+    "tavily": tavily.client.created,
+    "storage": storage._backend is not None,
+    "jobs_db": job_manager.store._db is not None,
+}))
+"""
+
+
+def _run(code: str, env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+                          timeout=60)
+
+
+class TestStartup:
+    def test_import_is_lazy_and_within_budget(self, tmp_path):
+        env = {
+            "PATH": os.environ.get("PATH", ""),
+            "TAVILY_API_KEY": "x", "AWS_ACCESS_KEY_ID": "x", "AWS_SECRET_ACCESS_KEY": "x",
+            "STORAGE_BACKEND": "sqlite",
+            "SQLITE_PATH": str(tmp_path / "research.sqlite3"),
+            "JOBS_DB_PATH": str(tmp_path / "jobs.sqlite3"),
+            "LLM_CACHE_ENABLED": "false",
+        }
+        result = _run(_PROBE, env)
+        assert result.returncode == 0, result.stderr
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+
+        assert probe["modules"] == []
+        assert not any(probe[name] for name in ("bedrock", "tavily", "storage", "jobs_db"))
+        assert list(tmp_path.iterdir()) == []
+        assert probe["seconds"] < IMPORT_BUDGET_SECONDS
+
+    def test_models_import_without_credentials(self, tmp_path):
+        result = _run("import models, config", {"PATH": os.environ.get("PATH", "")})
+        assert result.returncode == 0, result.stderr
+
+
+class TestValidateConfig:
+    def test_missing_credentials_fail_at_startup(self):
+        import config
+        with patch.object(config, "TAVILY_API_KEY", None):
+            with pytest.raises(ValueError, match="TAVILY_API_KEY"):
+                config.validate_config()
+
+    def test_sqlite_needs_no_supabase_settings(self):
+        import config
+        with patch.object(config, "STORAGE_BACKEND", "sqlite"), patch.object(config, "SUPABASE_URL", None):
+            config.validate_config()
+
+
+class TestLazyClient:
+    def test_builds_once_on_first_use(self):
+        from lazy import LazyClient
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return {"ready": True}
+
+        client = LazyClient(factory)
+        assert not client.created
+        assert client.get() is client.get()
+        assert list(client.keys()) == ["ready"]
+        assert client.created and len(calls) == 1
@@ -0,0 +1,215 @@
+from unittest.mock import patch, MagicMock
+import pytest
+from models import Edge
+
+
+def _paper_row(paper_id, title="Paper"):
+    return {
+        "id": paper_id,
+        "title": title,
+        "authors": ["A"],
+        "summary": "S",
+        "published": "2024-01-01T00:00:00+00:00",
+        "pdf_url": "url",
+        "key_concepts": ["c"],
+        "references": [],
+    }
+
+
+@pytest.fixture
+def supabase_client():
+    tables = {"papers": MagicMock(), "edges": MagicMock(), "chat_history": MagicMock()}
+    tables["papers"].select.return_value.order.return_value.execute.return_value.data = [
+        _paper_row("p2", "Second"), _paper_row("p1", "First"),
+    ]
+    tables["edges"].select.return_value.execute.return_value.data = [
+        {"id": "e1", "source_id": "p1", "target_id": "p2"},
+    ]
+    # ignore_duplicates upserts echo back only the inserted rows; here every row is new
+    tables["edges"].upsert.side_effect = lambda rows, **kwargs: MagicMock(execute=lambda: MagicMock(data=rows))
+    client = MagicMock()
+    client.table.side_effect = lambda name: tables[name]
+    client.tables = tables
+    return client
+
+
+@pytest.fixture
+def cached_storage(supabase_client):
+    from storage import Storage
+    from backends.supabase_backend import SupabaseBackend
+    return Storage(backend=SupabaseBackend(supabase_client), cache_ttl_seconds=0)
+
+
+class TestStorageCache:
+    def test_reads_hit_backend_once(self, cached_storage, supabase_client):
+        assert [p.id for p in cached_storage.get_all_papers()] == ["p2", "p1"]
+        cached_storage.get_all_papers()
+        cached_storage.get_edges()
+        assert cached_storage.get_paper("p1").title == "First"
+
+        assert supabase_client.tables["papers"].select.return_value.order.call_count == 1
+        assert supabase_client.tables["edges"].select.call_count == 1
+
+    def test_add_paper_updates_cache_in_place(self, cached_storage, sample_paper):
+        cached_storage.get_all_papers()
+        version = cached_storage.version
+
+        cached_storage.add_paper(sample_paper)
+
+        assert cached_storage.get_all_papers()[0].id == sample_paper.id
+        assert cached_storage.version > version
+
+    def test_delete_paper_drops_its_edges(self, cached_storage):
+        cached_storage.get_edges()
+        cached_storage.delete_paper("p1")
+
+        assert cached_storage.get_paper("p1") is None
+        assert cached_storage.get_edges() == []
+
+    def test_edge_writes_update_cache(self, cached_storage):
+        cached_storage.get_edges()
+        cached_storage.add_edge(Edge(id="e2", source_id="p2", target_id="p1", edge_type="cites"))
+        assert {e.id for e in cached_storage.get_edges()} == {"e1", "e2"}
+
+        cached_storage.delete_edge("e1")
+        assert [e.id for e in cached_storage.get_edges()] == ["e2"]
+
+    def test_edge_keys_ignore_related_direction(self, cached_storage, supabase_client):
+        cached_storage.get_edges()
+
+        assert cached_storage.add_edge(Edge(id="e2", source_id="p2", target_id="p1")) is None
+        assert cached_storage.has_edge("p2", "p1")
+        assert not cached_storage.has_edge("p2", "p1", "cites")
+        supabase_client.tables["edges"].upsert.assert_not_called()
+
+    def test_existence_check_before_load_uses_key_index(self, cached_storage, supabase_client):
+        lookup = supabase_client.tables["edges"].select.return_value.in_
+        lookup.return_value.execute.return_value.data = [{"edge_key": "related|p1|p2"}]
+
+        assert cached_storage.has_edge("p2", "p1")
+        lookup.assert_called_once_with("edge_key", ["related|p1|p2"])
+        supabase_client.tables["papers"].select.assert_not_called()
+
+    def test_invalidate_forces_reload(self, cached_storage, supabase_client):
+        cached_storage.get_all_papers()
+        cached_storage.invalidate()
+        cached_storage.get_all_papers()
+        assert supabase_client.tables["papers"].select.return_value.order.call_count == 2
+
+    def test_expired_cache_reloads(self, supabase_client):
+        from storage import Storage
+        from backends.supabase_backend import SupabaseBackend
+        store = Storage(backend=SupabaseBackend(supabase_client), cache_ttl_seconds=10)
+        with patch("storage.time.monotonic", return_value=100.0):
+            store.get_all_papers()
+        with patch("storage.time.monotonic", return_value=111.0):
+            store.get_all_papers()
+        assert supabase_client.tables["papers"].select.return_value.order.call_count == 2
+
+
+class TestStorageBulkWrites:
+    def test_add_edges_sends_chunked_upserts(self, supabase_client):
+        from storage import Storage
+        from backends.supabase_backend import SupabaseBackend
+        store = Storage(backend=SupabaseBackend(supabase_client, batch_size=2), cache_ttl_seconds=0)
+        store.get_edges()
+
+        edges = [Edge(id=f"n{i}", source_id="p1", target_id=f"q{i}") for i in range(5)]
+        store.add_edges(edges)
+
+        upserts = supabase_client.tables["edges"].upsert.call_args_list
+        assert [len(c.args[0]) for c in upserts] == [2, 2, 1]
+        assert len(store.get_edges()) == 6
+
+    def test_save_embeddings_sends_chunked_rpc_calls(self, supabase_client):
+        from backends.supabase_backend import SupabaseBackend
+        backend = SupabaseBackend(supabase_client, batch_size=2)
+        backend.save_embeddings({f"p{i}": [float(i)] for i in range(5)})
+
+        calls = supabase_client.rpc.call_args_list
+        assert [c.args[0] for c in calls] == ["save_paper_embeddings"] * 3
+        assert calls[0].args[1] == {"rows": [{"id": "p0", "embedding": [0.0]}, {"id": "p1", "embedding": [1.0]}]}
+        supabase_client.tables["papers"].update.assert_not_called()
+
+    def test_add_papers_puts_new_papers_first(self, cached_storage, supabase_client, sample_paper, sample_paper_2):
+        cached_storage.get_all_papers()
+        cached_storage.add_papers([sample_paper, sample_paper_2])
+
+        ids = [p.id for p in cached_storage.get_all_papers()]
+        assert ids[:2] == [sample_paper_2.id, sample_paper.id]
+        assert supabase_client.tables["papers"].upsert.call_count == 1
+
+    def test_delete_edges_in_one_request(self, cached_storage, supabase_client):
+        cached_storage.get_edges()
+        cached_storage.delete_edges(["e1", "missing"])
+
+        supabase_client.tables["edges"].delete.return_value.in_.assert_called_once_with("id", ["e1", "missing"])
+        assert cached_storage.get_edges() == []
+
+    def test_empty_batches_skip_backend(self, cached_storage, supabase_client):
+        cached_storage.add_edges([])
+        cached_storage.delete_edges([])
+        supabase_client.tables["edges"].upsert.assert_not_called()
+        supabase_client.tables["edges"].delete.assert_not_called()
+
+
+class TestStorageIndexes:
+    def test_concept_index_follows_writes(self, cached_storage, sample_paper):
+        index = cached_storage.get_concept_index()
+        assert index.matches(sample_paper) == set()
+
+        cached_storage.add_paper(sample_paper)
+        probe = sample_paper.model_copy(update={"id": "probe"})
+        assert index.matches(probe) == {sample_paper.id}
+
+        cached_storage.delete_paper(sample_paper.id)
+        assert index.matches(probe) == set()
+
+
+class TestStoragePagination:
+    def _page_query(self, supabase_client, rows):
+        query = supabase_client.tables["papers"].select.return_value.order.return_value.order.return_value
+        query.limit.return_value.execute.return_value.data = rows
+        query.or_.return_value.limit.return_value.execute.return_value.data = rows
+        return query
+
+    def test_returns_next_cursor_when_more_rows(self, cached_storage, supabase_client):
+        rows = [dict(_paper_row(f"p{i}"), created_at=f"2024-01-0{i}T00:00:00+00:00") for i in (3, 2, 1)]
+        query = self._page_query(supabase_client, rows)
+
+        papers, cursor = cached_storage.get_papers_page(2, light=True)
+
+        query.limit.assert_called_once_with(3)
+        assert [p.id for p in papers] == ["p3", "p2"]
+        assert not hasattr(papers[0], "summary")
+        from backends import decode_cursor
+        assert decode_cursor(cursor) == ["2024-01-02T00:00:00+00:00", "p2"]
+
+    def test_after_cursor_filters_by_keyset(self, cached_storage, supabase_client):
+        from backends import encode_cursor
+        query = self._page_query(supabase_client, [dict(_paper_row("p1"), created_at="2024-01-01T00:00:00+00:00")])
+
+        papers, cursor = cached_storage.get_papers_page(2, after=encode_cursor("2024-01-02T00:00:00+00:00", "p2"))
+
+        assert 'id.lt."p2"' in query.or_.call_args.args[0]
+        assert [p.id for p in papers] == ["p1"]
+        assert papers[0].summary == "S"
+        assert cursor is None
+
+    def test_rejects_malformed_cursor(self, cached_storage):
+        with pytest.raises(ValueError):
+            cached_storage.get_papers_page(2, after="not-a-cursor")
+
+    def test_chat_history_page(self, cached_storage, supabase_client):
+        query = supabase_client.tables["chat_history"].select.return_value.order.return_value
+        query.gt.return_value.limit.return_value.execute.return_value.data = [
+            {"id": 6, "role": "user", "content": "hi"},
+            {"id": 7, "role": "assistant", "content": "hello"},
+        ]
+        from backends import encode_cursor, decode_cursor
+
+        messages, cursor = cached_storage.get_chat_history_page(1, after=encode_cursor(5))
+
+        query.gt.assert_called_once_with("id", 5)
+        assert [m.id for m in messages] == [6]
+        assert decode_cursor(cursor) == [6]
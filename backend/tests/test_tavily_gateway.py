@@ -0,0 +1,102 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from agents.tavily_gateway import TavilyGateway, make_key
+
+TTLS = {"search": 60, "extract": 60, "crawl": 0, "map": 60}
+
+
+def _gateway(client=None, max_entries=10):
+    return TavilyGateway(client or MagicMock(), ttl_seconds=TTLS, max_entries=max_entries)
+
+
+class TestMakeKey:
+    def test_normalizes_parameters(self):
+        a = make_key("search", {"query": "  Diffusion   Models ", "include_domains": ["b.org", "arxiv.org"], "topic": None})
+        b = make_key("search", {"include_domains": ["arxiv.org", "b.org"], "query": "diffusion models"})
+        assert a == b
+        assert make_key("search", {"query": "x"}) != make_key("map", {"query": "x"})
+
+
+class TestTavilyGateway:
+    def test_caches_per_operation_ttl(self):
+        client = MagicMock()
+        client.search.return_value = {"results": [{"url": "u"}]}
+        gateway = _gateway(client)
+
+        first = gateway.search(query="RL", max_results=5)
+        first["results"].clear()
+        second = gateway.search(query="rl", max_results=5)
+
+        assert second == {"results": [{"url": "u"}]}
+        assert client.search.call_count == 1
+        assert gateway.get_stats()["search"] == {"hits": 1, "misses": 1, "coalesced": 0}
+
+    def test_expires_entries(self):
+        client = MagicMock()
+        client.map.return_value = {"urls": []}
+        gateway = _gateway(client)
+
+        with patch("agents.tavily_gateway.time.monotonic", return_value=100.0):
+            gateway.map(url="https://a.org")
+        with patch("agents.tavily_gateway.time.monotonic", return_value=161.0):
+            gateway.map(url="https://a.org")
+
+        assert client.map.call_count == 2
+
+    def test_zero_ttl_disables_caching(self):
+        client = MagicMock()
+        client.crawl.return_value = {"results": []}
+        gateway = _gateway(client)
+
+        gateway.crawl(url="https://a.org")
+        gateway.crawl(url="https://a.org")
+
+        assert client.crawl.call_count == 2
+
+    def test_evicts_least_recently_used(self):
+        client = MagicMock()
+        client.extract.side_effect = lambda urls: {"results": urls}
+        gateway = _gateway(client, max_entries=2)
+
+        gateway.extract(urls=["a"])
+        gateway.extract(urls=["b"])
+        gateway.extract(urls=["a"])
+        gateway.extract(urls=["c"])
+        gateway.extract(urls=["b"])
+
+        assert client.extract.call_count == 4
+        assert gateway.get_stats()["entries"] == 2
+
+    def test_coalesces_concurrent_identical_calls(self):
+        release = threading.Event()
+        client = MagicMock()
+
+        def slow_search(**params):
+            release.wait(1)
+            return {"results": ["r"]}
+
+        client.search.side_effect = slow_search
+        gateway = _gateway(client)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(gateway.search(query="q"))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert client.search.call_count == 1
+        assert results == [{"results": ["r"]}] * 5
+        assert gateway.get_stats()["search"]["coalesced"] == 4
+
+    def test_errors_are_not_cached(self):
+        client = MagicMock()
+        client.search.side_effect = [RuntimeError("rate limited"), {"results": []}]
+        gateway = _gateway(client)
+
+        with pytest.raises(RuntimeError):
+            gateway.search(query="q")
+        assert gateway.search(query="q") == {"results": []}
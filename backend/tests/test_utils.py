@@ -1,3 +1,5 @@
+import pytest
+from unittest.mock import patch, MagicMock
 from agents.utils import extract_arxiv_id
 
 
@@ -19,3 +21,121 @@ class TestExtractArxivId:
 
     def test_no_arxiv_id_returns_none(self):
         assert extract_arxiv_id("regular text") is None
+
+class TestDownloadPdf:
+    @pytest.fixture(autouse=True)
+    def pdf_limiter(self):
+        with patch("agents.utils.pdf_limiter") as limiter:
+            yield limiter
+
+    def _response(self, status=200, chunks=(b"%PDF-", b"data"), headers=None):
+        response = MagicMock()
+        response.status_code = status
+        response.headers = headers or {}
+        response.iter_content.return_value = list(chunks)
+        response.__enter__.return_value = response
+        return response
+
+    def test_versioned_pdf_served_from_disk(self, tmp_path):
+        with patch("agents.utils.PDF_CACHE_DIR", str(tmp_path)), \
+                patch("agents.utils._http") as mock_http:
+            mock_http.get.return_value = self._response()
+
+            from agents.utils import download_pdf
+            assert download_pdf("https://arxiv.org/pdf/2401.12345v2") == b"%PDF-data"
+            assert download_pdf("https://arxiv.org/pdf/2401.12345v2") == b"%PDF-data"
+
+            assert mock_http.get.call_count == 1
+            assert (tmp_path / "2401.12345v2.pdf").exists()
+
+    def test_arxiv_fetches_share_the_pdf_limiter(self, tmp_path, pdf_limiter):
+        with patch("agents.utils.PDF_CACHE_DIR", str(tmp_path)), \
+                patch("agents.utils._http") as mock_http:
+            mock_http.get.side_effect = [
+                self._response(),
+                self._response(status=429, headers={"Retry-After": "7"}),
+                self._response(),
+            ]
+
+            from agents.utils import download_pdf
+            download_pdf("https://arxiv.org/pdf/2401.12345v2")
+            # Served from disk, so no token is taken
+            download_pdf("https://arxiv.org/pdf/2401.12345v2")
+            assert pdf_limiter.acquire.call_count == 1
+
+            download_pdf("https://arxiv.org/pdf/2401.99999")
+            pdf_limiter.pause.assert_called_once_with(7.0)
+
+            download_pdf("https://example.org/paper.pdf")
+            assert pdf_limiter.acquire.call_count == 2
+
+    def test_revalidates_unversioned_pdf(self, tmp_path):
+        with patch("agents.utils.PDF_CACHE_DIR", str(tmp_path)), \
+                patch("agents.utils._http") as mock_http:
+            mock_http.get.side_effect = [
+                self._response(headers={"ETag": '"abc"'}),
+                self._response(status=304, chunks=()),
+            ]
+
+            from agents.utils import download_pdf
+            download_pdf("https://arxiv.org/pdf/2401.12345")
+            assert download_pdf("https://arxiv.org/pdf/2401.12345") == b"%PDF-data"
+
+            second_headers = mock_http.get.call_args_list[1].kwargs["headers"]
+            assert second_headers["If-None-Match"] == '"abc"'
+
+    def test_rejects_oversized_pdf(self, tmp_path):
+        with patch("agents.utils.PDF_CACHE_DIR", str(tmp_path)), \
+                patch("agents.utils._http") as mock_http:
+            mock_http.get.return_value = self._response(chunks=(b"x" * 10, b"x" * 10))
+
+            from agents.utils import download_pdf
+            with pytest.raises(ValueError):
+                download_pdf("https://arxiv.org/pdf/2401.12345v1", max_bytes=15)
+
+            assert list(tmp_path.iterdir()) == []
+
+    def test_concurrent_downloads_use_separate_temp_files(self, tmp_path):
+        import threading
+        barrier = threading.Barrier(2)
+
+        def slow_chunks():
+            yield b"%PDF-"
+            # Both threads are mid-download before either finishes
+            barrier.wait(timeout=5)
+            yield b"data"
+
+        def response(*args, **kwargs):
+            r = self._response()
+            r.iter_content.return_value = slow_chunks()
+            return r
+
+        with patch("agents.utils.PDF_CACHE_DIR", str(tmp_path)), \
+                patch("agents.utils._http") as mock_http:
+            mock_http.get.side_effect = response
+
+            from agents.utils import download_pdf
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(download_pdf("https://arxiv.org/pdf/2401.12345v1")))
+                for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert results == [b"%PDF-data", b"%PDF-data"]
+            assert sorted(p.name for p in tmp_path.iterdir()) == ["2401.12345v1.pdf", "2401.12345v1.pdf.json"]
+
+
+class TestFetchArxivMetadata:
+    def test_chunks_id_list_queries(self):
+        with patch("agents.utils.arxiv_gateway") as mock_gateway:
+            mock_gateway.results.return_value = []
+
+            from agents.utils import fetch_arxiv_metadata
+            fetch_arxiv_metadata([f"2401.{i:05d}" for i in range(250)])
+
+            chunk_sizes = [len(c.args[0].id_list) for c in mock_gateway.results.call_args_list]
+            assert chunk_sizes == [100, 100, 50]
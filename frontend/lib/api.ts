@@ -29,6 +29,22 @@ export interface ChatResponse {
 	papers_added: string[]
 }
 
+export interface Job<T = unknown> {
+	id: string
+	kind: string
+	status: "pending" | "running" | "succeeded" | "failed"
+	stage?: string
+	result?: T
+	error?: string
+	timings: Record<string, number>
+}
+
+export interface JobAccepted {
+	job_id: string
+	status: Job["status"]
+	status_url: string
+}
+
 export interface CytoscapeGraph {
 	elements: Array<{
 		data: Record<string, unknown>
@@ -68,6 +84,24 @@ export const clearChatHistory = async (): Promise<void> => {
 	if (!res.ok) throw new Error("Failed to clear chat history")
 }
 
+export const getJob = async <T>(jobId: string): Promise<Job<T>> => {
+	const res = await fetch(`${API_BASE}/jobs/${encodeURIComponent(jobId)}`)
+	if (!res.ok) throw new Error("Failed to fetch job")
+	return res.json()
+}
+
+// Ingestion endpoints return 202 with a job; poll until it finishes, or give up after timeoutMs
+export const waitForJob = async <T>(jobId: string, intervalMs = 1000, timeoutMs = 5 * 60 * 1000): Promise<T> => {
+	const deadline = Date.now() + timeoutMs
+	while (Date.now() < deadline) {
+		const job = await getJob<T>(jobId)
+		if (job.status === "succeeded") return job.result as T
+		if (job.status === "failed") throw new Error(job.error || "Job failed")
+		await new Promise((resolve) => setTimeout(resolve, intervalMs))
+	}
+	throw new Error("Timed out waiting for the job to finish")
+}
+
 export const selectPaper = async (arxivId: string, sourcePaperId?: string): Promise<ChatResponse> => {
 	const res = await fetch(`${API_BASE}/papers/select`, {
 		method: "POST",
@@ -75,7 +109,8 @@ export const selectPaper = async (arxivId: string, sourcePaperId?: string): Prom
 		body: JSON.stringify({ arxiv_id: arxivId, source_paper_id: sourcePaperId })
 	})
 	if (!res.ok) throw new Error("Failed to select paper")
-	return res.json()
+	const accepted: JobAccepted = await res.json()
+	return waitForJob<ChatResponse>(accepted.job_id)
 }
 
 export const deletePaper = async (paperId: string): Promise<void> => {